@@ -0,0 +1,313 @@
+"""
+읽기 전용 JSON API (다른 도구가 Streamlit 화면을 긁지 않고 순위/문해력 수치를 가져가도록)
+- 앱과 같은 프로세스에서 ThreadingHTTPServer를 백그라운드 스레드로 실행 (앱의 cache_resource에서 시작)
+  → 앱이 이미 읽어 둔 데이터(감시자 스냅샷, 문해력 프레임)를 그대로 사용하고 스크립트 rerun은 일어나지 않음
+- 응답 본문은 (경로, 파라미터, 데이터 버전)별로 한 번만 만들어 LRU로 보관
+- ETag는 데이터 버전과 요청 내용으로 정하므로 If-None-Match가 맞으면 본문을 만들지 않고 304 응답
+- 처리 중 예기치 않은 오류는 표준 오류에 기록하고 JSON 500으로 응답
+
+경로:
+    GET /api/books/months                          달 목록
+    GET /api/books?month=YYYY-MM&page=0&size=50    순위 목록 (페이지 단위, 같은 순위의 도서는 모두 포함)
+    GET /api/books/<순위번호>?month=YYYY-MM         순위 하나의 도서 목록 (같은 순위의 도서가 여러 권일 수 있음)
+    GET /api/literacy/gaps                         연도별 성별 격차
+    GET /api/literacy/forecast                     예측값과 95% 신뢰구간
+    GET /api/literacy/improvement                  성별 개선폭/개선율
+"""
+import hashlib
+import json
+import math
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import perf
+
+from book_data import rank_order
+from literacy import compute_analytics, fit_trends, forecast
+
+API_HOST = "127.0.0.1"
+BOOK_API_PORT = 8601
+LITERACY_API_PORT = 8602
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BODIES = 1024  # 보관할 응답 본문 수
+BOOK_FIELDS = {  # 응답 필드 → 데이터 컬럼
+    "rank": "순위번호",
+    "title": "도서명정보",
+    "author": "저자명정보",
+    "publisher": "출판사명",
+    "year": "출판년도",
+    "image_url": "도서이미지URL",
+}
+
+
+class ApiError(Exception):
+    """클라이언트에 그대로 돌려줄 오류 (HTTP 상태 코드와 메시지)"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def query_int(query, name, default, minimum=0, maximum=None):
+    """정수 쿼리 파라미터 (없으면 default, 형식이나 범위가 맞지 않으면 400)"""
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ApiError(400, f"{name}은(는) 정수여야 합니다")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name} 범위를 벗어났습니다")
+    return value
+
+
+def json_value(value):
+    """NumPy/pandas 값을 JSON 값으로 (결측은 null)"""
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ApiServer:
+    """
+    경로별 처리 함수를 등록해 쓰는 JSON 서버
+    - 처리 함수: handler(경로 나머지 부분 목록, 쿼리 딕셔너리) → (태그, build)
+      태그는 응답 내용을 결정하는 값(데이터 버전 + 파라미터)을 이은 문자열, build()는 응답 객체를 만드는 함수
+    - 태그가 같으면 같은 본문이므로 ETag/본문 캐시 키로 사용
+    """
+    def __init__(self, host=API_HOST, port=BOOK_API_PORT, max_bodies=MAX_BODIES):
+        self.routes = {}
+        self.max_bodies = max_bodies
+        self.bodies = OrderedDict()  # ETag → 본문 바이트
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), ApiRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.api = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="json-api", daemon=True)
+        self.thread.start()
+
+    @property
+    def address(self):
+        """실제로 열린 (호스트, 포트) - 포트 0으로 만들면 임의 포트"""
+        return self.httpd.server_address[:2]
+
+    def route(self, name, handler):
+        """/api/<name>/... 요청을 handler로 처리"""
+        self.routes[name] = handler
+
+    def respond(self, target, if_none_match=""):
+        """요청 경로 → (상태 코드, ETag, 본문 바이트)"""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        if len(parts) < 2 or parts[0] != "api" or parts[1] not in self.routes:
+            raise ApiError(404, "없는 경로입니다")
+        tag, build = self.routes[parts[1]](parts[2:], parse_qs(url.query))
+        etag = '"' + hashlib.blake2b(f"{parts[1]}|{tag}".encode("utf-8"), digest_size=12).hexdigest() + '"'
+        if etag in [value.strip() for value in if_none_match.split(",")] or if_none_match.strip() == "*":
+            perf.count("app_api_requests_total", route=parts[1], result="not_modified")
+            return 304, etag, b""
+
+        with self.lock:
+            body = self.bodies.get(etag)
+            if body is not None:
+                self.bodies.move_to_end(etag)
+        if body is not None:
+            perf.count("app_api_requests_total", route=parts[1], result="cached")
+            return 200, etag, body
+
+        body = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self.lock:
+            self.bodies[etag] = body
+            while len(self.bodies) > self.max_bodies:
+                self.bodies.popitem(last=False)
+        perf.count("app_api_requests_total", route=parts[1], result="built")
+        return 200, etag, body
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """GET만 처리 (본문 생성은 ApiServer.respond)"""
+
+    def do_GET(self):
+        try:
+            status, etag, body = self.server.api.respond(self.path, self.headers.get("If-None-Match", ""))
+        except ApiError as error:
+            status, etag = error.status, None
+            body = json.dumps({"error": str(error)}, ensure_ascii=False).encode("utf-8")
+        except Exception:
+            # 처리 함수의 버그나 데이터 오류 - 연결을 끊지 않고 기록 후 500 응답
+            print(f"API 요청 처리 실패: {self.path}", file=sys.stderr)
+            traceback.print_exc()
+            perf.count("app_api_requests_total", route="error", result="error")
+            status, etag = 500, None
+            body = json.dumps({"error": "서버 오류입니다"}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # 매번 ETag로 재검증
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 표준 오류에 기록하지 않음
+
+
+def start_server(host=API_HOST, port=BOOK_API_PORT):
+    """API 서버 시작 (포트를 이미 다른 프로세스가 쓰고 있으면 None)"""
+    try:
+        return ApiServer(host, port)
+    except OSError:
+        return None
+
+
+def book_route(watcher):
+    """
+    도서 순위 경로 처리 함수 (watcher: BookDataWatcher)
+    데이터 버전은 응답 컬럼들의 내용 해시(snapshot.key)이므로 이 컬럼들이 바뀐 달만 새 본문을 만듦
+    월별 파티션이 없으면(people_book.csv 한 파일) 앱과 같이 한 달치로 보고 기준년월 컬럼의 첫 값을 달 이름으로 사용
+    """
+    columns = list(BOOK_FIELDS.values())
+    indexes = OrderedDict()  # (달, 버전) → (순위순 행 위치, 순위 → 행 위치 목록) (최근 몇 개만)
+    lock = threading.Lock()
+
+    def month_names(snapshot):
+        """(응답에 쓰는 달 목록, 달 이름 → 스냅샷의 달)"""
+        if snapshot.months:
+            return snapshot.months, {month: month for month in snapshot.months}
+        frame = snapshot.frame(None)
+        name = str(frame["기준년월"].iat[0]) if "기준년월" in frame.columns and len(frame) else None
+        return [name], {name: None}
+
+    def month_index(snapshot, month, version):
+        with lock:
+            index = indexes.get((month, version))
+        if index is None:
+            frame = snapshot.frame(month)
+            order = rank_order(frame)
+            ranks = frame["순위번호"].to_numpy()
+            rows = {}
+            for pos in order:
+                rows.setdefault(int(ranks[pos]), []).append(pos)
+            index = order, rows
+            with lock:
+                indexes[(month, version)] = index
+                while len(indexes) > 16:
+                    indexes.popitem(last=False)
+        return index
+
+    def book_item(frame, pos):
+        return {field: json_value(frame[column].iat[pos]) for field, column in BOOK_FIELDS.items()}
+
+    def handle(parts, query):
+        snapshot = watcher.current()
+        months, sources = month_names(snapshot)
+        if parts == ["months"]:
+            return f"months|{','.join(map(str, months))}", lambda: {"months": months}
+
+        name = query.get("month", [months[-1]])[0]
+        if name not in sources:
+            raise ApiError(404, "없는 기준년월입니다")
+        month = sources[name]
+        version = snapshot.key(month, columns)
+        order, rows = month_index(snapshot, month, version)
+        frame = snapshot.frame(month)
+
+        if not parts:
+            page = query_int(query, "page", 0)
+            size = query_int(query, "size", PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+            pages = math.ceil(len(order) / size)
+            if page >= max(pages, 1):  # 없는 페이지마다 본문 캐시가 채워지지 않도록 거절
+                raise ApiError(400, "page 범위를 벗어났습니다")
+
+            def build_page():
+                return {
+                    "month": name,
+                    "page": page,
+                    "size": size,
+                    "total": len(order),
+                    "pages": pages,
+                    "items": [book_item(frame, pos) for pos in order[page * size:(page + 1) * size]],
+                }
+            return f"page|{name}|{version}|{page}|{size}", build_page
+
+        if len(parts) != 1:
+            raise ApiError(404, "없는 경로입니다")
+        try:
+            rank = int(parts[0])
+        except ValueError:
+            raise ApiError(400, "순위번호는 정수여야 합니다")
+        if rank not in rows:
+            raise ApiError(404, "없는 순위번호입니다")
+        return f"book|{name}|{version}|{rank}", lambda: {
+            "month": name, "rank": rank, "items": [book_item(frame, pos) for pos in rows[rank]],
+        }
+
+    return handle
+
+
+def literacy_bodies(df, forecast_years):
+    """문해력 격차/예측/개선 응답 객체 (wodus.py와 같은 계산)"""
+    analytics = compute_analytics(df)
+    forecasts = forecast(fit_trends(analytics["matrix"]), forecast_years)
+    return {
+        "gaps": {
+            "items": [{"year": int(year), "gap": json_value(gap)} for year, gap in analytics["gaps"].items()],
+            "max_gap": analytics["max_gap"],
+            "min_gap": analytics["min_gap"],
+        },
+        "forecast": {
+            "items": [
+                {"year": int(row.Year), "group": row.Group, "prediction": json_value(row.Prediction),
+                 "lower": json_value(row.Lower), "upper": json_value(row.Upper)}
+                for row in forecasts.itertuples(index=False)
+            ],
+        },
+        "improvement": {
+            "items": [
+                {"group": group, "first": json_value(row["first"]), "last": json_value(row["last"]),
+                 "change": json_value(row["change"]), "rate": json_value(row["rate"])}
+                for group, row in analytics["improvement"].iterrows()
+            ],
+            "first_year": analytics["first_year"],
+            "last_year": analytics["last_year"],
+            "total_improvement": analytics["total_improvement"],
+            "average_annual_improvement": analytics["average_annual_improvement"],
+        },
+    }
+
+
+def literacy_route(source, forecast_years):
+    """
+    문해력 집계 경로 처리 함수
+    source() → (데이터 버전, 프레임); 버전이 바뀔 때만 세 응답 객체를 한 번에 다시 계산
+    """
+    cache = {}
+    lock = threading.Lock()
+
+    def handle(parts, query):
+        if len(parts) != 1 or parts[0] not in ("gaps", "forecast", "improvement"):
+            raise ApiError(404, "없는 경로입니다")
+        version, df = source()
+        with lock:
+            if cache.get("version") != version:
+                cache.update(version=version, bodies=literacy_bodies(df, forecast_years))
+            bodies = cache["bodies"]
+        return f"{parts[0]}|{version}", lambda: bodies[parts[0]]
+
+    return handle
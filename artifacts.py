@@ -0,0 +1,108 @@
+"""
+미리 계산한 파생 데이터(artifact) 저장소
+- precompute.py가 데이터 배포본마다 artifacts/<버전>/ 폴더를 만들고
+  완성된 뒤에만 artifacts/CURRENT 파일이 새 버전을 가리키도록 교체
+- 앱은 시작할 때 CURRENT가 가리키는 폴더에서 읽고, 없는 항목만 직접 계산
+
+폴더 구성:
+    artifacts/
+        CURRENT                   현재 버전 이름 (한 줄)
+        <버전>/                   (--force로 다시 만들면 <버전>.<n>/)
+            manifest.json         입력 파일 해시, 기준년월 목록, 생성 시각
+            months/<YYYY-MM>/     월별 컬럼 파티션 (book_ingest 형식)
+            <YYYY-MM>/<이름>.pkl   검색 색인, 순위 색인, 저자/출판사 집계, 추천 이웃 표
+            literacy_cube.feather 문해력 집계 큐브 (원자료가 있을 때)
+"""
+import json
+import os
+import pickle
+
+ARTIFACT_DIR = "artifacts"
+CURRENT_FILE = "CURRENT"
+FORMAT_VERSION = 1  # 저장 형식이 바뀌면 올려서 이전 버전 artifact를 쓰지 않도록 함
+
+
+def current_dir(root=ARTIFACT_DIR):
+    """CURRENT가 가리키는 버전 폴더 (없으면 None)"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(root, version)
+    manifest = read_manifest(path)
+    if manifest is None or manifest.get("format") != FORMAT_VERSION:
+        return None
+    return path
+
+
+def read_manifest(version_dir):
+    """버전 폴더의 manifest.json (없거나 깨졌으면 None)"""
+    try:
+        with open(os.path.join(version_dir, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _atomic_write(path, write_func, mode="wb"):
+    """임시 파일에 쓴 뒤 이름을 바꿔 교체 (읽는 쪽에서 반쯤 쓴 파일이 보이지 않음)"""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, mode, **({"encoding": "utf-8"} if "b" not in mode else {})) as f:
+        write_func(f)
+    os.replace(tmp_path, path)
+
+
+def save_object(version_dir, month, name, obj):
+    """월별 파생 객체를 pickle로 저장"""
+    folder = os.path.join(version_dir, month or "all")
+    os.makedirs(folder, exist_ok=True)
+    _atomic_write(os.path.join(folder, f"{name}.pkl"),
+                  lambda f: pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_object(version_dir, month, name):
+    """월별 파생 객체 읽기 (버전 폴더나 파일이 없으면 None)"""
+    if version_dir is None:
+        return None
+    try:
+        with open(os.path.join(version_dir, month or "all", f"{name}.pkl"), "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def set_current(root, version):
+    """CURRENT가 가리키는 버전 교체"""
+    _atomic_write(os.path.join(root, CURRENT_FILE), lambda f: f.write(version + "\n"), mode="w")
+
+
+def latest_build(root, version):
+    """버전의 가장 최근 완성 폴더 이름 (<버전> 또는 다시 만든 <버전>.<n>, 없으면 None)"""
+    builds = []
+    for name in os.listdir(root):
+        if name != version and not name.startswith(f"{version}."):
+            continue
+        manifest = read_manifest(os.path.join(root, name))
+        if manifest is not None and manifest.get("format") == FORMAT_VERSION:
+            builds.append((os.path.getmtime(os.path.join(root, name)), name))
+    return max(builds)[1] if builds else None
+
+
+def publish(root, version, staging_dir, manifest):
+    """
+    완성된 임시 폴더를 artifacts/<버전>으로 옮기고 CURRENT 교체
+    같은 버전 폴더가 이미 있으면(--force) 지우지 않고 <버전>.<n>으로 옮긴 뒤 CURRENT만 바꿈
+    → 기존 폴더를 먼저 치우는 순간이 없으므로 읽는 쪽은 항상 완성된 폴더를 보게 됨 (이전 폴더는 prune이 정리)
+    """
+    manifest = {**manifest, "format": FORMAT_VERSION, "version": version}
+    _atomic_write(os.path.join(staging_dir, "manifest.json"),
+                  lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2), mode="w")
+    name, n = version, 0
+    while os.path.exists(os.path.join(root, name)):
+        n += 1
+        name = f"{version}.{n}"
+    target = os.path.join(root, name)
+    os.rename(staging_dir, target)
+    set_current(root, name)
+    return target
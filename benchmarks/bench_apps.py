@@ -0,0 +1,257 @@
+"""
+main.py / wodus.py rerun 지연 시간 벤치마크 (Streamlit AppTest 헤드리스 실행)
+
+- main.py: 합성 도서 데이터(기본 1천/10만/100만 행)로 순위 선택, 기록 Pop/전체 삭제
+- wodus.py: 확대된 문해력 표로 연도/성별 필터 변경
+- 상호작용별 p50/p95 지연 시간과 최대 메모리(tracemalloc) 측정
+  (빈 캐시에서 데이터를 읽는 첫 실행과 캐시가 채워진 뒤의 실행을 따로 기록)
+- 결과는 benchmarks/results/에 커밋 해시와 함께 저장하여 커밋 간 비교
+
+사용법:
+    python benchmarks/bench_apps.py --rows 1000 100000 1000000 --repeats 20
+    python benchmarks/bench_apps.py --compare      # 직전 결과와 비교
+"""
+import argparse
+import datetime
+import http.server
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from synthetic import make_literacy_frame, write_book_csv  # noqa: E402
+
+
+def start_cover_server():
+    """모든 경로에 같은 작은 JPEG를 돌려주는 로컬 표지 서버 (원격 CDN 대신 사용)"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (200, 290), (120, 140, 200)).save(buffer, format="JPEG")
+    body = buffer.getvalue()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def clear_caches():
+    """데이터셋을 바꿀 때 Streamlit 캐시 초기화"""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def find_button(at, prefix):
+    """라벨이 prefix로 시작하는 버튼 찾기"""
+    return next(button for button in at.button if button.label.startswith(prefix))
+
+
+def find_multiselect(at, prefix):
+    """라벨이 prefix로 시작하는 사이드바 multiselect 찾기"""
+    return next(widget for widget in at.sidebar.multiselect if widget.label.startswith(prefix))
+
+
+def timed(action):
+    """상호작용 한 번(위젯 조작 + rerun)의 소요 시간"""
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def summarize(samples, cold_peak_bytes, peak_bytes):
+    """지연 시간 목록 → p50/p95(ms), 최대 메모리(MB, 빈 캐시 실행 / 캐시가 채워진 뒤 실행)"""
+    samples = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+        "runs": len(samples),
+        "cold_peak_mb": round(cold_peak_bytes / 1024 / 1024, 2),
+        "peak_mb": round(peak_bytes / 1024 / 1024, 2),
+    }
+
+
+def measure(scenario, repeats):
+    """
+    시나리오 실행 → 상호작용 이름별 결과
+    지연 시간은 tracemalloc 없이, 최대 메모리는 tracemalloc을 켠 별도 실행에서 측정
+    - cold: 캐시를 비운 뒤 실행 (데이터셋 로드와 색인 생성 포함)
+    - warm: 바로 이어서 한 번 더 실행 (캐시된 데이터로 상호작용만)
+    """
+    samples = scenario(repeats)
+    peaks = []
+    clear_caches()
+    for _ in range(2):
+        tracemalloc.start()
+        scenario(1)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {name: summarize(values, *peaks) for name, values in samples.items()}
+
+
+def main_app_scenario(repeats, timeout):
+    """main.py 상호작용: 최초 실행, 순위 선택, 기록 Pop, 전체 삭제"""
+    def run(n):
+        samples = {"initial_run": [], "select_rank": [], "history_pop": [], "history_clear": []}
+        for i in range(n):
+            at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=timeout)
+            samples["initial_run"].append(timed(at.run))
+            n_ranks = len(at.selectbox(key="rank_select").options)
+            for step in range(5):
+                index = (i * 7 + step * 13) % n_ranks
+                samples["select_rank"].append(
+                    timed(lambda: at.selectbox(key="rank_select").select_index(index).run())
+                )
+            samples["history_pop"].append(timed(lambda: find_button(at, "🗑️").click().run()))
+            samples["history_clear"].append(timed(lambda: find_button(at, "🧹").click().run()))
+        return samples
+    return run
+
+
+def wodus_scenario(repeats, timeout):
+    """wodus.py 상호작용: 최초 실행, 연도 필터 변경, 성별 필터 변경"""
+    def run(n):
+        samples = {"initial_run": [], "year_filter": [], "gender_filter": []}
+        for i in range(n):
+            at = AppTest.from_file(os.path.join(ROOT, "wodus.py"), default_timeout=timeout)
+            samples["initial_run"].append(timed(at.run))
+            # 위젯 옵션은 표시 문자열이므로 연도는 정수로 되돌려 전달
+            years = [int(year) for year in find_multiselect(at, "연도").options]
+            genders = list(find_multiselect(at, "성별").options)
+            subset = years[i % 3::2] or years
+            samples["year_filter"].append(timed(lambda: find_multiselect(at, "연도").set_value(subset).run()))
+            samples["gender_filter"].append(
+                timed(lambda: find_multiselect(at, "성별").set_value(genders[: 1 + i % len(genders)]).run())
+            )
+        return samples
+    return run
+
+
+def git_commit():
+    """현재 커밋 해시 (git이 없으면 unknown)"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results):
+    """결과를 JSON으로 저장하고 누적 기록(history.jsonl)에 추가"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"{stamp}-{results['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(RESULTS_DIR, "history.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(results, ensure_ascii=False) + "\n")
+    return path
+
+
+def load_history():
+    """저장된 결과 목록 (오래된 순)"""
+    path = os.path.join(RESULTS_DIR, "history.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(previous, current):
+    """두 실행 결과의 p95 변화율 출력"""
+    print(f"\n비교: {previous['commit']} → {current['commit']}")
+    for case, interactions in current["cases"].items():
+        before = previous["cases"].get(case, {})
+        for name, result in interactions.items():
+            if name not in before:
+                continue
+            old, new = before[name]["p95_ms"], result["p95_ms"]
+            change = (new - old) / old * 100 if old else 0.0
+            flag = "  ⚠️ 느려짐" if change > 10 else ""
+            print(f"  {case:<24} {name:<14} p95 {old:>10.2f} → {new:>10.2f} ms ({change:+.1f}%){flag}")
+
+
+def print_results(results):
+    """결과 표 출력"""
+    print(f"{'케이스':<24} {'상호작용':<14} {'p50(ms)':>10} {'p95(ms)':>10} {'첫 실행 메모리(MB)':>16} "
+          f"{'최대 메모리(MB)':>14}")
+    for case, interactions in results["cases"].items():
+        for name, r in interactions.items():
+            print(f"{case:<24} {name:<14} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} "
+                  f"{r.get('cold_peak_mb', float('nan')):>16.2f} {r['peak_mb']:>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000], help="도서 데이터 행 수")
+    parser.add_argument("--literacy-years", type=int, nargs="+", default=[7, 1000], help="문해력 표 연도 수")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--compare", action="store_true", help="직전 저장 결과와 비교")
+    args = parser.parse_args()
+
+    previous = load_history()
+    cover_server = start_cover_server()
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "repeats": args.repeats,
+        "cases": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BOOK_MONTH_DIR"] = os.path.join(tmp, "months")  # 비어 있는 월별 저장소 → CSV 사용
+        os.environ["BOOK_CACHE_DIR"] = os.path.join(tmp, "data_cache")
+        os.environ["COVER_CACHE_DIR"] = os.path.join(tmp, "covers")
+        os.environ["HISTORY_DB"] = os.path.join(tmp, "history.sqlite3")
+        os.environ["ARTIFACT_DIR"] = os.path.join(tmp, "artifacts")  # 미리 계산된 artifact 없이 측정
+        os.environ["BOOK_API_PORT"] = os.environ["LITERACY_API_PORT"] = "0"  # JSON API 서버는 측정 대상 아님
+        os.environ["COVER_ORIGIN"] = f"http://127.0.0.1:{cover_server.server_port}"
+
+        for n_rows in args.rows:
+            os.environ["BOOK_DATA_CSV"] = write_book_csv(os.path.join(tmp, f"books_{n_rows}.csv"), n_rows)
+            clear_caches()
+            print(f"main.py {n_rows:,}행 측정 중...", file=sys.stderr)
+            results["cases"][f"main/{n_rows}"] = measure(main_app_scenario(args.repeats, args.timeout), args.repeats)
+
+        for n_years in args.literacy_years:
+            path = os.path.join(tmp, f"literacy_{n_years}.csv")
+            make_literacy_frame(n_years).to_csv(path, index=False)
+            os.environ["LITERACY_CSV"] = path
+            clear_caches()
+            print(f"wodus.py {n_years:,}개 연도 측정 중...", file=sys.stderr)
+            results["cases"][f"wodus/{n_years}y"] = measure(wodus_scenario(args.repeats, args.timeout), args.repeats)
+        os.environ.pop("LITERACY_CSV", None)
+
+    cover_server.shutdown()
+    print_results(results)
+    print(f"\n저장: {save_results(results)}")
+    if args.compare and previous:
+        compare(previous[-1], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+st.cache_data(복사 반환)와 st.cache_resource(공유 참조) 방식의 rerun 비용 비교
+
+st.cache_data는 캐시 적중 시에도 저장된 pickle을 역직렬화하여 새 복사본을 반환함
+이 스크립트는 같은 동작을 pickle 왕복으로 재현하고,
+공유 읽기 전용 프레임을 그대로 반환하는 방식과 지연 시간/임시 메모리를 비교
+
+사용법:
+    python benchmarks/cache_copy_compare.py --rows 1000 100000 --reruns 50
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_data import freeze_frame  # noqa: E402
+from synthetic import make_book_frame  # noqa: E402
+
+
+def measure(get_frame, reruns):
+    """rerun마다 프레임을 가져오는 비용 측정 (지연 시간 목록, 최대 임시 메모리)"""
+    latencies = []
+    tracemalloc.start()
+    for _ in range(reruns):
+        start = time.perf_counter()
+        frame = get_frame()
+        len(frame)
+        latencies.append(time.perf_counter() - start)
+        del frame
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(latencies), peak
+
+
+def compare(n_rows, reruns):
+    """한 데이터 크기에 대해 두 방식 비교 결과 반환"""
+    df = make_book_frame(n_rows)
+    pickled = pickle.dumps(df)  # cache_data가 보관하는 형태
+    shared = freeze_frame(df)   # cache_resource가 보관하는 형태
+
+    results = {}
+    for name, getter in [
+        ("cache_data (복사)", lambda: pickle.loads(pickled)),
+        ("cache_resource (공유)", lambda: shared),
+    ]:
+        latencies, peak = measure(getter, reruns)
+        results[name] = {
+            "p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            "peak_mb": peak / 1024 / 1024,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} | {'방식':<22} | {'p50(ms)':>9} | {'p95(ms)':>9} | {'임시 메모리(MB)':>14}")
+    for n_rows in args.rows:
+        for name, r in compare(n_rows, args.reruns).items():
+            print(f"{n_rows:>10} | {name:<22} | {r['p50_ms']:>9.3f} | {r['p95_ms']:>9.3f} | {r['peak_mb']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+main.py / wodus.py 동시 접속 부하 테스트 (Streamlit AppTest 세션 여러 개를 동시에 실행)
+
+- 세션 하나 = AppTest 인스턴스 하나 (세션 상태는 각자, st.cache_resource는 프로세스 안에서 공유)
+- 세션마다 실제 사용 흐름과 비슷한 클릭 순서를 재생
+  - main.py: 순위 이동(주변 순위 위주), 검색, 기준년월 변경, 기록 Pop/전체 삭제
+  - wodus.py: 사이드바 연도/성별 필터 변경
+- 동시 세션 수 N을 단계별로 늘리며 측정
+  - 처리량(초당 상호작용 수), 지연 시간 p50/p95/p99/최대
+  - 세션당 메모리 증가(RSS 증가량 / N)와 세션별 기록 스택 크기 (HistoryStore의 hot 스택 기준)
+  - 캐시 경합: perf 모듈의 캐시 호출/미스 수, 데이터 로드 구간 p95
+- 처리량이 더 이상 늘지 않는 N(포화 지점)을 함께 출력
+- --processes를 주면 세션을 여러 프로세스로 나누어 실행 (프로세스마다 캐시가 따로 있는 다중 워커 배포 모사)
+- 스크립트 컴파일(AST → 코드)은 프로세스 안에서 한 번에 하나씩만 실행
+  (여러 스레드가 동시에 AST를 컴파일하면 CPython이 재귀 깊이 불일치 SystemError를 냄 - 실제 서버 동작과 무관한 측정 오류)
+
+사용법:
+    python benchmarks/load_test.py --app main --sessions 1 10 50 100 200 400 --actions 20
+    python benchmarks/load_test.py --app wodus --sessions 1 50 200 --processes 4
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import perf  # noqa: E402
+from bench_apps import (RESULTS_DIR, clear_caches, find_button, find_multiselect, git_commit,  # noqa: E402
+                        start_cover_server)
+from book_ingest import ingest  # noqa: E402
+from history_store import UserHistory  # noqa: E402
+from synthetic import SYLLABLES, make_literacy_frame, write_book_csv  # noqa: E402
+
+SATURATION_GAIN = 0.05  # 처리량 증가가 이 비율 미만이면 포화로 판단
+
+COMPILE_LOCK = threading.Lock()
+_get_bytecode = ScriptCache.get_bytecode
+
+
+def serialized_get_bytecode(self, script_path):
+    """AppTest 세션 스레드들의 스크립트 컴파일을 직렬화 (컴파일 자체는 짧으므로 측정에 주는 영향은 작음)"""
+    with COMPILE_LOCK:
+        return _get_bytecode(self, script_path)
+
+
+ScriptCache.get_bytecode = serialized_get_bytecode
+
+
+def rss_bytes():
+    """현재 프로세스 RSS (Linux /proc, 없으면 최대 RSS로 대체)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def stack_nbytes(at):
+    """세션 기록 스택 크기 (저장소를 쓰면 세션 상태의 UserHistory가 아니라 저장소에 있는 사용자 스택)"""
+    if "book_stack" not in at.session_state:
+        return 0
+    stack = at.session_state["book_stack"]
+    if isinstance(stack, UserHistory):
+        return stack.store.read("nbytes", stack.user_id)
+    return stack.nbytes()
+
+
+def main_session(at, rng, actions):
+    """main.py 클릭 순서 생성기: (상호작용 이름, 실행 함수)"""
+    ranks = at.selectbox(key="rank_select").options
+    index = rng.randrange(len(ranks))
+    for _ in range(actions):
+        roll = rng.random()
+        if roll < 0.6:
+            # 주변 순위로 이동 (대부분 한두 칸, 가끔 멀리)
+            index = (index + rng.choice([-2, -1, 1, 1, 2, rng.randrange(len(ranks))])) % len(ranks)
+            yield "select_rank", lambda i=index: at.selectbox(key="rank_select").select_index(i).run()
+        elif roll < 0.7:
+            query = "".join(rng.sample(SYLLABLES, 2))
+            yield "search", lambda q=query: at.text_input(key="search_query").input(q).run()
+            yield "search_clear", lambda: at.text_input(key="search_query").input("").run()
+        elif roll < 0.8 and len(at.sidebar.selectbox):
+            months = at.sidebar.selectbox(key="selected_month").options
+            month_index = rng.randrange(len(months))
+            yield "change_month", lambda: at.sidebar.selectbox(key="selected_month").select_index(month_index).run()
+        elif roll < 0.95:
+            yield "history_pop", lambda: find_button(at, "🗑️").click().run()
+        else:
+            yield "history_clear", lambda: find_button(at, "🧹").click().run()
+
+
+def wodus_session(at, rng, actions):
+    """wodus.py 클릭 순서 생성기: 연도/성별 필터 변경"""
+    # 위젯 옵션은 표시 문자열이므로 연도는 정수로 되돌려 전달
+    years = [int(year) for year in find_multiselect(at, "연도").options]
+    genders = list(find_multiselect(at, "성별").options)
+    for _ in range(actions):
+        if rng.random() < 0.7:
+            subset = sorted(rng.sample(years, rng.randint(1, len(years))))
+            yield "year_filter", lambda s=subset: find_multiselect(at, "연도").set_value(s).run()
+        else:
+            subset = rng.sample(genders, rng.randint(1, len(genders)))
+            yield "gender_filter", lambda s=subset: find_multiselect(at, "성별").set_value(s).run()
+
+
+SESSIONS = {"main": ("main.py", main_session), "wodus": ("wodus.py", wodus_session)}
+
+
+def run_session(app, seed, actions, think, timeout):
+    """
+    세션 하나 실행
+    반환: (상호작용별 지연 시간 목록, 실패 수, 세션 종료 시 기록 스택 크기)
+    첫 실행이 실패하거나 클릭 순서를 만들 수 없으면(위젯이 없음) 오류 1건으로 세고 세션 종료
+    """
+    script, clicks = SESSIONS[app]
+    rng = random.Random(seed)
+    samples = {}
+    errors = 0
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+    start = time.perf_counter()
+    try:
+        at.run()
+    except Exception:  # 한 세션의 실패가 전체 측정을 멈추지 않도록 기록만 함
+        return samples, 1, 0
+    samples["initial_run"] = [time.perf_counter() - start]
+    if at.exception:
+        return samples, 1, 0
+    try:
+        for name, action in clicks(at, rng, actions):
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+            start = time.perf_counter()
+            try:
+                action()
+            except Exception:
+                errors += 1
+                continue
+            samples.setdefault(name, []).append(time.perf_counter() - start)
+            if at.exception:
+                errors += 1
+    except Exception:  # 클릭 순서 생성 실패 (이전 실행 결과에 필요한 위젯이 없음)
+        errors += 1
+    return samples, errors, stack_nbytes(at)
+
+
+def run_batch(app, sessions, first_seed, actions, think, timeout):
+    """한 프로세스 안에서 세션 여러 개를 스레드로 동시에 실행"""
+    perf.reset()
+    rss_before = rss_bytes()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, app, first_seed + i, actions, think, timeout) for i in range(sessions)]
+        results = [future.result() for future in futures]
+    summaries, counters = perf.snapshot()
+    return {
+        "results": results,
+        "rss_growth": rss_bytes() - rss_before,
+        "sections": {row["labels"].get("section"): row["p95"] for row in summaries
+                     if row["metric"] == "app_section_seconds"},
+        "counters": [(row["metric"], row["labels"].get("function"), row["value"]) for row in counters],
+    }
+
+
+def run_level(app, n_sessions, actions, think, timeout, processes):
+    """동시 세션 N개 단계 하나 측정"""
+    processes = min(processes, n_sessions)
+    start = time.perf_counter()
+    if processes > 1:
+        per_process = [n_sessions // processes + (1 if i < n_sessions % processes else 0) for i in range(processes)]
+        seeds = [int(seed) for seed in np.cumsum([0] + per_process[:-1])]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            batches = list(pool.map(run_batch, [app] * processes, per_process, seeds,
+                                    [actions] * processes, [think] * processes, [timeout] * processes))
+    else:
+        batches = [run_batch(app, n_sessions, 0, actions, think, timeout)]
+    wall = time.perf_counter() - start
+
+    latencies = {}
+    errors = 0
+    stack_bytes = []
+    for batch in batches:
+        for samples, session_errors, nbytes in batch["results"]:
+            errors += session_errors
+            stack_bytes.append(nbytes)
+            for name, values in samples.items():
+                latencies.setdefault(name, []).extend(values)
+
+    every = np.array([value for values in latencies.values() for value in values]) * 1000
+    calls, misses, sections = {}, {}, {}
+    for batch in batches:
+        for name, value in batch["sections"].items():
+            sections[name] = max(sections.get(name, 0.0), value)  # 프로세스 중 가장 느린 값
+        for metric, function, value in batch["counters"]:
+            target = calls if metric == "app_cache_calls_total" else misses
+            target[function] = target.get(function, 0) + value
+
+    return {
+        "sessions": n_sessions,
+        "processes": processes,
+        "interactions": len(every),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(every) / wall, 2) if wall else 0.0,
+        "p50_ms": round(float(np.percentile(every, 50)), 2) if len(every) else None,
+        "p95_ms": round(float(np.percentile(every, 95)), 2) if len(every) else None,
+        "p99_ms": round(float(np.percentile(every, 99)), 2) if len(every) else None,
+        "max_ms": round(float(every.max()), 2) if len(every) else None,
+        "by_interaction": {
+            name: {"p95_ms": round(float(np.percentile(np.array(values) * 1000, 95)), 2), "runs": len(values)}
+            for name, values in latencies.items()
+        },
+        "rss_per_session_kb": round(sum(batch["rss_growth"] for batch in batches) / n_sessions / 1024, 1),
+        "stack_bytes_mean": round(float(np.mean(stack_bytes)), 1) if stack_bytes else 0.0,
+        # 캐시 경합: 같은 캐시 함수의 미스가 여러 번이면 여러 세션이 같은 값을 동시에 계산했거나 다시 계산한 것
+        "cache": {name: {"calls": total, "misses": misses.get(name, 0)} for name, total in calls.items()},
+        "section_p95_ms": {name: round(value * 1000, 2) for name, value in sections.items()},
+    }
+
+
+def saturation_point(levels):
+    """처리량 증가가 SATURATION_GAIN 미만으로 떨어지는 첫 동시 세션 수 (없으면 None)"""
+    for before, after in zip(levels, levels[1:]):
+        if after["throughput_per_s"] < before["throughput_per_s"] * (1 + SATURATION_GAIN):
+            return before["sessions"]
+    return None
+
+
+def prepare_data(tmp, app, rows, months, literacy_years):
+    """합성 데이터 준비 (환경 변수로 앱에 전달)"""
+    os.environ["BOOK_CACHE_DIR"] = os.path.join(tmp, "data_cache")
+    os.environ["COVER_CACHE_DIR"] = os.path.join(tmp, "covers")
+    os.environ["HISTORY_DB"] = os.path.join(tmp, "history.sqlite3")
+    os.environ["ARTIFACT_DIR"] = os.path.join(tmp, "artifacts")
+    os.environ["BOOK_API_PORT"] = os.environ["LITERACY_API_PORT"] = "0"  # JSON API 서버는 측정 대상 아님
+    os.environ["BOOK_MONTH_DIR"] = os.path.join(tmp, "months")
+    csv_path = write_book_csv(os.path.join(tmp, f"books_{rows}.csv"), rows, n_months=months)
+    os.environ["BOOK_DATA_CSV"] = csv_path
+    if months > 1:
+        ingest([csv_path], os.environ["BOOK_MONTH_DIR"])
+    if app == "wodus":
+        path = os.path.join(tmp, f"literacy_{literacy_years}.csv")
+        make_literacy_frame(literacy_years).to_csv(path, index=False)
+        os.environ["LITERACY_CSV"] = path
+
+
+def print_levels(levels):
+    """단계별 결과 표 출력"""
+    print(f"{'세션':>6} {'처리량/s':>10} {'p50(ms)':>10} {'p95(ms)':>10} {'p99(ms)':>10} "
+          f"{'세션당 KB':>10} {'오류':>6}")
+    for level in levels:
+        print(f"{level['sessions']:>6} {level['throughput_per_s']:>10.1f} {level['p50_ms']:>10.1f} "
+              f"{level['p95_ms']:>10.1f} {level['p99_ms']:>10.1f} {level['rss_per_session_kb']:>10.1f} "
+              f"{level['errors']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=sorted(SESSIONS), default="main")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50, 100, 200, 400], help="동시 세션 수 단계")
+    parser.add_argument("--actions", type=int, default=20, help="세션당 상호작용 수")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="상호작용 사이 평균 대기 시간 (0이면 쉬지 않음)")
+    parser.add_argument("--processes", type=int, default=1, help="세션을 나누어 실행할 프로세스 수")
+    parser.add_argument("--rows", type=int, default=1000, help="도서 데이터 행 수")
+    parser.add_argument("--months", type=int, default=3, help="도서 데이터 기준년월 수")
+    parser.add_argument("--literacy-years", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    cover_server = start_cover_server()
+    levels = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["COVER_ORIGIN"] = f"http://127.0.0.1:{cover_server.server_port}"
+        prepare_data(tmp, args.app, args.rows, args.months, args.literacy_years)
+        for n_sessions in args.sessions:
+            clear_caches()  # 단계마다 빈 캐시에서 시작 (최초 접속 경합 포함)
+            print(f"{args.app}.py 동시 세션 {n_sessions}개 측정 중...", file=sys.stderr)
+            levels.append(run_level(args.app, n_sessions, args.actions, args.think_ms / 1000,
+                                    args.timeout, args.processes))
+    cover_server.shutdown()
+
+    print_levels(levels)
+    saturation = saturation_point(levels)
+    if saturation:
+        print(f"\n포화 지점: 동시 세션 약 {saturation}개 (이후 처리량 증가 {SATURATION_GAIN:.0%} 미만)")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"load-{args.app}-{stamp}-{git_commit()}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"commit": git_commit(), "args": vars(args), "levels": levels, "saturation": saturation},
+                  f, ensure_ascii=False, indent=2)
+    print(f"저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
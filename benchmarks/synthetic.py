@@ -0,0 +1,70 @@
+"""
+벤치마크용 합성 데이터 생성
+people_book.csv와 같은 컬럼 구성의 도서 순위 데이터를 원하는 크기로 생성
+"""
+import numpy as np
+import pandas as pd
+
+# 제목/저자/출판사 생성에 쓰는 한글 음절
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주")
+PUBLISHERS = ["창비", "문학동네", "민음사", "나무옆의자", "팩토리나인", "위즈덤하우스", "다산북스", "김영사"]
+
+
+def _words(rng, count, length):
+    """무작위 한글 단어 목록 생성"""
+    picks = rng.integers(0, len(SYLLABLES), size=(count, length))
+    return ["".join(SYLLABLES[i] for i in row) for row in picks]
+
+
+def make_book_frame(n_rows, n_months=1, seed=0):
+    """
+    합성 도서 순위 프레임 생성
+    - n_months개 월로 나누어 월마다 1위부터 순위번호 부여
+    """
+    rng = np.random.default_rng(seed)
+    per_month = max(1, n_rows // n_months)
+    months = [f"{2023 + (5 + m - 1) // 12}-{(5 + m - 1) % 12 + 1:02d}" for m in range(n_months)]
+
+    month_col = np.repeat(months, per_month)[:n_rows]
+    rank_col = np.tile(np.arange(1, per_month + 1), n_months)[:n_rows]
+    n_rows = len(month_col)
+
+    titles = _words(rng, n_rows, 4)
+    authors = ["지은이: " + name for name in _words(rng, n_rows, 3)]
+    years = rng.integers(1990, 2024, size=n_rows).astype(float)
+    years[rng.random(n_rows) < 0.02] = np.nan  # 출판년도 결측 일부 포함
+
+    return pd.DataFrame({
+        "기준년월": month_col,
+        "순위번호": rank_col,
+        "도서명정보": titles,
+        "저자명정보": authors,
+        "출판사명": rng.choice(PUBLISHERS, size=n_rows),
+        "출판년도": years,
+        "권수(권)": np.nan,
+        "도서이미지URL": [f"https://example.invalid/cover/{i}.jpg" for i in range(n_rows)],
+    })
+
+
+def write_book_csv(path, n_rows, n_months=1, seed=0):
+    """합성 데이터를 원본과 같은 CP949 CSV로 저장"""
+    make_book_frame(n_rows, n_months, seed).to_csv(path, index=False, encoding="cp949")
+    return path
+
+
+def make_literacy_frame(n_years, last_year=2020, seed=0):
+    """
+    wodus.py 형식(Year, Gender, Value)의 확대된 문해력 표 생성
+    - last_year까지 n_years개 연도, 연도마다 전체/남성/여성 3행
+    - 앱이 참조하는 2014/2017/2020년이 포함되도록 3년 간격 대신 1년 간격 사용
+    """
+    rng = np.random.default_rng(seed)
+    years = np.arange(last_year - max(n_years, 7) + 1, last_year + 1)
+    male = 60 + 25 * (years - years[0]) / max(1, len(years) - 1) + rng.normal(0, 0.5, len(years))
+    female = male - 5 - rng.random(len(years)) * 4
+    total = (male + female) / 2
+    return pd.DataFrame({
+        "Year": np.repeat(years, 3),
+        "Gender": np.tile(["전체", "남성", "여성"], len(years)),
+        "Value": np.column_stack([total, male, female]).ravel().round(1),
+    })
@@ -0,0 +1,187 @@
+"""
+도서 순위 데이터 로딩 모듈
+- CP949 CSV를 한 번만 디코딩하여 Feather(Arrow) 컬럼 파일로 변환
+- 이후 실행에서는 메모리 매핑으로 바로 읽어 CSV 디코딩 비용 제거
+- 캐시 유효성은 원본 파일의 크기, 수정 시각, 내용 해시로 판단
+
+사용법 (미리 변환):
+    python book_data.py people_book.csv
+"""
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow.feather as feather
+
+# 기본 데이터 파일과 캐시 폴더
+BOOK_CSV = "people_book.csv"
+CACHE_DIR = ".data_cache"
+
+
+def read_book_csv(csv_path):
+    """원본 CSV 읽기 (CP949 인코딩)"""
+    return pd.read_csv(csv_path, encoding="cp949")
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시 (큰 파일도 조각 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _meta_path(csv_path, cache_dir):
+    """캐시 메타데이터(JSON) 경로"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{name}.meta.json")
+
+
+def _atomic_write(path, write_func):
+    """임시 파일에 쓴 뒤 교체하여 중간 상태의 파일이 보이지 않도록 함"""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_meta(meta_path):
+    """메타데이터 읽기 (없거나 손상되면 None)"""
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    """메타데이터 저장"""
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+    _atomic_write(meta_path, write)
+
+
+def convert_to_columnar(csv_path=BOOK_CSV, cache_dir=CACHE_DIR, content_hash=None):
+    """
+    CSV를 디코딩하여 Feather 파일로 저장하고 메타데이터 반환
+    - 파일명에 내용 해시를 넣어 버전별로 구분
+    - 압축하지 않아야 메모리 매핑으로 복사 없이 읽을 수 있음
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    stat = os.stat(csv_path)
+    content_hash = content_hash or file_hash(csv_path)
+
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    feather_name = f"{name}.{content_hash[:16]}.feather"
+    feather_path = os.path.join(cache_dir, feather_name)
+
+    df = read_book_csv(csv_path)
+    _atomic_write(
+        feather_path,
+        lambda tmp_path: feather.write_feather(df, tmp_path, compression="uncompressed"),
+    )
+
+    meta_path = _meta_path(csv_path, cache_dir)
+    old_meta = _read_meta(meta_path)
+    meta = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": content_hash,
+        "feather": feather_name,
+    }
+    _write_meta(meta_path, meta)
+
+    # 이전 버전의 캐시 파일 정리
+    if old_meta and old_meta.get("feather") != feather_name:
+        old_path = os.path.join(cache_dir, old_meta["feather"])
+        if os.path.exists(old_path):
+            os.remove(old_path)
+    return meta
+
+
+def _valid_meta(csv_path, cache_dir):
+    """
+    캐시가 원본과 일치하면 메타데이터 반환, 아니면 None
+    - 크기와 수정 시각이 같으면 해시 계산 생략
+    - 수정 시각만 바뀐 경우(복사, 재배포) 해시가 같으면 캐시 재사용
+    """
+    meta_path = _meta_path(csv_path, cache_dir)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.exists(os.path.join(cache_dir, meta["feather"])):
+        return None, None
+
+    stat = os.stat(csv_path)
+    if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+        return meta, meta["sha256"]
+    if meta["size"] != stat.st_size:
+        return None, None
+
+    content_hash = file_hash(csv_path)
+    if content_hash != meta["sha256"]:
+        return None, content_hash
+    meta["mtime_ns"] = stat.st_mtime_ns
+    _write_meta(meta_path, meta)
+    return meta, content_hash
+
+
+def load_book_frame(csv_path=BOOK_CSV, cache_dir=CACHE_DIR):
+    """
+    도서 데이터 로드
+    - 유효한 컬럼 캐시가 있으면 메모리 매핑으로 읽기
+    - 없으면 CSV를 디코딩하여 캐시 생성 후 반환
+    - 캐시 폴더에 쓸 수 없는 환경이면 CSV를 직접 읽음
+    """
+    try:
+        meta, content_hash = _valid_meta(csv_path, cache_dir)
+        if meta is None:
+            meta = convert_to_columnar(csv_path, cache_dir, content_hash)
+    except OSError:
+        return read_book_csv(csv_path)
+
+    table = feather.read_table(os.path.join(cache_dir, meta["feather"]), memory_map=True)
+    return table.to_pandas()
+
+
+def rank_index(df):
+    """
+    순위번호 조회용 인덱스
+    - rank_to_pos: 순위번호 → 행 위치 딕셔너리 (O(1) 조회)
+    - sorted_ranks: 정렬된 순위 목록 (selectbox 옵션용)
+    """
+    rank_to_pos = {}
+    for pos, rank in enumerate(df["순위번호"].tolist()):
+        # 같은 순위가 여러 행이면 첫 번째 행 사용 (기존 iloc[0] 동작 유지)
+        rank_to_pos.setdefault(rank, pos)
+    return rank_to_pos, sorted(rank_to_pos)
+
+
+def rank_order(df):
+    """
+    순위순 행 위치 목록 (같은 순위의 도서가 여러 권이면 모두 포함, 원래 행 순서 유지)
+    순위 선택 목록, 갤러리처럼 모든 도서를 순위순으로 보여줄 때 사용
+    """
+    return df["순위번호"].to_numpy().argsort(kind="stable").tolist()
+
+
+def resolve_row(df, rank_to_pos, rank, row_id):
+    """
+    저장해 둔 (순위번호, 행 번호) → 현재 데이터의 행 위치 (없으면 None)
+    - 행 번호의 순위가 그대로면 그 행 (같은 순위의 여러 도서 중 고른 도서)
+    - 데이터 갱신으로 행 배치가 바뀌었으면 그 순위의 첫 번째 행
+    """
+    if row_id is not None and 0 <= row_id < len(df) and df["순위번호"].iat[row_id] == rank:
+        return row_id
+    return rank_to_pos.get(rank)
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or [BOOK_CSV]:
+        result = convert_to_columnar(path)
+        print(f"{path} → {os.path.join(CACHE_DIR, result['feather'])}")
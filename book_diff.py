@@ -0,0 +1,75 @@
+"""
+월별 순위 변동 계산 (전월 대비 상승/하락, 신규 진입, 순위권 이탈)
+- 도서 식별 키: 정규화한 도서명 + 저자 + 출판사를 64비트 해시로 변환
+  (순위번호는 달마다 바뀌므로 키로 쓸 수 없음)
+- 두 달의 (키, 순위, 행 위치) 표를 pd.merge 해시 조인으로 한 번에 비교 (행 단위 반복 없음)
+- 이탈 도서는 전월 키 중 당월 키 집합에 없는 것 (isin 해시 조회)
+- 결과는 현재 달 행 위치 순서의 배열로 돌려주어 상세 화면에서 O(1) 조회
+"""
+import numpy as np
+import pandas as pd
+
+from book_search import normalize_text
+from book_stats import normalize_author
+
+
+def identity_keys(df):
+    """행별 도서 식별 키 (uint64 배열)"""
+    title = df["도서명정보"].map(normalize_text)
+    author = df["저자명정보"].map(normalize_author).map(normalize_text)
+    publisher = df["출판사명"].map(normalize_text)
+    return pd.util.hash_pandas_object(title + "|" + author + "|" + publisher, index=False).to_numpy()
+
+
+def rank_table(df):
+    """식별 키, 순위, 행 위치 표 (행 위치 순서)"""
+    return pd.DataFrame({
+        "key": identity_keys(df),
+        "rank": df["순위번호"].to_numpy(),
+        "pos": np.arange(len(df)),
+    })
+
+
+def diff_months(previous, current):
+    """
+    전월/당월 rank_table 비교
+    - 전월에 같은 도서가 여러 번 나오면 가장 높은 순위와 비교
+    반환 딕셔너리 (배열은 당월 행 위치 순서):
+    - movement: 순위 변화 (양수 = 상승, 신규는 0)
+    - previous_rank: 전월 순위 (신규는 -1)
+    - is_new: 신규 진입 여부
+    - dropped: 전월에만 있던 도서의 전월 순위/행 위치 (순위순)
+    - counts: 상승/하락/유지/신규/이탈 개수
+    """
+    previous = previous.sort_values("rank", kind="stable").drop_duplicates("key")
+    merged = pd.merge(current, previous, on="key", how="left", suffixes=("", "_prev")).sort_values("pos")
+    previous_rank = merged["rank_prev"].fillna(-1).to_numpy(dtype=np.int64)
+    is_new = previous_rank < 0
+    movement = np.where(is_new, 0, previous_rank - merged["rank"].to_numpy(dtype=np.int64))
+
+    dropped = previous[~previous["key"].isin(current["key"])]
+    return {
+        "movement": movement,
+        "previous_rank": previous_rank,
+        "is_new": is_new,
+        "dropped": dropped[["rank", "pos"]].reset_index(drop=True),
+        "counts": {
+            "up": int((movement > 0).sum()),
+            "down": int((movement < 0).sum()),
+            "same": int(((movement == 0) & ~is_new).sum()),
+            "new": int(is_new.sum()),
+            "dropped": len(dropped),
+        },
+    }
+
+
+def movement_label(diff, pos):
+    """당월 행 위치의 변동 표시 ('▲3', '▼2', '-', 'NEW')"""
+    if diff["is_new"][pos]:
+        return "NEW"
+    change = int(diff["movement"][pos])
+    if change > 0:
+        return f"▲{change}"
+    if change < 0:
+        return f"▼{-change}"
+    return "-"
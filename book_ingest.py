@@ -0,0 +1,210 @@
+"""
+월별 도서 순위 CSV 적재 모듈
+- 매월 받는 CP949 CSV를 조각(chunk) 단위로 읽어 정규화
+- 기준년월별 폴더에 Feather 파일로 나누어 저장 (월 단위 파티션)
+- 한 번에 한 조각만 메모리에 올리므로 누적 이력이 커져도 최대 메모리는 일정
+
+저장 구조:
+    book_months/2023-05/CURRENT                   현재 적재본 이름 (한 줄)
+    book_months/2023-05/b00001/part-00000.feather
+    book_months/2023-05/b00001/hashes.json        컬럼별 내용 해시 (달을 읽지 않고 캐시 키를 정할 때 사용)
+    book_months/2023-06/CURRENT
+    book_months/2023-06/b00001/part-00000.feather
+
+재적재하면 같은 달 폴더 안에 새 적재본(b00002/...)을 만든 뒤 CURRENT만 바꾸므로
+달 폴더가 사라지는 순간이 없음 (직전 적재본 하나는 읽는 중인 쪽을 위해 남겨 두고 그 이전 것만 삭제)
+CURRENT가 없는 달 폴더는 예전 구조(달 폴더 바로 아래 part 파일)로 읽음
+
+사용법:
+    python book_ingest.py people_book.csv monthly_csv_dir/ --chunk-rows 50000
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from artifacts import CURRENT_FILE, set_current
+from book_watch import column_digest, update_digest
+
+# 월별 파티션 저장 폴더
+MONTH_DIR = "book_months"
+CHUNK_ROWS = 50000
+
+# 저장 시 컬럼 순서 (모든 파티션이 같은 스키마를 갖도록 고정)
+COLUMNS = ["기준년월", "순위번호", "도서명정보", "저자명정보", "출판사명", "출판년도", "권수(권)", "도서이미지URL"]
+TEXT_COLUMNS = ["도서명정보", "저자명정보", "출판사명", "도서이미지URL"]
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+BUILD_PATTERN = re.compile(r"^b(\d{5,})$")
+HASHES_FILE = "hashes.json"
+KEEP_BUILDS = 2  # 남겨 둘 적재본 수 (현재 + 직전)
+
+
+def normalize_month(value):
+    """'2023-05', '202305', '2023.5' 등을 'YYYY-MM' 형식으로 통일"""
+    digits = re.findall(r"\d+", str(value))
+    if len(digits) == 1 and len(digits[0]) == 6:
+        year, month = digits[0][:4], digits[0][4:]
+    elif len(digits) >= 2:
+        year, month = digits[0], digits[1]
+    else:
+        raise ValueError(f"기준년월 형식을 알 수 없습니다: {value!r}")
+    return f"{int(year):04d}-{int(month):02d}"
+
+
+def normalize_chunk(chunk):
+    """CSV 조각 하나를 저장용 스키마로 정규화"""
+    chunk = chunk.reindex(columns=COLUMNS)
+    chunk["기준년월"] = chunk["기준년월"].map(normalize_month)
+    chunk["순위번호"] = pd.to_numeric(chunk["순위번호"], errors="coerce")
+    chunk = chunk.dropna(subset=["순위번호"])
+    chunk["순위번호"] = chunk["순위번호"].astype("int64")
+    chunk["출판년도"] = pd.to_numeric(chunk["출판년도"], errors="coerce").astype("float64")
+    chunk["권수(권)"] = pd.to_numeric(chunk["권수(권)"], errors="coerce").astype("float64")
+    for name in TEXT_COLUMNS:
+        chunk[name] = chunk[name].fillna("").astype(str).str.strip()
+    return chunk.reset_index(drop=True)
+
+
+def iter_chunks(csv_path, chunk_rows=CHUNK_ROWS):
+    """CSV를 조각 단위로 읽어 정규화된 프레임을 하나씩 반환"""
+    reader = pd.read_csv(csv_path, encoding="cp949", dtype=str, chunksize=chunk_rows)
+    for chunk in reader:
+        yield normalize_chunk(chunk)
+
+
+def expand_sources(paths):
+    """파일과 폴더가 섞인 입력을 CSV 파일 목록으로 변환 (이름순)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            files.append(path)
+    return files
+
+
+def month_builds(month_path):
+    """달 폴더 안의 적재본 이름 목록 (오래된 순)"""
+    try:
+        names = os.listdir(month_path)
+    except OSError:
+        return []
+    return sorted((name for name in names if BUILD_PATTERN.match(name)), key=lambda name: int(name[1:]))
+
+
+def current_build(month_path):
+    """달 폴더에서 지금 읽을 폴더 (CURRENT가 가리키는 적재본, 없으면 달 폴더 자체)"""
+    try:
+        with open(os.path.join(month_path, CURRENT_FILE), encoding="utf-8") as f:
+            return os.path.join(month_path, f.read().strip())
+    except OSError:
+        return month_path
+
+
+def publish_month(month_dir, month, staged):
+    """
+    임시 폴더에 완성한 달 파티션을 새 적재본으로 옮기고 CURRENT 교체
+    기존 달 폴더는 그대로 두므로 읽는 쪽은 항상 완성된 적재본 하나를 보게 됨
+    """
+    month_path = os.path.join(month_dir, month)
+    os.makedirs(month_path, exist_ok=True)
+    builds = month_builds(month_path)
+    name = f"b{int(builds[-1][1:]) + 1 if builds else 1:05d}"
+    os.rename(staged, os.path.join(month_path, name))
+    set_current(month_path, name)
+    for old in (builds + [name])[:-KEEP_BUILDS]:
+        shutil.rmtree(os.path.join(month_path, old), ignore_errors=True)
+    for path in glob.glob(os.path.join(month_path, "part-*.feather")):  # 예전 구조의 파티션 파일
+        os.remove(path)
+
+
+def ingest(paths, month_dir=MONTH_DIR, chunk_rows=CHUNK_ROWS):
+    """
+    CSV 파일들을 월별 파티션으로 적재하고 적재된 기준년월 목록 반환
+    - 이번 적재에 포함된 월은 기존 파티션을 새 데이터로 교체 (재적재해도 중복 없음)
+    - 임시 폴더에 모두 쓴 뒤 월 단위로 새 적재본을 게시하여 읽는 쪽에서 반쯤 쓴 파티션이나 빈 달이 보이지 않음
+    """
+    staging_dir = os.path.join(month_dir, f".staging-{os.getpid()}")
+    os.makedirs(staging_dir, exist_ok=True)
+    part_counts = {}
+    digests = {}  # 달 → 컬럼 → 해시 계산기 (조각 순서대로 이어서 계산하므로 읽은 달의 column_hashes와 같음)
+
+    try:
+        for csv_path in expand_sources(paths):
+            for chunk in iter_chunks(csv_path, chunk_rows):
+                for month, part in chunk.groupby("기준년월", sort=False):
+                    index = part_counts.get(month, 0)
+                    os.makedirs(os.path.join(staging_dir, month), exist_ok=True)
+                    part = part.reset_index(drop=True)
+                    feather.write_feather(
+                        part,
+                        os.path.join(staging_dir, month, f"part-{index:05d}.feather"),
+                        compression="uncompressed",
+                    )
+                    part_counts[month] = index + 1
+                    month_digests = digests.setdefault(month, {name: column_digest() for name in COLUMNS})
+                    for name in COLUMNS:
+                        update_digest(month_digests[name], part[name])
+
+        for month in part_counts:
+            hashes = {name: digest.hexdigest() for name, digest in digests[month].items()}
+            with open(os.path.join(staging_dir, month, HASHES_FILE), "w", encoding="utf-8") as f:
+                json.dump(hashes, f)
+            publish_month(month_dir, month, os.path.join(staging_dir, month))
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return sorted(part_counts)
+
+
+def list_months(month_dir=MONTH_DIR):
+    """적재된 기준년월 목록 (오름차순)"""
+    if not os.path.isdir(month_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(month_dir)
+        if MONTH_PATTERN.match(name) and os.path.isdir(os.path.join(month_dir, name))
+    )
+
+
+def read_month(month, month_dir=MONTH_DIR):
+    """한 달치 파티션만 읽기 (메모리 매핑)"""
+    parts = sorted(glob.glob(os.path.join(current_build(os.path.join(month_dir, month)), "part-*.feather")))
+    if not parts:
+        raise FileNotFoundError(f"{month} 파티션이 없습니다")
+    frames = [feather.read_table(path, memory_map=True).to_pandas() for path in parts]
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def read_month_hashes(month, month_dir=MONTH_DIR):
+    """적재 시 기록한 달의 컬럼별 내용 해시 (예전 구조라 없으면 None)"""
+    try:
+        with open(os.path.join(current_build(os.path.join(month_dir, month)), HASHES_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="CSV 파일 또는 CSV가 들어 있는 폴더")
+    parser.add_argument("--month-dir", default=MONTH_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    months = ingest(args.paths, args.month_dir, args.chunk_rows)
+    if not months:
+        print("적재할 데이터가 없습니다.", file=sys.stderr)
+        return 1
+    print(f"적재 완료: {', '.join(months)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+조회 기록 기반 "비슷한 도서" 추천
+- 도서명(음절 2-gram), 저자, 출판사, 출판년도(5년 단위)를 TF-IDF 희소 특징으로 변환 (행마다 L2 정규화)
+- 데이터셋 버전마다 한 번, 역색인으로 코사인 유사도를 누적해 도서별 상위 k개 이웃 표를 미리 계산
+- 추천 요청 시에는 조회 기록의 이웃 목록을 최근 기록일수록 큰 가중치로 합치기만 함
+  (유사도 계산 없음 → 도서 수와 관계없이 기록 수 × k에 비례)
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from book_search import ngrams, normalize_text
+from book_stats import normalize_author
+
+TOP_K = 20
+# 특징 종류별 가중치 (같은 저자를 제목 유사도보다 크게 반영)
+FEATURE_WEIGHTS = {"title": 1.0, "author": 2.0, "publisher": 0.5, "year": 0.3}
+MAX_DF = 0.05  # 도서의 5% 넘게 나오는 흔한 특징은 이웃 계산에서 제외 (IDF가 작아 영향도 거의 없음)
+YEAR_BUCKET = 5
+RECENCY_DECAY = 0.8  # 조회 기록이 하나 오래될 때마다 곱하는 가중치
+
+
+def book_features(row):
+    """도서 한 권의 특징 → 가중치 딕셔너리"""
+    features = {}
+    for gram in ngrams(normalize_text(row["도서명정보"]), 2):
+        features[f"t:{gram}"] = FEATURE_WEIGHTS["title"]
+    author = normalize_text(normalize_author(row["저자명정보"]))
+    if author:
+        features[f"a:{author}"] = FEATURE_WEIGHTS["author"]
+    publisher = normalize_text(row["출판사명"])
+    if publisher:
+        features[f"p:{publisher}"] = FEATURE_WEIGHTS["publisher"]
+    year = pd.to_numeric(row["출판년도"], errors="coerce")
+    if not pd.isna(year):
+        features[f"y:{int(year) // YEAR_BUCKET * YEAR_BUCKET}"] = FEATURE_WEIGHTS["year"]
+    return features
+
+
+def build_vectors(df):
+    """
+    도서별 TF-IDF 희소 벡터
+    반환: (도서별 [(특징 번호, 값)] 목록, 특징별 (도서 번호 배열, 값 배열) 역색인)
+    """
+    rows = [book_features(row) for row in df[["도서명정보", "저자명정보", "출판사명", "출판년도"]].to_dict("records")]
+    size = len(rows)
+    document_frequency = {}
+    for features in rows:
+        for name in features:
+            document_frequency[name] = document_frequency.get(name, 0) + 1
+
+    vocabulary = {}
+    vectors = []
+    postings = {}
+    for pos, features in enumerate(rows):
+        weighted = {name: value * math.log(1 + size / document_frequency[name]) for name, value in features.items()}
+        norm = math.sqrt(sum(value * value for value in weighted.values())) or 1.0
+        vector = []
+        for name, value in weighted.items():
+            term = vocabulary.setdefault(name, len(vocabulary))
+            vector.append((term, value / norm))
+            postings.setdefault(term, ([], []))
+            postings[term][0].append(pos)
+            postings[term][1].append(value / norm)
+        vectors.append(vector)
+
+    max_df = max(2, int(size * MAX_DF))
+    frozen = {
+        term: (np.array(docs, dtype=np.int32), np.array(values, dtype=np.float32))
+        for term, (docs, values) in postings.items() if 1 < len(docs) <= max_df
+    }
+    return vectors, frozen
+
+
+def build_neighbors(df, top_k=TOP_K):
+    """
+    도서별 상위 k개 이웃 표
+    반환: (neighbors int32 [도서 수, k], scores float32 [도서 수, k]) - 이웃이 부족하면 -1 / 0
+    """
+    vectors, postings = build_vectors(df)
+    size = len(vectors)
+    neighbors = np.full((size, top_k), -1, dtype=np.int32)
+    scores = np.zeros((size, top_k), dtype=np.float32)
+
+    for pos, vector in enumerate(vectors):
+        hits = [(postings[term], value) for term, value in vector if term in postings]
+        if not hits:
+            continue
+        docs = np.concatenate([docs for (docs, _), _ in hits])
+        weights = np.concatenate([values * value for (_, values), value in hits])
+        # 후보 도서만 모아 점수 합산 (전체 도서 배열을 만들지 않음)
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        similarity = np.bincount(inverse, weights=weights)
+        similarity[candidates == pos] = 0.0
+        count = min(top_k, len(candidates))
+        top = np.argpartition(-similarity, count - 1)[:count]
+        top = top[np.argsort(-similarity[top], kind="stable")]
+        top = top[similarity[top] > 0]
+        neighbors[pos, :len(top)] = candidates[top]
+        scores[pos, :len(top)] = similarity[top]
+    return neighbors, scores
+
+
+def recommend(neighbors, scores, history, limit=5):
+    """
+    조회 기록(행 위치, 최근 순)의 이웃 목록을 합쳐 추천 도서 행 위치 반환
+    - 최근 기록일수록 RECENCY_DECAY 배로 큰 가중치
+    - 이미 조회한 도서는 제외
+    """
+    history = [int(pos) for pos in history]
+    if not history:
+        return []
+    seen = set(history)
+    merged = {}
+    for age, pos in enumerate(history):
+        decay = RECENCY_DECAY ** age
+        for neighbor, score in zip(neighbors[pos].tolist(), scores[pos].tolist()):
+            if neighbor < 0:
+                break
+            if neighbor not in seen:
+                merged[neighbor] = merged.get(neighbor, 0.0) + score * decay
+    return sorted(merged, key=merged.get, reverse=True)[:limit]
@@ -0,0 +1,149 @@
+"""
+도서 검색용 역색인(inverted index)
+- 도서명정보, 저자명정보, 출판사명을 글자 n-gram으로 색인
+- 한글 음절을 자모로 분해한 색인을 함께 만들어 입력 중인 글자('김ㅎ', '불펴')도 검색 가능
+- 데이터셋 버전(기준년월)마다 한 번만 만들고 검색은 색인 조회와 NumPy 누적만 수행
+"""
+import math
+import re
+
+import numpy as np
+
+from book_stats import author_names
+
+# 필드별 가중치 (제목 일치를 가장 중요하게 반영)
+FIELD_WEIGHTS = {"도서명정보": 3.0, "저자명정보": 2.0, "출판사명": 1.0}
+MIN_MATCH = 0.6  # 검색어 n-gram 중 이 비율 이상 일치해야 결과에 포함
+JAMO_N = 3
+
+# 한글 자모 분해용 표 (호환 자모)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+NON_WORD = re.compile(r"[^0-9a-z가-힣ㄱ-ㆎ]+")
+COMPAT_JAMO = re.compile(r"[ㄱ-ㆎ]")
+
+
+def normalize_text(text):
+    """소문자 변환, 공백/기호 제거"""
+    if not isinstance(text, str):
+        return ""
+    return NON_WORD.sub("", text.lower())
+
+
+def field_text(name, value):
+    """색인할 필드 값 (저자명정보는 book_stats와 같은 방식으로 역할 표기를 뺀 모든 저자 이름)"""
+    if name == "저자명정보":
+        value = " ".join(author_names(value))
+    return normalize_text(value)
+
+
+def to_jamo(text):
+    """한글 음절을 초성/중성/종성 자모 문자열로 분해"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[(code % 588) // 28])
+            out.append(JONGSEONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def ngrams(text, n):
+    """문자열의 n-gram 집합 (문자열이 n보다 짧으면 문자열 전체)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class BookSearchIndex:
+    """
+    글자 n-gram 역색인
+    - syllable: 음절 1-gram/2-gram → (도서 번호 배열, 가중치 배열)
+    - jamo: 자모 3-gram → (도서 번호 배열, 가중치 배열)
+    도서 번호는 데이터프레임의 행 위치
+    """
+    def __init__(self, df, use_jamo=True):
+        self.size = len(df)
+        self.ranks = df["순위번호"].to_numpy()
+        self.use_jamo = use_jamo
+
+        syllable_postings = {}
+        jamo_postings = {}
+        for name, weight in FIELD_WEIGHTS.items():
+            for pos, value in enumerate(df[name].tolist()):
+                text = field_text(name, value)
+                grams = ngrams(text, 1) | ngrams(text, 2)
+                self._add(syllable_postings, grams, pos, weight)
+                if use_jamo:
+                    self._add(jamo_postings, ngrams(to_jamo(text), JAMO_N), pos, weight)
+
+        self.syllable = self._freeze(syllable_postings)
+        self.jamo = self._freeze(jamo_postings)
+
+    @staticmethod
+    def _add(postings, grams, pos, weight):
+        """n-gram별로 도서 번호와 가중치 기록 (여러 필드에 나오면 큰 가중치 유지)"""
+        for gram in grams:
+            docs = postings.setdefault(gram, {})
+            if docs.get(pos, 0) < weight:
+                docs[pos] = weight
+
+    def _freeze(self, postings):
+        """
+        검색 속도를 위해 NumPy 배열로 변환
+        가중치에 IDF를 곱해 흔한 n-gram의 영향을 줄임
+        """
+        frozen = {}
+        for gram, docs in postings.items():
+            idf = math.log(1 + self.size / len(docs))
+            frozen[gram] = (
+                np.fromiter(docs.keys(), dtype=np.int32, count=len(docs)),
+                np.fromiter(docs.values(), dtype=np.float32, count=len(docs)) * idf,
+            )
+        return frozen
+
+    def _query(self, postings, grams, limit):
+        """n-gram 목록으로 점수를 누적하여 상위 도서 번호 반환"""
+        grams = [gram for gram in grams if gram]
+        if not grams:
+            return []
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=np.int16)
+        for gram in grams:
+            hit = postings.get(gram)
+            if hit is None:
+                continue
+            docs, weights = hit
+            scores[docs] += weights
+            matched[docs] += 1
+
+        required = max(1, math.ceil(len(grams) * MIN_MATCH))
+        candidates = np.flatnonzero(matched >= required)
+        if len(candidates) == 0:
+            return []
+        # 점수 높은 순, 같으면 순위가 높은(숫자가 작은) 도서 먼저
+        order = np.lexsort((self.ranks[candidates], -scores[candidates]))
+        return candidates[order[:limit]].tolist()
+
+    def search(self, query, limit=20):
+        """
+        검색어와 일치하는 도서의 행 위치 목록 (관련도순)
+        - 완성된 음절은 음절 n-gram으로 검색
+        - 자모가 섞여 있거나 음절 검색 결과가 없으면 자모 n-gram으로 다시 검색
+        """
+        text = normalize_text(query)
+        if not text:
+            return []
+        if not COMPAT_JAMO.search(text):
+            n = 1 if len(text) == 1 else 2
+            hits = self._query(self.syllable, ngrams(text, n), limit)
+            if hits or not self.use_jamo:
+                return hits
+        if not self.use_jamo:
+            return []
+        return self._query(self.jamo, ngrams(to_jamo(text), JAMO_N), limit)
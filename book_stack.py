@@ -0,0 +1,84 @@
+import sys
+from collections import OrderedDict
+from itertools import islice
+
+# 세션당 기본 최대 저장 개수
+MAX_HISTORY = 50
+
+
+# 스택 클래스 정의
+class BookViewStack:
+    """
+    도서 조회 기록을 관리하는 스택 자료구조
+    LIFO(Last In First Out) 방식 - 마지막에 본 도서가 가장 먼저 나옴
+
+    OrderedDict((조회 키, 행 번호) 항목)로 구현하여
+    Push / 중복 제거 / 오래된 항목 제거가 모두 O(1)
+    조회 키는 (기준년월, 순위번호) - 월이 달라지면 같은 순위도 다른 도서
+    같은 순위에 도서가 여러 권일 수 있으므로 중복 판단은 (조회 키, 행 번호) 단위
+    도서 상세 정보는 저장하지 않고, 화면에 표시할 때 공유 데이터프레임에서 조회
+    """
+    def __init__(self, max_size=MAX_HISTORY):
+        self.stack = OrderedDict()  # 가장 오래된 항목이 앞, 최신 항목이 뒤
+        self.max_size = max_size  # 최대 저장 개수
+
+    def push(self, key, row_id):
+        """
+        스택에 도서 추가 (Push 연산)
+        - 같은 도서가 이미 있으면 맨 위로 이동
+        - 최대 크기를 초과하면 가장 오래된 항목 제거
+        """
+        entry = (key, row_id)
+        self.stack[entry] = None
+        self.stack.move_to_end(entry)
+
+        # 최대 크기 초과시 가장 아래(오래된) 항목 제거
+        while len(self.stack) > self.max_size:
+            self.stack.popitem(last=False)
+
+    def pop(self):
+        """
+        스택에서 맨 위 도서 제거하고 (조회 키, 행 번호) 반환 (Pop 연산)
+        스택이 비어있으면 None 반환
+        """
+        if not self.is_empty():
+            return self.stack.popitem(last=True)[0]
+        return None
+
+    def peek(self):
+        """
+        스택 맨 위 도서 확인 (제거하지 않음)
+        """
+        if not self.is_empty():
+            return next(reversed(self.stack))
+        return None
+
+    def is_empty(self):
+        """스택이 비어있는지 확인"""
+        return len(self.stack) == 0
+
+    def size(self):
+        """스택 크기 반환"""
+        return len(self.stack)
+
+    def get_history(self, limit=None):
+        """조회 기록 반환 (최신순, (조회 키, 행 번호) 목록)"""
+        return list(islice(reversed(self.stack), limit))
+
+    def entries(self):
+        """오래된 순 (조회 키, 행 번호) 목록 (저장/복원용)"""
+        return list(self.stack)
+
+    def clear(self):
+        """스택 전체 초기화"""
+        self.stack.clear()
+
+    def nbytes(self):
+        """세션당 스택이 차지하는 메모리(바이트) 추정치"""
+        total = sys.getsizeof(self) + sys.getsizeof(self.stack)
+        for entry in self.stack:
+            key, row_id = entry
+            total += sys.getsizeof(entry) + sys.getsizeof(key) + sys.getsizeof(row_id)
+            if isinstance(key, tuple):
+                total += sum(sys.getsizeof(part) for part in key)
+        return total
@@ -0,0 +1,140 @@
+"""
+저자/출판사 순위표(leaderboard) 집계
+- 저자명은 '지은이:', '글·그림', '(지은이)', '[지음]' 같은 앞뒤 역할 표기를 제거하고 여러 명이면 첫 번째 저자 기준
+  (검색 색인도 author_names로 같은 정규화를 사용)
+- 월별로 (등장 수, 순위 합, 최고 순위)를 한 번만 집계해 두고
+  여러 달을 합칠 때는 이 값들을 더하기/최솟값으로 병합 (전체 이력 재집계 없음)
+"""
+import re
+
+import pandas as pd
+
+# 역할 표기 ('글·그림'처럼 여러 역할을 이은 표기 포함)
+ROLE = r"(?:지은이|지음|저자|글쓴이|글|그림|그린이|옮긴이|옮김|역자|엮은이|엮음|원작|감수|기획|동화|만화|사진|일러스트|스토리)"
+ROLES = rf"{ROLE}(?:\s*[·ㆍ]\s*{ROLE})*"
+AUTHOR_ROLE = re.compile(rf"^\s*{ROLES}\s*:\s*")  # 앞쪽 '지은이: ', '글·그림: '
+AUTHOR_ROLE_SUFFIX = re.compile(  # 뒤쪽 ' 지음', ' 글·그림', ' (지은이)', ' [지음]'
+    rf"(?:\s+{ROLES}|\s*\(\s*{ROLES}\s*\)|\s*\[\s*{ROLES}\s*\])\s*$"
+)
+AUTHOR_SPLIT = re.compile(r"\s*[;,/|]\s*")
+ENTITY_COLUMNS = {"author": "저자", "publisher": "출판사명"}
+
+
+def normalize_author(value):
+    """
+    첫 번째 저자 이름만 남기고 앞뒤 역할 표기 제거 (people_book.csv 실제 표기 예)
+
+    >>> normalize_author("지은이: 김호연 ; 옮긴이: ...")
+    '김호연'
+    >>> normalize_author("히로시마 레이코 글 ;김정화 옮김")
+    '히로시마 레이코'
+    >>> normalize_author("글·그림: 신태훈")
+    '신태훈'
+    >>> normalize_author("트롤 글·그림 ;김정화 옮김")
+    '트롤'
+    >>> normalize_author("자청 지음")
+    '자청'
+    >>> normalize_author("세이노 (지은이)")
+    '세이노'
+    >>> normalize_author("사이토 히토리 [지음] ;김진아 옮김")
+    '사이토 히토리'
+    >>> normalize_author("흔한남매 (원작), 이현진, 닥터 스코 (글), 김덕영 (그림)")
+    '흔한남매'
+    >>> normalize_author("흔한남매 (원작)|한은호")
+    '흔한남매'
+    >>> normalize_author("홍민정 동화 ;김재희 그림")
+    '홍민정'
+    >>> normalize_author("원작: 흔한남매 ;그림: 유난희")
+    '흔한남매'
+    >>> normalize_author("글쓴이: 이지음")
+    '이지음'
+    >>> normalize_author("손원평")
+    '손원평'
+    """
+    if not isinstance(value, str):
+        return ""
+    return strip_role(AUTHOR_SPLIT.split(value.strip(), maxsplit=1)[0])
+
+
+def strip_role(name):
+    """저자 한 명 표기에서 앞뒤 역할 표기 제거"""
+    return AUTHOR_ROLE_SUFFIX.sub("", AUTHOR_ROLE.sub("", name)).strip()
+
+
+def author_names(value):
+    """
+    모든 저자 이름 (역할 표기 제거, 빈 항목 제외) - 공동 저자로도 찾을 수 있도록 검색 색인에서 사용
+
+    >>> author_names("지은이: 김호연 ; 옮긴이: 이영미")
+    ['김호연', '이영미']
+    >>> author_names("흔한남매 (원작), 이현진, 닥터 스코 (글), 김덕영 (그림)")
+    ['흔한남매', '이현진', '닥터 스코', '김덕영']
+    """
+    if not isinstance(value, str):
+        return []
+    return [name for name in map(strip_role, AUTHOR_SPLIT.split(value.strip())) if name]
+
+
+def entity_keys(df):
+    """집계 기준 컬럼 (저자: 정규화된 저자명, 출판사: 공백 제거한 출판사명)"""
+    return pd.DataFrame({
+        "저자": df["저자명정보"].map(normalize_author),
+        "출판사명": df["출판사명"].fillna("").astype(str).str.strip(),
+        "순위번호": df["순위번호"].to_numpy(),
+    })
+
+
+def aggregate_month(df):
+    """
+    한 달치 데이터의 저자/출판사별 부분 집계
+    반환: {"author": 프레임, "publisher": 프레임} (인덱스: 이름, 컬럼: count/rank_sum/best_rank)
+    """
+    keys = entity_keys(df)
+    result = {}
+    for kind, column in ENTITY_COLUMNS.items():
+        valid = keys[keys[column] != ""]
+        result[kind] = valid.groupby(column, sort=False)["순위번호"].agg(
+            count="count", rank_sum="sum", best_rank="min"
+        )
+    return result
+
+
+def merge_many(aggregates):
+    """여러 부분 집계를 한 번에 병합 (달 수와 관계없이 concat과 groupby 한 번씩)"""
+    if len(aggregates) == 1:
+        return aggregates[0]
+    merged = {}
+    for kind in ENTITY_COLUMNS:
+        both = pd.concat([aggregate[kind] for aggregate in aggregates])
+        merged[kind] = both.groupby(level=0, sort=False).agg(
+            {"count": "sum", "rank_sum": "sum", "best_rank": "min"}
+        )
+    return merged
+
+
+def leaderboard(aggregate, kind, top_k=10):
+    """
+    상위 k개 순위표 (등장 수 많은 순, 같으면 최고 순위가 높은 순)
+    컬럼: 등장 수, 최고 순위, 평균 순위
+    """
+    table = aggregate[kind]
+    top = table.sort_values(["count", "best_rank"], ascending=[False, True]).head(top_k)
+    return pd.DataFrame({
+        "등장 수": top["count"],
+        "최고 순위": top["best_rank"],
+        "평균 순위": (top["rank_sum"] / top["count"]).round(1),
+    })
+
+
+def entity_rows(df):
+    """저자/출판사 이름 → 행 위치 배열 (상세 보기용, 순위순)"""
+    keys = entity_keys(df)
+    ranks = keys["순위번호"].to_numpy()
+    result = {}
+    for kind, column in ENTITY_COLUMNS.items():
+        groups = keys.groupby(column, sort=False).indices
+        result[kind] = {
+            name: positions[ranks[positions].argsort(kind="stable")]
+            for name, positions in groups.items() if name
+        }
+    return result
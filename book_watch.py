@@ -0,0 +1,290 @@
+"""
+도서 데이터 파일 변경 감지와 부분 갱신
+- 월 파티션 폴더(또는 people_book.csv)의 수정 시각/크기를 주기적으로 확인하고
+  바뀐 달만 다시 읽은 뒤 컬럼 내용 해시로 실제 변경 여부 확인 (수정 시각만 바뀐 경우 무시)
+- 이전 프레임과 순위번호 기준으로 비교하여 순위 배치가 같으면
+  바뀐 컬럼의 바뀐 행만 교체하고 나머지 컬럼 배열은 이전 프레임과 공유
+- 파생 구조(검색 색인, 집계 등)는 의존 컬럼 해시(key)를 캐시 키로 쓰므로
+  바뀐 달에서 바뀐 컬럼에 의존하는 구조만 다시 만들어짐
+- 새 데이터는 새 스냅샷 객체로 만든 뒤 참조 하나만 바꿔서 교체
+  (rerun 시작 시 스냅샷을 한 번 받아 끝까지 쓰므로 반쯤 바뀐 데이터를 보지 않음)
+- 읽은 달은 최근 사용한 max_months개만 메모리에 두고, 읽지 않은 달의 캐시 키는 적재 시 기록한 해시로 정함
+  (여러 달을 훑는 화면이 모든 파티션을 읽어 메모리에 남기지 않도록)
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from shared_data import freeze_frame
+
+CHECK_INTERVAL = 5.0  # 파일 변경 확인 최소 간격(초)
+MAX_LOADED_MONTHS = 6  # 메모리에 둘 읽은 달 수 (넘으면 가장 오래 쓰지 않은 달부터 내려놓음)
+
+
+def path_signature(path):
+    """파일 또는 폴더(안의 파일들)의 수정 시각과 크기 (없으면 None)"""
+    try:
+        if not os.path.isdir(path):
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        entries = []
+        for name in sorted(os.listdir(path)):
+            stat = os.stat(os.path.join(path, name))
+            entries.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+    except OSError:
+        return None
+
+
+def column_digest():
+    """컬럼 해시 계산기 (update_digest로 값을 이어 넣고 hexdigest로 결과)"""
+    return hashlib.blake2b(digest_size=8)
+
+
+def update_digest(digest, column):
+    """
+    컬럼 값 해시를 이어서 반영
+    값별 해시를 이어 붙이므로 조각으로 나누어 넣어도 합친 컬럼을 한 번에 넣은 것과 같음 (적재 시 조각별 계산용)
+    """
+    digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+
+
+def column_hashes(df):
+    """컬럼별 내용 해시 (행 순서 포함)"""
+    hashes = {}
+    for name in df.columns:
+        digest = column_digest()
+        update_digest(digest, df[name])
+        hashes[name] = digest.hexdigest()
+    return hashes
+
+
+def diff_rows(old, new):
+    """
+    같은 달의 이전/새 프레임 비교 (순위번호 기준)
+    반환 딕셔너리:
+    - same_layout: 행 수와 행별 순위번호가 같은지 (같으면 행 위치가 그대로 유지됨)
+    - positions: 값이 바뀐 행 위치 (same_layout일 때만)
+    - changed / added / removed: 내용이 바뀐 순위, 새로 생긴 순위, 없어진 순위
+    """
+    old_ranks = old["순위번호"].to_numpy()
+    new_ranks = new["순위번호"].to_numpy()
+    same_layout = list(old.columns) == list(new.columns) and np.array_equal(old_ranks, new_ranks)
+    if same_layout:
+        differs = np.zeros(len(new), dtype=bool)
+        for name in new.columns:
+            a, b = old[name].to_numpy(), new[name].to_numpy()
+            differs |= ~((a == b) | (pd.isna(a) & pd.isna(b)))
+        positions = np.flatnonzero(differs)
+        return {"same_layout": True, "positions": positions,
+                "changed": new_ranks[positions].tolist(), "added": [], "removed": []}
+
+    old_by_rank = old.drop_duplicates("순위번호").set_index("순위번호")
+    new_by_rank = new.drop_duplicates("순위번호").set_index("순위번호")
+    common = old_by_rank.index.intersection(new_by_rank.index)
+    columns = old_by_rank.columns.intersection(new_by_rank.columns)
+    a = old_by_rank.loc[common, columns].astype(object)
+    b = new_by_rank.loc[common, columns].astype(object)
+    changed = common[~((a == b) | (a.isna() & b.isna())).all(axis=1).to_numpy()]
+    return {
+        "same_layout": False,
+        "positions": None,
+        "changed": changed.tolist(),
+        "added": new_by_rank.index.difference(old_by_rank.index).tolist(),
+        "removed": old_by_rank.index.difference(new_by_rank.index).tolist(),
+    }
+
+
+def patch_frame(old, new, positions, changed_columns):
+    """
+    순위 배치가 같은 두 프레임에서 바뀐 컬럼의 바뀐 행만 교체한 읽기 전용 프레임
+    바뀌지 않은 컬럼은 이전 프레임의 배열을 그대로 사용 (복사 없음)
+    """
+    columns = {}
+    for name in new.columns:
+        if name not in changed_columns:
+            columns[name] = old[name].to_numpy()
+            continue
+        values = old[name].to_numpy()
+        replacement = new[name].to_numpy()
+        if values.dtype != replacement.dtype:
+            values = replacement.copy()  # 자료형이 바뀌면 컬럼 전체 교체
+        else:
+            values = values.copy()
+            values[positions] = replacement[positions]
+        values.flags.writeable = False
+        columns[name] = values
+    frame = pd.DataFrame(columns, index=old.index, copy=False)
+    frame.columns = new.columns
+    return frame
+
+
+class BookSnapshot:
+    """
+    한 시점의 도서 데이터 (만든 뒤에는 교체만 하고 기존 달의 프레임은 바꾸지 않음)
+    - 아직 읽지 않은 달은 처음 요청할 때 읽어서 추가
+    - version: 스냅샷 번호 (데이터가 바뀔 때마다 1씩 증가)
+    - revisions: 달별 변경 횟수 (0이면 시작 시 데이터 그대로)
+      읽은 달은 내용이 바뀌었을 때, 아직 읽지 않은 달은 파일이 바뀌었을 때 증가
+    - changes: 직전 스냅샷 대비 달별 diff_rows 결과
+    - frames: 읽은 달 (LRU, 최대 max_months개 - 내려놓은 달은 다시 요청하면 다시 읽음)
+    - hasher(month): 달을 읽지 않고 컬럼별 해시를 돌려주는 함수 (없거나 None이면 달을 읽어서 계산)
+    """
+    def __init__(self, reader, signatures, frames=None, hashes=None, revisions=None, changes=None, version=0,
+                 hasher=None, max_months=MAX_LOADED_MONTHS):
+        self.reader = reader
+        self.signatures = signatures
+        self.months = sorted(month for month in signatures if month is not None)
+        self.frames = OrderedDict(frames or {})
+        self.hashes = hashes or {}
+        self.revisions = revisions or {}
+        self.changes = changes or {}
+        self.version = version
+        self.hasher = hasher
+        self.max_months = max_months
+        self.lock = threading.Lock()
+
+    def frame(self, month):
+        """달의 읽기 전용 프레임 (처음 요청할 때만 파일을 읽음)"""
+        frame = self.frames.get(month)
+        if frame is not None:
+            # 다른 달을 읽는 동안 기다리지 않도록 lock 없이 사용 순서만 갱신 (그사이 내려놓였으면 그대로 사용)
+            try:
+                self.frames.move_to_end(month)
+            except KeyError:
+                pass
+            return frame
+        with self.lock:
+            frame = self.frames.get(month)
+            if frame is not None:
+                return frame
+            frame = freeze_frame(self.reader(month))
+            self.hashes[month] = column_hashes(frame)
+            self.frames[month] = frame
+            while len(self.frames) > max(self.max_months, 1):
+                self.frames.popitem(last=False)  # 해시는 남겨 두므로 캐시 키를 정할 때 다시 읽지 않음
+        return frame
+
+    def key(self, month, columns):
+        """
+        지정한 컬럼들의 내용 해시를 이은 캐시 키 (이 컬럼들이 바뀔 때만 달라짐)
+        읽지 않은 달은 hasher의 해시를 사용하므로 키만 필요할 때 달을 읽지 않음
+        """
+        hashes = self.hashes.get(month)
+        if hashes is None:
+            hashes = self.hasher(month) if self.hasher is not None else None
+            if hashes is None:
+                self.frame(month)
+                hashes = self.hashes[month]
+            else:
+                with self.lock:
+                    hashes = self.hashes.setdefault(month, hashes)
+        return "-".join(hashes.get(name, "") for name in columns)
+
+    def revision(self, month):
+        """달의 변경 횟수 (0이면 시작 시 읽은 파일 그대로)"""
+        return self.revisions.get(month, 0)
+
+    def loaded(self):
+        """이미 읽은 (달, 프레임) 목록"""
+        with self.lock:
+            return list(self.frames.items())
+
+
+class BookDataWatcher:
+    """
+    데이터 파일 감시자 (프로세스당 하나, 모든 세션이 공유)
+    - reader(month): 달(파일 하나뿐이면 None)의 프레임을 읽는 함수
+    - sources(): {달: path_signature} 를 돌려주는 함수
+    - hasher(month), max_months: BookSnapshot 참고
+    - 확인은 interval초에 한 번, 한 스레드만 수행 (다른 세션은 기다리지 않고 기존 스냅샷 사용)
+    - 갱신 중 읽기에 실패하면 기존 스냅샷을 계속 쓰고 다음 확인 때 다시 시도
+    """
+    def __init__(self, reader, sources, interval=CHECK_INTERVAL, hasher=None, max_months=MAX_LOADED_MONTHS):
+        self.reader = reader
+        self.sources = sources
+        self.interval = interval
+        self.hasher = hasher
+        self.max_months = max_months
+        self.lock = threading.Lock()
+        self.snapshot = BookSnapshot(reader, sources(), hasher=hasher, max_months=max_months)
+        self.checked = time.monotonic()
+
+    def current(self):
+        """현재 스냅샷 (확인 간격이 지났으면 먼저 변경 확인)"""
+        if time.monotonic() - self.checked >= self.interval:
+            self.refresh()
+        return self.snapshot
+
+    def refresh(self):
+        """파일 변경 확인 후 바뀐 달만 갱신한 새 스냅샷으로 교체 (교체했으면 True)"""
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            self.checked = time.monotonic()
+            old = self.snapshot
+            try:
+                signatures = self.sources()
+                if signatures == old.signatures:
+                    return False
+                self.snapshot = self.rebuild(old, signatures)
+                return True
+            except Exception:
+                # 쓰는 도중의 파일 등으로 읽기 실패 - 이전 스냅샷을 계속 쓰고
+                # 서명을 갱신하지 않았으므로 다음 확인 때 다시 시도
+                print("도서 데이터 갱신 실패 (이전 데이터 유지)", file=sys.stderr)
+                traceback.print_exc()
+                return False
+        finally:
+            self.lock.release()
+
+    def rebuild(self, old, signatures):
+        """바뀐 달만 다시 읽어 갱신한 새 스냅샷 (읽기 실패 시 예외를 그대로 전달)"""
+        frames, hashes, revisions, changes = {}, {}, dict(old.revisions), {}
+        for month, frame in old.loaded():
+            if month not in signatures:
+                continue  # 삭제된 달
+            if signatures[month] == old.signatures.get(month):
+                frames[month], hashes[month] = frame, old.hashes[month]
+                continue
+            new = self.reader(month)
+            new_hashes = column_hashes(new)
+            if new_hashes == old.hashes[month]:
+                frames[month], hashes[month] = frame, new_hashes  # 수정 시각만 바뀜
+                continue
+            diff = diff_rows(frame, new)
+            if diff["same_layout"]:
+                changed_columns = {name for name in new_hashes if new_hashes[name] != old.hashes[month].get(name)}
+                frames[month] = patch_frame(frame, new, diff["positions"], changed_columns)
+            else:
+                frames[month] = freeze_frame(new)
+            hashes[month] = new_hashes
+            revisions[month] = revisions.get(month, 0) + 1
+            changes[month] = diff
+
+        # 읽지 않은 달도 파일이 그대로면 적재 시 해시를 그대로 사용
+        for month, month_hashes in old.hashes.items():
+            if month not in hashes and month in signatures and signatures[month] == old.signatures.get(month):
+                hashes[month] = month_hashes
+
+        # 읽은 적 없는 달은 서명만 갱신하고 (처음 요청할 때 새 파일을 읽음)
+        # 내용을 비교할 수 없으므로 파일이 바뀌었으면 변경된 것으로 보고 revision 증가
+        # (revision 0을 기준으로 미리 계산된 artifact를 쓰므로 이전 artifact를 쓰지 않도록)
+        touched = False
+        for month, signature in signatures.items():
+            if month not in frames and month not in changes and signature != old.signatures.get(month):
+                revisions[month] = revisions.get(month, 0) + 1
+                touched = True
+        if changes or touched or set(signatures) != set(old.signatures):
+            version = old.version + 1
+        else:
+            version = old.version
+        return BookSnapshot(self.reader, signatures, frames, hashes, revisions, changes, version,
+                            self.hasher, self.max_months)
@@ -0,0 +1,239 @@
+"""
+도서 표지 이미지 로컬 캐시
+- 표지 원본은 URL당 한 번만 내려받아 디스크에 저장
+- 고정 크기 썸네일을 만들어 함께 저장
+- 전체 용량이 한도를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU)
+- st.image에는 원격 URL 대신 로컬 바이트를 전달
+
+origin을 지정하면 표지 URL의 호스트를 바꿔서 요청하므로
+로컬 테스트 서버(예: python -m http.server)로 대신 받아올 수 있음
+
+화면을 그릴 때는 cached_thumbnail로 이미 만든 썸네일만 쓰고 (네트워크를 기다리지 않음)
+없는 표지는 prefetch(visible=True)로 화면용 스레드 풀에, 다음 페이지는 prefetch로 미리 받아오기 풀에 넣음
+(대기 작업 수에 상한이 있어 무한정 쌓이지 않고, 보이는 표지가 미리 받아오기 작업 뒤에서 기다리지 않음)
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+from PIL import Image, ImageOps
+
+COVER_DIR = ".cover_cache"
+MAX_BYTES = 200 * 1024 * 1024
+THUMB_SIZE = (160, 230)
+DETAIL_SIZE = (360, 520)
+FETCH_WORKERS = 4
+PREFETCH_WORKERS = 2  # 미리 받아오기 전용 스레드 수 (화면에 보이는 표지와 스레드를 나눠 쓰지 않음)
+MAX_PREFETCH = 64  # 미리 받아오기 대기 작업 최대 개수
+FAILURE_TTL = 60.0  # 내려받기에 실패한 URL을 다시 시도하지 않는 시간(초)
+
+
+class CoverCache:
+    """
+    표지 이미지 디스크 캐시 (여러 세션/스레드가 공유)
+    - entries: 파일명 → 크기, 앞쪽이 가장 오래 사용하지 않은 파일
+    """
+    def __init__(self, cache_dir=COVER_DIR, max_bytes=MAX_BYTES, origin=None, timeout=5):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.origin = origin
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="cover")
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="cover-prefetch")
+        self.pending = set()  # 미리 받아오는 중인 (URL, 크기)
+        self.failures = {}  # 내려받기에 실패한 URL → 다시 시도할 수 있는 시각 (서버가 내려가도 매번 timeout까지 기다리지 않음)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """디스크에 남아 있는 파일을 마지막 사용 시각 순으로 등록"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(".tmp") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self.entries[name] = size
+            self.total_bytes += size
+
+    def _request_url(self, url):
+        """origin이 지정되어 있으면 URL의 호스트 부분을 교체"""
+        if not self.origin:
+            return url
+        parts = urlsplit(url)
+        origin = urlsplit(self.origin)
+        return urlunsplit((origin.scheme, origin.netloc, parts.path, parts.query, ""))
+
+    def _fetch(self, url):
+        """원격 이미지 내려받기"""
+        request = urllib.request.Request(self._request_url(url), headers={"User-Agent": "book-ranking-app"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def _read(self, name):
+        """캐시 파일 읽기 (없으면 None), 읽으면 최근 사용으로 표시"""
+        path = os.path.join(self.cache_dir, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self.lock:
+                size = self.entries.pop(name, None)
+                if size is not None:
+                    self.total_bytes -= size
+            return None
+        with self.lock:
+            if name in self.entries:
+                self.entries.move_to_end(name)
+        try:
+            os.utime(path)  # 재시작 후에도 사용 순서 유지
+        except OSError:
+            pass
+        return data
+
+    def _write(self, name, data):
+        """캐시 파일 저장 후 용량 한도를 넘으면 오래된 파일부터 삭제"""
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        evicted = []
+        with self.lock:
+            self.total_bytes -= self.entries.pop(name, 0)
+            self.entries[name] = len(data)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_name, old_size = self.entries.popitem(last=False)
+                self.total_bytes -= old_size
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, old_name))
+            except FileNotFoundError:
+                pass
+
+    def get_original(self, url):
+        """표지 원본 바이트 반환 (내려받기 실패 시 None)"""
+        if not isinstance(url, str) or not url:
+            return None
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".orig"
+        data = self._read(name)
+        if data is None:
+            with self.lock:
+                if self.failures.get(url, 0) > time.monotonic():
+                    return None
+            try:
+                data = self._fetch(url)
+            except (OSError, ValueError):
+                with self.lock:
+                    self.failures[url] = time.monotonic() + FAILURE_TTL
+                    if len(self.failures) > MAX_PREFETCH * 16:
+                        now = time.monotonic()
+                        self.failures = {key: until for key, until in self.failures.items() if until > now}
+                return None
+            self._write(name, data)
+            with self.lock:
+                self.failures.pop(url, None)
+        return data
+
+    def _thumbnail_name(self, url, size):
+        """썸네일 캐시 파일 이름"""
+        width, height = size
+        return f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.{width}x{height}.jpg"
+
+    def cached_thumbnail(self, url, size=THUMB_SIZE):
+        """이미 만들어 둔 썸네일만 반환 (없으면 내려받지 않고 None - 화면 그리는 중에 기다리지 않을 때 사용)"""
+        if not isinstance(url, str) or not url:
+            return None
+        return self._read(self._thumbnail_name(url, size))
+
+    def get_thumbnail(self, url, size=THUMB_SIZE):
+        """고정 크기(JPEG) 썸네일 바이트 반환 (실패 시 None)"""
+        if not isinstance(url, str) or not url:
+            return None
+        name = self._thumbnail_name(url, size)
+        data = self._read(name)
+        if data is not None:
+            return data
+
+        original = self.get_original(url)
+        if original is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(original)) as image:
+                thumb = ImageOps.pad(image.convert("RGB"), size, color=(255, 255, 255))
+        except (OSError, ValueError):
+            return None
+        buffer = io.BytesIO()
+        thumb.save(buffer, format="JPEG", quality=85)
+        data = buffer.getvalue()
+        self._write(name, data)
+        return data
+
+    def has_thumbnail(self, url, size=THUMB_SIZE):
+        """썸네일 파일이 캐시에 있는지 (파일을 읽지 않음)"""
+        if not isinstance(url, str) or not url:
+            return False
+        with self.lock:
+            return self._thumbnail_name(url, size) in self.entries
+
+    def import_thumbnails(self, folder):
+        """
+        다른 폴더(다른 프로세스가 만든 캐시)의 썸네일을 이 캐시로 옮겨 저장 (원본 파일은 제외)
+        이 캐시의 용량 한도와 LRU 순서를 그대로 적용하므로 여러 프로세스가 한 폴더에 직접 쓰지 않아도 됨
+        반환: 옮긴 파일 수
+        """
+        imported = 0
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith(".jpg"):
+                continue
+            with open(os.path.join(folder, name), "rb") as f:
+                self._write(name, f.read())
+            imported += 1
+        return imported
+
+    def prefetch(self, urls, size=THUMB_SIZE, visible=False):
+        """
+        썸네일을 백그라운드에서 미리 만들어 둠 (결과를 기다리지 않음)
+        이미 대기 중인 URL은 다시 넣지 않고, 대기 작업이 MAX_PREFETCH개를 넘으면 나머지는 건너뜀
+        visible=True: 지금 화면에 보이는 표지 - 미리 받아오기 풀이 아닌 화면용 풀에서 실행
+        반환: 새로 넣은 작업 수
+        """
+        executor = self.executor if visible else self.prefetch_executor
+        submitted = 0
+        for url in urls:
+            if not isinstance(url, str) or not url:
+                continue
+            key = (url, size)
+            with self.lock:
+                if key in self.pending or len(self.pending) >= MAX_PREFETCH:
+                    continue
+                self.pending.add(key)
+            future = executor.submit(self.get_thumbnail, url, size)
+            future.add_done_callback(lambda _, key=key: self._finish_prefetch(key))
+            submitted += 1
+        return submitted
+
+    def _finish_prefetch(self, key):
+        """미리 받아오기 작업 완료 표시"""
+        with self.lock:
+            self.pending.discard(key)
+
+    def stats(self):
+        """현재 캐시 파일 수와 사용 용량"""
+        with self.lock:
+            return {"files": len(self.entries), "bytes": self.total_bytes, "max_bytes": self.max_bytes,
+                    "prefetching": len(self.pending)}
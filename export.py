@@ -0,0 +1,34 @@
+"""
+다운로드 파일 생성 유틸리티
+- 큰 프레임도 한 번에 문자열로 만들지 않고 행 조각 단위로 버퍼에 이어 씀
+- CSV와 Parquet(행 그룹 단위) 지원
+"""
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 100000
+
+
+def csv_bytes(df, chunk_rows=CHUNK_ROWS):
+    """프레임을 조각 단위로 UTF-8 CSV 바이트로 변환"""
+    buffer = io.BytesIO()
+    wrapper = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    for start in range(0, max(len(df), 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(wrapper, index=False, header=(start == 0))
+    wrapper.flush()
+    data = buffer.getvalue()
+    wrapper.detach()
+    return data
+
+
+def parquet_bytes(df, chunk_rows=CHUNK_ROWS):
+    """프레임을 조각마다 하나의 행 그룹으로 Parquet 바이트로 변환"""
+    buffer = io.BytesIO()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(buffer, schema, compression="zstd") as writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    return buffer.getvalue()
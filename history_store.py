@@ -0,0 +1,291 @@
+"""
+사용자별 조회 기록 저장소 (세션이 끊기거나 서버를 다시 배포해도 기록 유지)
+- 저장 방식은 교체 가능: SQLiteHistoryBackend(기본, WAL 모드), MemoryHistoryBackend(테스트/임시용)
+- HistoryStore는 프로세스당 하나이며 최근 사용자 몇 명의 스택만 메모리(hot LRU)에 둠
+  → 서버 메모리가 유휴 세션 수에 비례해 늘지 않음
+- push/pop/clear는 메모리 스택만 바꾸고 사용자를 '변경됨'으로 표시
+  백그라운드 스레드가 flush_interval마다 변경된 사용자의 최종 상태만 한 트랜잭션으로 기록
+  (같은 사용자의 연속 push는 한 번의 쓰기로 합쳐짐, 프로세스 종료 시에도 남은 변경을 기록)
+- 저장소 읽기(디스크)는 lock 밖에서 하므로 한 사용자의 느린 로드가 다른 사용자의 요청을 막지 않음
+- UserHistory는 BookViewStack과 같은 메서드를 제공하여 main.py에서 그대로 사용
+  (순위번호 기준 중복 제거, 최대 개수 제한 동작은 BookViewStack 그대로)
+"""
+import atexit
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from book_stack import BookViewStack, MAX_HISTORY
+
+HISTORY_DB = ".history.sqlite3"
+HOT_USERS = 256  # 메모리에 둘 최근 사용자 수
+FLUSH_INTERVAL = 0.5  # 변경 내용을 모아서 기록하는 간격(초)
+
+
+class SQLiteHistoryBackend:
+    """
+    SQLite(WAL) 저장 방식
+    기록은 (사용자, 위치) 행으로 저장하고 사용자 단위로 통째로 교체
+    """
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self.local = threading.local()  # 스레드별 연결
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    user_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    month TEXT,
+                    rank INTEGER NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, position)
+                )
+            """)
+
+    def _connect(self):
+        """현재 스레드의 연결 (처음이면 WAL 모드로 연결)"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 커밋마다 fsync하지 않아도 손상되지 않음
+            self.local.conn = conn
+        return conn
+
+    def load(self, user_id):
+        """사용자 기록 (오래된 순 ((기준년월, 순위번호), 행 번호) 목록)"""
+        rows = self._connect().execute(
+            "SELECT month, rank, row_id FROM history WHERE user_id = ? ORDER BY position", (user_id,)
+        ).fetchall()
+        return [((month, rank), row_id) for month, rank, row_id in rows]
+
+    def save_many(self, states):
+        """여러 사용자의 최종 상태를 한 트랜잭션으로 기록 (states: 사용자 → 오래된 순 목록)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM history WHERE user_id = ?", [(user_id,) for user_id in states])
+            conn.executemany(
+                "INSERT INTO history (user_id, position, month, rank, row_id, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (user_id, position, month, int(rank), int(row_id), now)
+                    for user_id, entries in states.items()
+                    for position, ((month, rank), row_id) in enumerate(entries)
+                ],
+            )
+
+
+class MemoryHistoryBackend:
+    """프로세스 메모리 저장 방식 (재시작하면 사라짐 - 테스트나 디스크를 쓸 수 없는 환경용)"""
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def load(self, user_id):
+        with self.lock:
+            return list(self.data.get(user_id, []))
+
+    def save_many(self, states):
+        with self.lock:
+            self.data.update({user_id: list(entries) for user_id, entries in states.items()})
+
+
+class HistoryStore:
+    """
+    사용자별 기록 저장소 (프로세스당 하나, 모든 세션이 공유)
+    - hot: 사용자 → BookViewStack (최근 사용자 hot_users명만, LRU)
+    - dirty: 사용자 → 아직 기록하지 않은 최종 상태 (오래된 순 목록)
+    - inflight: 사용자 → 지금 기록 중인 상태 (커밋이 끝나기 전에 저장소에서 이전 상태를 읽지 않도록)
+    - loading: 사용자 → [불러오는 중인 요청 수, 그동안 커밋된 횟수] (불러오는 동안 커밋된 기록만 버리도록)
+    """
+    def __init__(self, backend, max_size=MAX_HISTORY, hot_users=HOT_USERS, flush_interval=FLUSH_INTERVAL):
+        self.backend = backend
+        self.max_size = max_size
+        self.hot_users = hot_users
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.hot = OrderedDict()
+        self.dirty = {}
+        self.inflight = {}
+        self.loading = {}
+        self.flush_lock = threading.Lock()  # 기록 스레드와 종료 시 flush가 겹치지 않도록
+        self.writes = 0  # 실제 기록한 사용자 상태 수 (합쳐진 쓰기 확인용)
+        self.changes = 0  # 요청된 변경 수
+        self.wake = threading.Event()
+        self.writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.flush)  # 기록 스레드는 daemon이므로 종료 직전 남은 변경을 직접 기록
+
+    def _load(self, user_id):
+        """
+        메모리에 없는 사용자 기록을 lock 밖에서 불러옴 - 반환: (커밋 횟수, 기록) 또는 None(메모리에 있음)
+        커밋 횟수는 이 사용자의 불러오기 전 값으로, 그사이 이 사용자의 flush가 커밋했으면 _stack이 불러온 기록을 버림
+        """
+        with self.lock:
+            if user_id in self.hot or user_id in self.dirty or user_id in self.inflight:
+                return None
+            entry = self.loading.setdefault(user_id, [0, 0])
+            entry[0] += 1
+            version = entry[1]
+        try:
+            return version, self.backend.load(user_id)
+        except BaseException:
+            with self.lock:
+                self._loaded(user_id)
+            raise
+
+    def _loaded(self, user_id):
+        """불러오기 하나가 끝남 - 이 사용자의 커밋 횟수 반환 (lock 안에서 호출)"""
+        entry = self.loading[user_id]
+        entry[0] -= 1
+        if entry[0] == 0:
+            del self.loading[user_id]  # 불러오는 요청이 없으면 커밋 횟수를 들고 있을 필요 없음
+        return entry[1]
+
+    def _stack(self, user_id, loaded=None):
+        """
+        사용자 스택 - lock 안에서 호출
+        메모리에 없으면 아직 기록하지 않은 상태, 기록 중인 상태, _load로 불러 둔 기록 순으로 사용
+        불러 둔 기록이 없거나 그사이 이 사용자의 기록이 커밋되었으면 None (lock 밖에서 다시 불러옴)
+        """
+        fresh = loaded is not None and self._loaded(user_id) == loaded[0]
+        stack = self.hot.get(user_id)
+        if stack is not None:
+            self.hot.move_to_end(user_id)
+            return stack
+        entries = self.dirty.get(user_id)
+        if entries is None:
+            entries = self.inflight.get(user_id)
+        if entries is None:
+            if not fresh:
+                return None
+            entries = loaded[1]
+        stack = BookViewStack(self.max_size)
+        for key, row_id in entries:
+            stack.push(key, row_id)
+        self.hot[user_id] = stack
+        while len(self.hot) > self.hot_users:
+            self.hot.popitem(last=False)  # 변경 내용은 dirty/inflight에 따로 있으므로 바로 버려도 됨
+        return stack
+
+    @contextmanager
+    def _user(self, user_id):
+        """lock을 잡은 상태의 사용자 스택 (저장소 읽기는 항상 lock 밖에서, 필요하면 다시 읽음)"""
+        while True:
+            loaded = self._load(user_id)
+            with self.lock:
+                stack = self._stack(user_id, loaded)
+                if stack is not None:
+                    yield stack
+                    return
+
+    def _mark_dirty(self, user_id, stack):
+        """변경된 최종 상태를 기록 대기열에 반영 - lock 안에서 호출"""
+        self.dirty[user_id] = stack.entries()
+        self.changes += 1
+        self.wake.set()
+
+    def read(self, method, user_id, *args):
+        """스택 읽기 전용 메서드 호출 (size, peek, get_history 등)"""
+        with self._user(user_id) as stack:
+            return getattr(stack, method)(*args)
+
+    def push(self, user_id, key, row_id):
+        """Push (이미 맨 위에 같은 도서가 있으면 아무것도 기록하지 않음)"""
+        with self._user(user_id) as stack:
+            if stack.peek() == (key, row_id):
+                return
+            stack.push(key, row_id)
+            self._mark_dirty(user_id, stack)
+
+    def pop(self, user_id):
+        """Pop (비어 있으면 None)"""
+        with self._user(user_id) as stack:
+            removed = stack.pop()
+            if removed is not None:
+                self._mark_dirty(user_id, stack)
+            return removed
+
+    def clear(self, user_id):
+        """사용자 기록 전체 삭제"""
+        with self._user(user_id) as stack:
+            stack.clear()
+            self._mark_dirty(user_id, stack)
+
+    def flush(self):
+        """대기 중인 변경 내용을 한 번에 기록 (기록한 사용자 수 반환)"""
+        with self.flush_lock:
+            with self.lock:
+                states, self.dirty = self.dirty, {}
+                self.inflight = states
+            if not states:
+                return 0
+            try:
+                self.backend.save_many(states)
+            except sqlite3.Error:
+                # 기록 실패 시 새 변경이 없던 사용자만 되돌려 다음 주기에 다시 시도
+                with self.lock:
+                    for user_id, entries in states.items():
+                        self.dirty.setdefault(user_id, entries)
+                    self.inflight = {}
+                return 0
+            with self.lock:
+                self.inflight = {}
+                self.writes += len(states)
+                for user_id in states:
+                    if user_id in self.loading:
+                        self.loading[user_id][1] += 1
+            return len(states)
+
+    def _write_loop(self):
+        """백그라운드 기록 스레드 (변경이 생기면 flush_interval 동안 더 모은 뒤 기록)"""
+        while True:
+            self.wake.wait()
+            time.sleep(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def stats(self):
+        """메모리 사용자 수, 대기 중인 사용자 수, 변경/기록 횟수"""
+        with self.lock:
+            return {"hot_users": len(self.hot), "pending": len(self.dirty),
+                    "changes": self.changes, "writes": self.writes}
+
+
+class UserHistory:
+    """
+    한 사용자의 기록 (BookViewStack과 같은 메서드 제공)
+    세션 상태에는 이 작은 객체만 두고 실제 기록은 HistoryStore가 보관
+    """
+    def __init__(self, store, user_id):
+        self.store = store
+        self.user_id = user_id
+        self.max_size = store.max_size
+
+    def push(self, key, row_id):
+        self.store.push(self.user_id, key, row_id)
+
+    def pop(self):
+        return self.store.pop(self.user_id)
+
+    def peek(self):
+        return self.store.read("peek", self.user_id)
+
+    def is_empty(self):
+        return self.store.read("is_empty", self.user_id)
+
+    def size(self):
+        return self.store.read("size", self.user_id)
+
+    def get_history(self, limit=None):
+        return self.store.read("get_history", self.user_id, limit)
+
+    def clear(self):
+        self.store.clear(self.user_id)
+
+    def nbytes(self):
+        """세션 상태에 남는 크기 (기록 자체는 저장소에 있음)"""
+        return sys.getsizeof(self) + sys.getsizeof(self.user_id)
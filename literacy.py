@@ -0,0 +1,208 @@
+"""
+문해력 데이터 분석 엔진 (wodus.py에서 사용)
+- Year × Gender 피벗 행렬을 한 번 만들고
+- 성별 격차, 전년 대비 변화, 개선폭/개선율, 주요 지표를 NumPy 벡터 연산으로 한 번에 계산
+- 모든 그룹의 선형 추세를 한 번에 적합하고 여러 목표 연도의 예측값/신뢰구간을 함께 계산
+- 사이드바 필터는 값별 비트맵 AND로 처리하고 선택 조합별 결과를 LRU로 보관
+- 결과는 데이터 해시(버전)별로 캐시하여 rerun마다 다시 계산하지 않음
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from shared_data import freeze_frame
+
+GENDER_ORDER = ["전체", "남성", "여성"]
+
+
+def data_version(df):
+    """데이터 내용 해시 (캐시 키로 사용)"""
+    return format(int(pd.util.hash_pandas_object(df, index=False).sum()) & (2**64 - 1), "016x")
+
+
+def build_matrix(df):
+    """
+    Year × Gender 피벗 행렬 (연도 오름차순, 전체/남성/여성 순서)
+    응답자 필터로 한 성별만 남아도 전체/남성/여성 컬럼은 항상 있음 (없는 성별은 NaN)
+    """
+    matrix = df.pivot_table(index="Year", columns="Gender", values="Value", aggfunc="mean").sort_index()
+    ordered = GENDER_ORDER + [g for g in matrix.columns if g not in GENDER_ORDER]
+    return matrix.reindex(columns=ordered).rename_axis(columns="Gender")
+
+
+def compute_analytics(df):
+    """
+    피벗 행렬에서 모든 분석 지표를 한 번에 계산
+    반환 딕셔너리:
+    - matrix: Year × Gender 값
+    - gaps: 연도별 성별 격차 (남성 - 여성, 한 성별이 없는 연도는 NaN)
+    - deltas: 연도별 직전 조사 대비 변화 (첫 해는 NaN)
+    - improvement: 성별 첫 해/마지막 해 값, 개선폭, 개선율(%)
+    - first_year, last_year, previous_year, total_improvement,
+      average_annual_improvement, max_gap, min_gap (격차를 계산할 수 있는 연도가 없으면 NaN)
+    """
+    matrix = build_matrix(df)
+    years = matrix.index.to_numpy()
+    values = matrix.to_numpy(dtype=float)
+    column = {gender: i for i, gender in enumerate(matrix.columns)}
+
+    gaps = values[:, column["남성"]] - values[:, column["여성"]]
+    observed = gaps[~np.isnan(gaps)]
+    deltas = np.vstack([np.full(values.shape[1], np.nan), np.diff(values, axis=0)])
+    first, last = values[0], values[-1]
+    change = last - first
+
+    overall = values[:, column["전체"]]
+    span = years[-1] - years[0]
+    total_improvement = overall[-1] - overall[0]
+
+    return {
+        "matrix": matrix,
+        "gaps": pd.Series(gaps, index=years),
+        "deltas": pd.DataFrame(deltas, index=years, columns=matrix.columns),
+        "improvement": pd.DataFrame(
+            {"first": first, "last": last, "change": change, "rate": change / first * 100},
+            index=matrix.columns,
+        ),
+        "first_year": int(years[0]),
+        "last_year": int(years[-1]),
+        "previous_year": int(years[-2]) if len(years) > 1 else int(years[-1]),
+        "total_improvement": float(total_improvement),
+        "average_annual_improvement": float(total_improvement / span) if span else 0.0,
+        "max_gap": float(observed.max()) if len(observed) else float("nan"),
+        "min_gap": float(observed.min()) if len(observed) else float("nan"),
+    }
+
+
+# 95% 신뢰구간용 t 분포 임계값 (자유도 → 값, 30 초과는 정규분포 근사)
+T_CRITICAL_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+                 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def t_critical(dof):
+    """자유도에 맞는 t 임계값 (표에 없으면 더 작은 자유도 값을 사용해 보수적으로)"""
+    if dof <= 0:
+        return float("nan")
+    if dof > 30:
+        return 1.96
+    return T_CRITICAL_95[max(k for k in T_CRITICAL_95 if k <= dof)]
+
+
+def fit_trends(matrix):
+    """
+    모든 성별/그룹 시계열의 선형 추세를 한 번의 행렬 연산으로 적합
+    - 설계 행렬 X = [1, 연도 - 평균연도] 하나로 Y(연도 × 그룹) 전체를 최소제곱 풀이
+    - 결측이 있는 연도는 제외
+    - 값이 하나도 없는 그룹(필터로 빠진 성별)은 적합에서 빼고 계수/분산을 NaN으로 둠
+    """
+    values = matrix.to_numpy(dtype=float)
+    present = ~np.isnan(values).all(axis=0)
+    valid = ~np.isnan(values[:, present]).any(axis=1)
+    years = matrix.index.to_numpy(dtype=float)[valid]
+    values = values[valid][:, present]
+
+    center = years.mean()
+    design = np.column_stack([np.ones(len(years)), years - center])
+    fitted, _, _, _ = np.linalg.lstsq(design, values, rcond=None)
+    residuals = values - design @ fitted
+    dof = len(years) - 2
+    coef = np.full((2, len(present)), np.nan)  # 2 × 그룹 수
+    coef[:, present] = fitted
+    variance = np.full(len(present), np.nan)
+    if dof > 0:
+        variance[present] = (residuals ** 2).sum(axis=0) / dof
+
+    return {
+        "groups": list(matrix.columns),
+        "center": center,
+        "coef": coef,
+        "variance": variance,
+        "dof": dof,
+        "xtx_inv": np.linalg.pinv(design.T @ design),
+    }
+
+
+def forecast(fit, target_years):
+    """
+    여러 목표 연도 × 모든 그룹의 예측값과 95% 신뢰구간
+    반환: Year, Group, Prediction, Lower, Upper 컬럼의 프레임
+    """
+    target_years = np.asarray(target_years, dtype=float)
+    design = np.column_stack([np.ones(len(target_years)), target_years - fit["center"]])
+    prediction = design @ fit["coef"]  # 목표 연도 × 그룹
+    leverage = np.einsum("ij,jk,ik->i", design, fit["xtx_inv"], design)
+    margin = t_critical(fit["dof"]) * np.sqrt(np.outer(leverage, fit["variance"]))
+
+    n_years, n_groups = prediction.shape
+    return pd.DataFrame({
+        "Year": np.repeat(target_years.astype(int), n_groups),
+        "Group": np.tile(fit["groups"], n_years),
+        "Prediction": prediction.ravel(),
+        "Lower": (prediction - margin).ravel(),
+        "Upper": (prediction + margin).ravel(),
+    })
+
+
+class LiteracyFilter:
+    """
+    연도/성별 필터 엔진 (모든 세션이 공유)
+    - Year, Gender를 범주 코드로 바꾸고 값마다 행 비트맵(np.packbits)을 미리 계산
+    - 선택 조합은 값별 비트맵 OR 후 두 컬럼 결과를 AND
+    - (연도 집합, 성별 집합)별 필터/피벗/정렬 결과를 최대 max_cached개까지 LRU로 보관
+    """
+    def __init__(self, df, max_cached=64):
+        self.df = df
+        self.size = len(df)
+        self.max_cached = max_cached
+        self.bitmaps = {name: self._build_bitmaps(df[name]) for name in ["Year", "Gender"]}
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _build_bitmaps(self, column):
+        """값 → 해당 값을 가진 행의 비트맵"""
+        codes, uniques = pd.factorize(column)
+        return {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+
+    def _union(self, name, values):
+        """선택한 값들의 비트맵 OR (목록에 없는 값은 무시)"""
+        result = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for value in values:
+            bitmap = self.bitmaps[name].get(value)
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    def select(self, years, genders):
+        """
+        선택 조합의 결과 딕셔너리 반환
+        - filtered: 필터링된 원본 행
+        - pivot: Year × Gender 피벗 (막대 차트용)
+        - sorted: Year, Gender 순 정렬 (표 출력용)
+        """
+        key = (frozenset(years), frozenset(genders))
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        bits = self._union("Year", key[0]) & self._union("Gender", key[1])
+        mask = np.unpackbits(bits, count=self.size).astype(bool)
+        filtered = self.df[mask]
+        result = {
+            "filtered": freeze_frame(filtered),
+            "pivot": freeze_frame(filtered.pivot(index="Year", columns="Gender", values="Value")),
+            "sorted": freeze_frame(filtered.sort_values(["Year", "Gender"])),
+        }
+
+        with self.lock:
+            self.cache[key] = result
+            while len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
+        return result
@@ -0,0 +1,132 @@
+"""
+문해력 조사 원자료(응답자 단위) 적재 모듈
+- 수백만 행의 응답자 CSV를 조각 단위로 읽으며 바로 집계
+- 연도 × 성별 × 연령대 × 지역 칸마다 (가중치 합, 가중 점수 합, 응답자 수)만 보관
+- 결과 큐브는 범주형 컬럼으로 압축한 Feather 파일로 저장
+- wodus.py는 원자료 대신 큐브를 조회하므로 필터 변경 비용이 원자료 크기와 무관
+
+입력 컬럼: year, gender, age_band, region, score, weight(선택, 없으면 1)
+
+사용법:
+    python literacy_ingest.py survey_2014.csv survey_2017.csv --out literacy_cube.feather
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+import pyarrow.feather as feather
+
+CUBE_PATH = "literacy_cube.feather"
+CHUNK_ROWS = 500000
+DIMENSIONS = ["Year", "Gender", "Age", "Region"]
+SOURCE_COLUMNS = {"year": "Year", "gender": "Gender", "age_band": "Age", "region": "Region"}
+GENDER_LABELS = {"M": "남성", "F": "여성", "male": "남성", "female": "여성", "남": "남성", "여": "여성"}
+
+
+def aggregate_chunk(chunk):
+    """응답자 조각 하나 → 칸별 부분 집계"""
+    chunk = chunk.rename(columns=SOURCE_COLUMNS)
+    weight = chunk["weight"] if "weight" in chunk.columns else 1.0
+    parts = pd.DataFrame({
+        "Year": pd.to_numeric(chunk["Year"], errors="coerce"),
+        "Gender": chunk["Gender"].astype(str).str.strip().replace(GENDER_LABELS),
+        "Age": chunk["Age"].astype(str).str.strip(),
+        "Region": chunk["Region"].astype(str).str.strip(),
+        "score": pd.to_numeric(chunk["score"], errors="coerce"),
+        "weight": pd.to_numeric(weight, errors="coerce") if "weight" in chunk.columns else weight,
+    }).dropna(subset=["Year", "score", "weight"])
+    parts["weighted"] = parts["score"] * parts["weight"]
+    return parts.groupby(DIMENSIONS, sort=False, observed=True).agg(
+        weight_sum=("weight", "sum"), score_sum=("weighted", "sum"), count=("score", "count")
+    )
+
+
+def build_cube(paths, chunk_rows=CHUNK_ROWS, encoding="utf-8"):
+    """
+    여러 원자료 파일을 조각 단위로 읽어 큐브 생성
+    누적 결과는 칸 수만큼만 커지므로 최대 메모리는 조각 하나 + 큐브 크기
+    """
+    cube = None
+    for path in paths:
+        for chunk in pd.read_csv(path, encoding=encoding, chunksize=chunk_rows):
+            partial = aggregate_chunk(chunk)
+            if cube is None:
+                cube = partial
+            else:
+                cube = pd.concat([cube, partial]).groupby(level=DIMENSIONS, sort=False).sum()
+    if cube is None:
+        raise ValueError("적재할 응답자 데이터가 없습니다")
+
+    cube = cube.reset_index().sort_values(DIMENSIONS, ignore_index=True)
+    cube["Year"] = cube["Year"].astype("int16")
+    for name in ["Gender", "Age", "Region"]:
+        cube[name] = cube[name].astype("category")
+    cube["count"] = cube["count"].astype("int64")
+    return cube
+
+
+def save_cube(cube, path=CUBE_PATH):
+    """큐브를 Feather 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    feather.write_feather(cube, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def load_cube(path=CUBE_PATH):
+    """저장된 큐브 읽기 (파일이 없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    return feather.read_feather(path)
+
+
+def cube_options(cube):
+    """사이드바 필터 선택지 (연령대, 지역)"""
+    return {
+        "Age": sorted(cube["Age"].cat.categories.tolist()),
+        "Region": sorted(cube["Region"].cat.categories.tolist()),
+    }
+
+
+def query_cube(cube, ages=None, regions=None):
+    """
+    선택한 연령대/지역의 Year × Gender 가중 평균 (wodus.py 형식: Year, Gender, Value)
+    - '전체'는 선택 범위 전체 응답자의 가중 평균
+    - 선택이 비어 있으면 전체 범위
+    """
+    mask = pd.Series(True, index=cube.index)
+    if ages:
+        mask &= cube["Age"].isin(ages)
+    if regions:
+        mask &= cube["Region"].isin(regions)
+    selected = cube[mask]
+
+    by_gender = selected.groupby(["Year", "Gender"], observed=True)[["weight_sum", "score_sum"]].sum()
+    by_year = selected.groupby("Year")[["weight_sum", "score_sum"]].sum()
+    by_year["Gender"] = "전체"
+    by_year = by_year.set_index("Gender", append=True)
+
+    # 연도순 정렬, 같은 연도 안에서는 전체 → 성별 순서 유지
+    combined = pd.concat([by_year, by_gender]).reset_index()
+    combined = combined.sort_values("Year", kind="stable", ignore_index=True)
+    combined["Gender"] = combined["Gender"].astype(str)
+    combined["Value"] = (combined["score_sum"] / combined["weight_sum"]).round(1)
+    return combined[["Year", "Gender", "Value"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="응답자 원자료 CSV")
+    parser.add_argument("--out", default=CUBE_PATH)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args()
+
+    cube = build_cube(args.paths, args.chunk_rows, args.encoding)
+    save_cube(cube, args.out)
+    print(f"큐브 저장: {args.out} ({len(cube):,}칸, 응답자 {int(cube['count'].sum()):,}명)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
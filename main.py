@@ -1,100 +1,620 @@
 
+import math
+import os
+import time
+import uuid
+
 import streamlit as st
 import pandas as pd
 
-# 스택 클래스 정의
-class BookViewStack:
+import perf
+
+from api_server import API_HOST, BOOK_API_PORT, book_route, start_server
+from artifacts import ARTIFACT_DIR, current_dir, load_object
+from book_data import CACHE_DIR, load_book_frame, rank_index, rank_order, resolve_row
+from book_ingest import MONTH_DIR, list_months, read_month, read_month_hashes
+from book_diff import diff_months, movement_label, rank_table
+from book_recommend import build_neighbors, recommend
+from book_search import BookSearchIndex
+from book_stack import BookViewStack, MAX_HISTORY
+from book_stats import aggregate_month, entity_rows, leaderboard, merge_many
+from book_watch import CHECK_INTERVAL, MAX_LOADED_MONTHS, BookDataWatcher, path_signature
+from cover_cache import COVER_DIR, CoverCache, DETAIL_SIZE, THUMB_SIZE
+from history_store import HISTORY_DB, HistoryStore, MemoryHistoryBackend, SQLiteHistoryBackend, UserHistory
+from prefetch import PREFETCH_WORKERS, Prefetcher
+from shared_data import freeze_frame
+
+# 데이터 위치 (환경 변수로 변경 가능 - 벤치마크/테스트용)
+BOOK_CSV_PATH = os.environ.get("BOOK_DATA_CSV", "people_book.csv")
+BOOK_CACHE_DIR = os.environ.get("BOOK_CACHE_DIR", CACHE_DIR)
+
+# 미리 계산된 파생 데이터 (precompute.py로 생성, 프로세스 시작 시 한 번 확인)
+@st.cache_resource
+def load_artifact_dir():
     """
-    도서 조회 기록을 관리하는 스택 자료구조
-    LIFO(Last In First Out) 방식 - 마지막에 본 도서가 가장 먼저 나옴
+    artifacts/CURRENT가 가리키는 버전 폴더 (없으면 None - 앱에서 직접 계산)
+    BOOK_MONTH_DIR을 따로 지정하면 artifact와 데이터가 다를 수 있으므로 사용하지 않음
     """
-    def __init__(self, max_size=10):
-        self.stack = []  # 스택을 리스트로 구현
-        self.max_size = max_size  # 최대 저장 개수
-    
-    def push(self, book_info):
-        """
-        스택에 도서 정보 추가 (Push 연산)
-        - 같은 순위의 도서가 이미 있으면 제거 후 맨 위에 추가
-        - 최대 크기를 초과하면 가장 오래된 항목 제거
-        """
-        # 중복 제거: 같은 순위번호의 도서가 있으면 제거
-        self.stack = [book for book in self.stack if book['순위번호'] != book_info['순위번호']]
-        
-        # 새 도서를 스택 맨 위에 추가
-        self.stack.append(book_info)
-        
-        # 최대 크기 초과시 가장 아래(오래된) 항목 제거
-        if len(self.stack) > self.max_size:
-            self.stack.pop(0)  # 첫 번째 요소 제거 (가장 오래된 것)
-    
-    def pop(self):
-        """
-        스택에서 맨 위 도서 제거하고 반환 (Pop 연산)
-        스택이 비어있으면 None 반환
-        """
-        if not self.is_empty():
-            return self.stack.pop()
+    if os.environ.get("BOOK_MONTH_DIR"):
         return None
-    
-    def peek(self):
-        """
-        스택 맨 위 도서 확인 (제거하지 않음)
-        """
-        if not self.is_empty():
-            return self.stack[-1]
+    return current_dir(os.environ.get("ARTIFACT_DIR", ARTIFACT_DIR))
+
+ARTIFACT_VERSION_DIR = load_artifact_dir()
+if ARTIFACT_VERSION_DIR:
+    BOOK_MONTH_DIR = os.path.join(ARTIFACT_VERSION_DIR, "months")
+else:
+    BOOK_MONTH_DIR = os.environ.get("BOOK_MONTH_DIR", MONTH_DIR)
+
+# rerun 전체 소요 시간 측정 시작
+run_start = time.perf_counter()
+
+# 사용자별 조회 기록 저장소 (프로세스당 하나, 최근 사용자만 메모리에 두고 나머지는 디스크)
+@st.cache_resource
+def get_history_store():
+    """
+    조회 기록 저장소 생성 함수
+    - HISTORY_BACKEND: sqlite(기본) / memory / session(저장소 없이 세션에만 보관)
+    - HISTORY_DB: SQLite 파일 경로
+    """
+    backend = os.environ.get("HISTORY_BACKEND", "sqlite")
+    if backend == "session":
         return None
-    
-    def is_empty(self):
-        """스택이 비어있는지 확인"""
-        return len(self.stack) == 0
-    
-    def size(self):
-        """스택 크기 반환"""
-        return len(self.stack)
-    
-    def get_history(self):
-        """조회 기록 반환 (최신순으로 정렬)"""
-        return list(reversed(self.stack))
+    if backend == "memory":
+        return HistoryStore(MemoryHistoryBackend())
+    return HistoryStore(SQLiteHistoryBackend(os.environ.get("HISTORY_DB", HISTORY_DB)))
+
+# 조회 기록 사용자 구분 쿠키 (주소에 넣으면 링크를 공유할 때 기록까지 함께 넘어가므로 쿠키에 보관)
+HISTORY_COOKIE = "book_history_user"
+HISTORY_COOKIE_MAX_AGE = 365 * 24 * 60 * 60  # 초
+
+def history_user_id():
+    """
+    조회 기록 사용자 id (브라우저 쿠키, 없으면 새로 만들어 쿠키에 기록)
+    st.context.cookies는 읽기 전용이므로 st.html 스크립트(iframe 없이 페이지에서 실행)로 쿠키를 설정
+    → 같은 브라우저로 다시 방문하면 이전 기록이 복원됨
+    """
+    user_id = st.context.cookies.get(HISTORY_COOKIE, "")
+    if len(user_id) == 32 and all(c in "0123456789abcdef" for c in user_id):
+        return user_id
+    user_id = uuid.uuid4().hex
+    st.html(
+        f"<script>document.cookie = '{HISTORY_COOKIE}={user_id}; max-age={HISTORY_COOKIE_MAX_AGE}; "
+        f"path=/; SameSite=Strict';</script>",
+        unsafe_allow_javascript=True,
+    )
+    return user_id
 
 # 세션 상태 초기화 (스택 객체 생성)
 if 'book_stack' not in st.session_state:
-    st.session_state.book_stack = BookViewStack()
+    history_store = get_history_store()
+    if history_store is None:
+        st.session_state.book_stack = BookViewStack()
+    else:
+        user_id = history_user_id()
+        st.session_state.user_id = user_id
+        st.session_state.book_stack = UserHistory(history_store, user_id)
+    st.session_state.prefetch_owner = uuid.uuid4().hex  # 미리 준비 예약을 세션별로 구분 (선택이 바뀌면 이전 예약 취소)
+
+# 도서 데이터 파일 감시 (바뀐 달/컬럼만 다시 읽고 새 스냅샷으로 교체)
+def book_sources():
+    """감시 대상: 월별 파티션 폴더들 (없으면 people_book.csv 한 파일)"""
+    months = list_months(BOOK_MONTH_DIR)
+    if months:
+        return {month: path_signature(os.path.join(BOOK_MONTH_DIR, month)) for month in months}
+    return {None: path_signature(BOOK_CSV_PATH)}
+
+def read_book_month(month):
+    """
+    한 달치 데이터 읽기 (CSV는 CP949 디코딩 대신 컬럼 캐시 파일 사용)
+    - month가 주어지면 해당 월 파티션만 읽음
+    - 월별 저장소가 없으면 people_book.csv를 Feather 캐시로 읽음
+    """
+    perf.cache_miss("load_book_data")
+    if month is None:
+        return load_book_frame(BOOK_CSV_PATH, BOOK_CACHE_DIR)
+    return read_month(month, BOOK_MONTH_DIR)
+
+def read_book_hashes(month):
+    """달을 읽지 않고 적재 시 기록한 컬럼 해시로 캐시 키 결정 (CSV 한 파일이면 None - 읽어서 계산)"""
+    if month is None:
+        return None
+    return read_month_hashes(month, BOOK_MONTH_DIR)
+
+@st.cache_resource
+def get_data_watcher():
+    """
+    데이터 감시자 (프로세스당 하나)
+    - DATA_CHECK_SECONDS: 파일 변경 확인 간격(초)
+    - BOOK_LOADED_MONTHS: 메모리에 둘 읽은 달 수 (넘으면 가장 오래 쓰지 않은 달부터 내려놓음)
+    """
+    interval = float(os.environ.get("DATA_CHECK_SECONDS", CHECK_INTERVAL))
+    max_months = int(os.environ.get("BOOK_LOADED_MONTHS", MAX_LOADED_MONTHS))
+    return BookDataWatcher(read_book_month, book_sources, interval, read_book_hashes, max_months)
+
+# 읽기 전용 JSON API (다른 도구가 화면을 긁지 않고 순위 데이터를 가져가도록, 같은 감시자 스냅샷 사용)
+@st.cache_resource
+def get_api_server():
+    """
+    API 서버 시작 함수 (프로세스당 한 번)
+    - BOOK_API_PORT: 포트 (기본 8601, 0이면 사용 안 함)
+    - API_HOST: 주소 (기본 127.0.0.1 - 로컬에서만 접근)
+    """
+    port = int(os.environ.get("BOOK_API_PORT", BOOK_API_PORT))
+    if not port:
+        return None
+    server = start_server(os.environ.get("API_HOST", API_HOST), port)
+    if server is not None:
+        server.route("books", book_route(get_data_watcher()))
+    return server
+
+get_api_server()
+
+# 이번 rerun에서 사용할 데이터 스냅샷 (끝까지 같은 스냅샷 사용 - 도중에 데이터가 바뀌지 않음)
+snapshot = get_data_watcher().current()
+
+def load_book_data(month=None):
+    """모든 세션이 공유하는 읽기 전용 프레임 (rerun마다 복사하지 않음)"""
+    return snapshot.frame(month)
+
+def cached_args(month, columns):
+    """
+    파생 구조 캐시 함수 인자: (기준년월, 의존 컬럼 해시, 프레임)
+    의존하는 컬럼이 바뀐 달만 캐시 키가 달라져 다시 계산됨
+    """
+    return month, snapshot.key(month, columns), snapshot.frame(month)
+
+def load_artifact(month, name):
+    """미리 계산된 파생 데이터 (파일이 바뀌어 다시 읽은 달은 사용하지 않음)"""
+    if snapshot.revision(month):
+        return None
+    return load_object(ARTIFACT_VERSION_DIR, month, name)
+
+# 파생 구조별 의존 컬럼
+RANK_COLUMNS = ["순위번호"]
+LABEL_COLUMNS = ["순위번호", "도서명정보"]
+SEARCH_COLUMNS = ["도서명정보", "저자명정보", "출판사명", "순위번호"]
+STATS_COLUMNS = ["저자명정보", "출판사명", "순위번호"]
+IDENTITY_COLUMNS = ["도서명정보", "저자명정보", "출판사명", "순위번호"]
+NEIGHBOR_COLUMNS = ["도서명정보", "저자명정보", "출판사명", "출판년도"]
+GALLERY_FIELDS = ["순위번호", "도서명정보", "저자명정보", "도서이미지URL"]
+
+# (기준년월, 버전)별 캐시 최대 항목 수 - 데이터가 갱신될 때마다 새 버전 항목이 생기므로
+# 한도를 넘으면 가장 오래 쓰지 않은 (이전 버전) 항목부터 제거
+MONTH_CACHE_ENTRIES = int(os.environ.get("MONTH_CACHE_ENTRIES", "64"))
+
+# 순위 조회 인덱스 (캐싱, 모든 세션이 공유하므로 수정 금지)
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_rank_index(month, version, _df):
+    """
+    순위번호 조회용 인덱스 생성 함수
+    - rank_to_pos: 순위번호 → 행 위치 딕셔너리 (O(1) 조회)
+    - sorted_ranks: 정렬된 순위 목록 (selectbox 옵션용)
+    """
+    cached = load_artifact(month, "rank_index")
+    if cached is not None:
+        return cached
+    return rank_index(_df)
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_rank_order(month, version, _df):
+    """순위순 행 위치 목록 (같은 순위의 도서도 모두 포함 - 순위 선택 목록, 갤러리용)"""
+    cached = load_artifact(month, "rank_order")
+    if cached is not None:
+        return cached
+    return rank_order(_df)
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_rank_positions(month, version, _df):
+    """행 위치 → 순위순 목록에서의 위치 (앞뒤 순위 도서를 목록을 훑지 않고 바로 찾기 위함)"""
+    positions = [0] * len(_df)
+    for index, row in enumerate(load_rank_order(month, version, _df)):
+        positions[row] = index
+    return positions
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_row_labels(month, version, _df):
+    """행 위치별 선택 목록 표시 문자열 ('108위 · 도서명' - 같은 순위의 도서를 구분)"""
+    return [f"{rank}위 · {title}" for rank, title in zip(_df["순위번호"].tolist(), _df["도서명정보"].tolist())]
+
+# 검색 색인 (데이터셋 버전마다 한 번만 생성)
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_search_index(month, version, _df):
+    """도서명/저자/출판사 n-gram 역색인 생성 함수"""
+    cached = load_artifact(month, "search_index")
+    if cached is not None:
+        return cached
+    return BookSearchIndex(_df)
+
+# 저자/출판사 집계 (데이터셋 버전마다 한 번만 계산)
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_month_aggregate(month, version):
+    """
+    한 달치 저자/출판사별 등장 수, 순위 합, 최고 순위
+    artifact가 없을 때만 달을 읽음 (전체 기간 순위표가 모든 달을 읽어 두지 않도록 프레임을 인자로 받지 않음)
+    """
+    cached = load_artifact(month, "aggregate")
+    if cached is not None:
+        return cached
+    return aggregate_month(load_book_data(month))
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_cumulative_aggregate(month_keys):
+    """
+    여러 달 누적 집계 (month_keys: (기준년월, 집계 키) 튜플, 오름차순)
+    달별 부분 집계는 각각 캐시되어 있으므로 달이 추가되거나 수정되면 그 달만 다시 집계하고
+    병합은 달 수와 관계없이 한 번에 수행 (달마다 재귀 호출하지 않음)
+    """
+    return merge_many([load_month_aggregate(month, version) for month, version in month_keys])
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_entity_rows(month, version, _df):
+    """저자/출판사 이름 → 해당 도서 행 위치 (상세 보기용)"""
+    cached = load_artifact(month, "entity_rows")
+    if cached is not None:
+        return cached
+    return entity_rows(_df)
+
+# 전월 대비 순위 변동 (도서 식별 키는 월별로, 변동은 두 달 조합별로 한 번만 계산)
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_rank_table(month, version, _df):
+    """도서 식별 키(정규화한 도서명+저자+출판사 해시), 순위, 행 위치 표"""
+    return rank_table(_df)
+
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_month_diff(previous_key, current_key):
+    """두 달 사이의 순위 변화, 신규 진입, 이탈 도서 (키: (기준년월, 식별 키 버전))"""
+    previous = load_rank_table(*previous_key, load_book_data(previous_key[0]))
+    current = load_rank_table(*current_key, load_book_data(current_key[0]))
+    return diff_months(previous, current)
+
+# 비슷한 도서 이웃 표 (데이터셋 버전마다 한 번만 계산, 요청 시에는 표 조회만)
+@st.cache_resource(max_entries=MONTH_CACHE_ENTRIES)
+def load_neighbors(month, version, _df):
+    """도서별 상위 k개 비슷한 도서 행 위치와 유사도"""
+    cached = load_artifact(month, "neighbors")
+    if cached is not None:
+        return cached
+    return build_neighbors(_df)
+
+# 갤러리 페이지 (순위순 행 위치에서 한 페이지만 잘라 캐시, 페이지 비용은 페이지 크기에만 비례)
+GALLERY_COLUMNS = 5
+GALLERY_PAGE_SIZES = [10, 20, 40]
+
+@st.cache_resource(max_entries=256)
+def load_gallery_page(month, version, page, page_size):
+    """
+    갤러리 한 페이지 분량의 순위, 도서명, 저자, 표지 URL (인덱스: 행 위치)
+    순위순 행 위치 목록을 자르므로 같은 순위의 도서도 모두 나옴
+    """
+    positions = load_rank_order(*cached_args(month, RANK_COLUMNS))[page * page_size:(page + 1) * page_size]
+    page_df = load_book_data(month).iloc[positions][GALLERY_FIELDS]
+    page_df.index = positions
+    return freeze_frame(page_df)
+
+# 표지 이미지 로컬 캐시 (프로세스당 하나, 모든 세션이 공유)
+@st.cache_resource
+def get_cover_cache():
+    """
+    표지 이미지 캐시 생성 함수
+    - COVER_CACHE_MB: 디스크 사용 한도 (기본 200MB)
+    - COVER_ORIGIN: 표지를 받아올 대체 서버 (로컬 테스트용)
+    - COVER_CACHE_DIR: 캐시 폴더
+    """
+    max_mb = int(os.environ.get("COVER_CACHE_MB", "200"))
+    return CoverCache(
+        cache_dir=os.environ.get("COVER_CACHE_DIR", COVER_DIR),
+        max_bytes=max_mb * 1024 * 1024,
+        origin=os.environ.get("COVER_ORIGIN"),
+    )
+
+# 다음에 볼 도서 미리 준비 (프로세스당 하나, 모든 세션이 공유)
+PREFETCH_RANKS = 2  # 현재 순위 앞뒤로 미리 준비할 순위 수
+
+@st.cache_resource
+def get_prefetcher():
+    """
+    미리 준비 작업 관리자 생성 함수 (PREFETCH_WORKERS: 스레드 수)
+    표지는 표지 캐시에 썸네일이 남아 있을 때만, 기록의 다른 달은 그 달이 아직 메모리에 있을 때만 준비된 것으로 봄
+    (용량 한도로 지워졌으면 다시 준비)
+    """
+    covers = get_cover_cache()
+    watcher = get_data_watcher()
+
+    def is_ready(key):
+        if key[0] == "cover":
+            return covers.has_thumbnail(key[1], key[2])
+        return key[1] in watcher.snapshot.frames
 
-# CSV 파일 읽기 (CP949 인코딩)
-@st.cache_data
-def load_book_data():
-    """데이터 로딩 함수 - 캐싱으로 성능 최적화"""
-    return pd.read_csv("people_book.csv", encoding="cp949")
+    return Prefetcher(max_workers=int(os.environ.get("PREFETCH_WORKERS", PREFETCH_WORKERS)), is_ready=is_ready)
 
-# 데이터 로드
-df = load_book_data()
+def schedule_prefetch(month, row):
+    """
+    현재 도서 다음에 볼 가능성이 높은 도서를 백그라운드에서 준비
+    - 앞뒤 순위(가까운 순서) 표지, 조회 기록에 있는 도서의 월 데이터와 표지
+    - 스레드에서는 st 캐시 함수를 부르지 않도록 필요한 객체를 미리 꺼내서 전달
+    """
+    covers = get_cover_cache()
+    prefetcher = get_prefetcher()
+    jobs = []
+
+    def cover_job(url):
+        return ("cover", url, DETAIL_SIZE), lambda: covers.get_thumbnail(url, DETAIL_SIZE)
+
+    index = rank_positions[row]
+    for step in range(1, PREFETCH_RANKS + 1):
+        for neighbor in (index + step, index - step):
+            if 0 <= neighbor < len(rank_rows):
+                jobs.append(cover_job(df["도서이미지URL"].iat[rank_rows[neighbor]]))
+
+    for (history_month, history_rank), history_row in st.session_state.book_stack.get_history(limit=8):
+        if history_month == month:
+            pos = resolve_row(df, rank_to_pos, history_rank, history_row)
+            if pos is not None:
+                jobs.append(cover_job(df["도서이미지URL"].iat[pos]))
+            continue
+        if history_month not in months:
+            continue
+
+        def history_job(history_month=history_month, history_rank=history_rank, history_row=history_row):
+            # 다른 달은 파티션을 읽어 두고 (기록 패널에서 바로 사용) 해당 도서의 표지까지 준비
+            frame = snapshot.frame(history_month)
+            positions = (frame["순위번호"].to_numpy() == history_rank).nonzero()[0]
+            first = {history_rank: int(positions[0])} if len(positions) else {}
+            pos = resolve_row(frame, first, history_rank, history_row)
+            if pos is None:
+                return None
+            url = frame["도서이미지URL"].iat[pos]
+            thumbnail = covers.get_thumbnail(url, DETAIL_SIZE)
+            if thumbnail is not None:
+                prefetcher.mark_warmed(("cover", url, DETAIL_SIZE))
+            return thumbnail  # 표지까지 준비되었을 때만 준비 완료로 기록
+
+        jobs.append((("history", history_month, history_rank, history_row, snapshot.version), history_job))
+
+    prefetcher.schedule(st.session_state.prefetch_owner, jobs)
+
+# 조회 기록 패널 / 선택 상태 콜백 (버튼 클릭 시 위젯보다 먼저 실행됨)
+def select_book(month, rank, row=None):
+    """
+    기준년월과 도서를 선택 상태와 ?month=&rank=&row= 파라미터에 반영
+    같은 순위의 도서가 여러 권일 수 있으므로 고른 도서의 행 위치(row)도 함께 전달
+    """
+    params = {"rank": str(rank)}
+    if row is not None:
+        params["row"] = str(row)
+    if month:
+        params["month"] = month
+    st.query_params.from_dict(params)
+    # 이전에 적용한 파라미터 기록을 지워 같은 값이어도 다시 반영되도록 함
+    st.session_state.pop("applied_book_param", None)
+    st.session_state.pop("applied_month_param", None)
+    st.session_state.search_query = ""  # 검색 중이었다면 순위 선택 화면으로 복귀
+
+def open_from_gallery(month, rank, row=None):
+    """갤러리에서 고른 도서를 상세 보기로 열기"""
+    select_book(month, rank, row)
+    st.session_state.gallery_mode = False
+
+def set_book_param(row):
+    """선택한 행의 순위번호와 행 위치를 ?rank=&row= 파라미터에 반영"""
+    rank = load_book_data(st.session_state.get("selected_month"))["순위번호"].iat[row]
+    st.query_params["rank"] = str(rank)
+    st.query_params["row"] = str(row)
+
+def sync_rank_param():
+    """순위 selectbox 변경 시 ?rank=&row= 파라미터도 함께 변경"""
+    set_book_param(st.session_state.rank_select)
+    st.session_state.applied_book_param = (st.query_params["rank"], st.query_params["row"])
+
+def sync_search_param():
+    """검색 결과에서 선택하면 ?rank=&row= 파라미터만 변경 (검색을 지우면 해당 도서로 이동)"""
+    set_book_param(st.session_state.search_select)
+
+def sync_month_param():
+    """기준년월 변경 시 ?month= 파라미터도 함께 변경 (?rank=는 새 달에서 다시 찾음)"""
+    st.query_params["month"] = st.session_state.selected_month
+    st.session_state.applied_month_param = st.query_params["month"]
+    st.session_state.pop("applied_book_param", None)
+
+def pop_history():
+    """가장 최근 조회 기록 제거 (Pop 연산)"""
+    removed = st.session_state.book_stack.pop()
+    if removed:
+        (removed_month, removed_rank), removed_row = removed
+        available = removed_month is None or removed_month in snapshot.months
+        pos = None
+        if available:
+            removed_df = load_book_data(removed_month)
+            rank_to_pos = load_rank_index(*cached_args(removed_month, RANK_COLUMNS))[0]
+            pos = resolve_row(removed_df, rank_to_pos, removed_rank, removed_row)
+        if pos is not None:
+            removed_title = removed_df.iloc[pos]['도서명정보']
+        else:
+            removed_title = f"{removed_rank}위"
+        st.session_state.history_message = ("success", f"'{removed_title}' 기록이 삭제되었습니다!")
+    else:
+        st.session_state.history_message = ("warning", "삭제할 기록이 없습니다!")
+
+def clear_history():
+    """스택 전체 초기화"""
+    st.session_state.book_stack.clear()
+    st.session_state.history_message = ("success", "모든 조회 기록이 삭제되었습니다!")
+
+def apply_query_param(name, state_key, valid_values):
+    """
+    ?month= 파라미터를 위젯 선택 상태에 반영
+    같은 파라미터 값은 한 번만 적용하여 이후 사용자가 고른 값을 덮어쓰지 않음
+    """
+    value = st.query_params.get(name)
+    applied_key = f"applied_{name}_param"
+    if value is None or st.session_state.get(applied_key) == value:
+        return
+    st.session_state[applied_key] = value
+    if value in valid_values:
+        st.session_state[state_key] = value
+
+def apply_book_param(frame, rank_to_pos):
+    """
+    ?rank=&row= 파라미터를 순위 선택 상태(행 위치)에 반영 (같은 값은 한 번만 적용)
+    row가 없거나 데이터가 바뀌어 그 행의 순위가 달라졌으면 해당 순위의 첫 번째 도서
+    """
+    rank, row = st.query_params.get("rank"), st.query_params.get("row")
+    if rank is None or st.session_state.get("applied_book_param") == (rank, row):
+        return
+    st.session_state.applied_book_param = (rank, row)
+    pos = resolve_row(frame, rank_to_pos, int(rank) if rank.isdigit() else None,
+                      int(row) if row and row.isdigit() else None)
+    if pos is not None:
+        st.session_state.rank_select = pos
+
+# 기준년월 선택 (월별 저장소가 없으면 people_book.csv 한 달치만 사용)
+load_start = time.perf_counter()
+months = snapshot.months
+if months:
+    apply_query_param("month", "selected_month", set(months))
+    if st.session_state.get("selected_month") not in months:
+        st.session_state.selected_month = months[-1]
+    selected_month = st.sidebar.selectbox(
+        "📅 기준년월", months, key="selected_month", on_change=sync_month_param
+    )
+else:
+    selected_month = None
+
+# 데이터 로드 (선택한 월 파티션만 읽음)
+perf.cache_call("load_book_data")
+df = load_book_data(selected_month)
+rank_to_pos, _ = load_rank_index(*cached_args(selected_month, RANK_COLUMNS))
+rank_rows = load_rank_order(*cached_args(selected_month, RANK_COLUMNS))
+rank_positions = load_rank_positions(*cached_args(selected_month, RANK_COLUMNS))
+row_labels = load_row_labels(*cached_args(selected_month, LABEL_COLUMNS))
+
+# 전월 데이터가 적재되어 있으면 순위 변동 계산 (캐시된 결과 재사용)
+previous_month = None
+month_diff = None
+if months and months.index(selected_month) > 0:
+    previous_month = months[months.index(selected_month) - 1]
+    month_diff = load_month_diff((previous_month, snapshot.key(previous_month, IDENTITY_COLUMNS)),
+                                 (selected_month, snapshot.key(selected_month, IDENTITY_COLUMNS)))
+perf.record_since("main", "data_load", load_start)
+
+# 다른 세션이나 적재 작업으로 데이터가 갱신되면 알림 (다음 rerun부터 새 데이터 사용)
+if st.session_state.get("data_version", snapshot.version) != snapshot.version and snapshot.changes:
+    changed = sum(len(diff["changed"]) + len(diff["added"]) + len(diff["removed"])
+                  for diff in snapshot.changes.values())
+    st.toast(f"데이터가 갱신되었습니다 ({len(snapshot.changes)}개월, {changed}개 순위 변경)")
+st.session_state.data_version = snapshot.version
 
 # 메인 제목
 st.title("📚 인기 도서 순위 조회")
 st.markdown("### 스택(Stack) 자료구조로 조회 기록 관리")
 
+# 표지 갤러리 (fragment - 페이지 이동은 갤러리만 다시 실행)
+@st.fragment
+def gallery_panel():
+    """
+    순위 전체를 페이지 단위로 훑어보는 표지 그리드 (보이는 페이지 썸네일만 생성)
+    이미 만든 썸네일만 바로 그리고 없는 표지는 백그라운드에 맡김 (느린 CDN을 기다리지 않음)
+    """
+    gallery_start = time.perf_counter()
+    st.subheader("🖼️ 표지 갤러리")
+    
+    page_col1, page_col2 = st.columns(2)
+    with page_col1:
+        page_size = st.selectbox("페이지당 도서 수", GALLERY_PAGE_SIZES, index=1, key="gallery_page_size")
+    page_count = max(1, math.ceil(len(rank_rows) / page_size))
+    # 페이지 크기를 키우면 마지막 페이지 번호가 줄어들 수 있으므로 범위 안으로 맞춤
+    if st.session_state.get("gallery_page", 1) > page_count:
+        st.session_state.gallery_page = page_count
+    with page_col2:
+        page = st.number_input(f"페이지 (총 {page_count})", min_value=1, max_value=page_count, key="gallery_page") - 1
+    
+    gallery_key = snapshot.key(selected_month, GALLERY_FIELDS)
+    page_df = load_gallery_page(selected_month, gallery_key, page, page_size)
+    covers = get_cover_cache()
+    urls = page_df["도서이미지URL"].tolist()
+    thumbnails = [covers.cached_thumbnail(url, THUMB_SIZE) for url in urls]
+    missing = [url for url, cover in zip(urls, thumbnails) if cover is None and isinstance(url, str) and url]
+    if missing:
+        covers.prefetch(missing, THUMB_SIZE, visible=True)
+    
+    grid = st.columns(GALLERY_COLUMNS)
+    for i, (row, book, cover) in enumerate(zip(page_df.index, page_df.to_dict("records"), thumbnails)):
+        with grid[i % GALLERY_COLUMNS]:
+            if cover:
+                st.image(cover, use_column_width=True)
+            else:
+                st.caption("표지 준비 중" if book["도서이미지URL"] in missing else "표지 없음")
+            rank = int(book["순위번호"])
+            st.markdown(f"**{rank}위** {book['도서명정보']}")
+            st.caption(book["저자명정보"])
+            # 상세 보기는 메인 화면이 바뀌므로 전체 다시 실행
+            if st.button("📖 상세 보기", key=f"gallery_{row}", on_click=open_from_gallery,
+                         args=(selected_month, rank, row)):
+                st.rerun()
+    
+    if missing:
+        # 준비가 끝난 표지는 갤러리만 다시 실행하면 보임
+        st.button("🔄 표지 새로고침", key="gallery_refresh")
+    
+    # 다음 페이지 썸네일은 백그라운드에서 미리 생성 (대기 작업 수 제한)
+    if page + 1 < page_count:
+        next_page = load_gallery_page(selected_month, gallery_key, page + 1, page_size)
+        covers.prefetch(next_page["도서이미지URL"].tolist(), THUMB_SIZE)
+    perf.record_since("main", "gallery", gallery_start)
+
+if st.sidebar.toggle("🖼️ 갤러리 보기", key="gallery_mode"):
+    gallery_panel()
+    st.markdown("---")
+
 # 레이아웃: 메인 영역과 사이드바로 구분
 col_main, col_history = st.columns([2.5, 1.5])
 
 with col_main:
-    # 순위 선택 (중복 제거 및 정렬)
-    unique_ranks = sorted(df["순위번호"].unique())
-    selected_rank = st.selectbox("순위를 선택하세요 📊", unique_ranks)
-    
-    # 선택된 순위의 도서 정보 필터링
-    book_info = df[df["순위번호"] == selected_rank].iloc[0]
-    
-    # 스택에 현재 조회한 도서 정보 추가 (자동으로 Push)
-    book_dict = {
-        '순위번호': book_info['순위번호'],
-        '도서명정보': book_info['도서명정보'],
-        '저자명정보': book_info['저자명정보'],
-        '출판사명': book_info['출판사명'],
-        '출판년도': book_info['출판년도'],
-        '도서이미지URL': book_info['도서이미지URL']
-    }
-    st.session_state.book_stack.push(book_dict)
+    lookup_start = time.perf_counter()
+    
+    # 도서 검색 (제목·저자·출판사)
+    query = st.text_input("🔍 도서 검색", placeholder="제목, 저자, 출판사 일부를 입력하세요", key="search_query")
+    hit_rows = []
+    if query:
+        start = time.perf_counter()
+        # 검색 결과는 행 위치 (같은 순위의 다른 도서와 섞이지 않도록 순위번호로 바꾸지 않음)
+        hit_rows = load_search_index(*cached_args(selected_month, SEARCH_COLUMNS)).search(query, limit=20)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if hit_rows:
+            st.caption(f"검색 결과 {len(hit_rows)}건 ({elapsed_ms:.2f}ms)")
+        else:
+            st.info("검색 결과가 없습니다.")
+    
+    if hit_rows:
+        # 검색 결과 중에서 선택
+        selected_row = st.selectbox(
+            "검색 결과에서 선택하세요 📊",
+            hit_rows,
+            format_func=row_labels.__getitem__,
+            key="search_select",
+            on_change=sync_search_param,
+        )
+    else:
+        # 순위 선택 (순위순 행 위치 목록 사용, ?rank=&row= 파라미터가 있으면 해당 도서)
+        apply_book_param(df, rank_to_pos)
+        if not 0 <= st.session_state.get("rank_select", -1) < len(df):
+            st.session_state.rank_select = rank_rows[0]
+        selected_row = st.selectbox(
+            "순위를 선택하세요 📊", rank_rows, format_func=row_labels.__getitem__,
+            key="rank_select", on_change=sync_rank_param
+        )
+    
+    # 선택된 도서 정보 조회 (행 위치로 바로 접근)
+    book_info = df.iloc[selected_row]
+    selected_rank = int(book_info["순위번호"])
+    
+    # 스택에 현재 조회한 도서 추가 (자동으로 Push, 기준년월/순위번호와 행 번호만 저장)
+    st.session_state.book_stack.push((selected_month, selected_rank), selected_row)
+    perf.record_since("main", "lookup", lookup_start)
+    perf.observe("book_stack_bytes", st.session_state.book_stack.nbytes(), app="main")
+    
+    # 다음에 볼 가능성이 높은 도서(앞뒤 순위, 조회 기록)를 백그라운드에서 미리 준비
+    schedule_prefetch(selected_month, selected_row)
     
     # 도서 정보 표시
     st.subheader(f"📖 {book_info['도서명정보']}")
@@ -109,35 +629,77 @@ with col_main:
     with info_col2:
         year = int(book_info['출판년도']) if not pd.isna(book_info['출판년도']) else '정보 없음'
         st.markdown(f"**📅 출판년도:** {year}")
-        st.markdown(f"**🏆 현재 순위:** {book_info['순위번호']}위")
+        movement = f" ({movement_label(month_diff, selected_row)})" if month_diff else ""
+        st.markdown(f"**🏆 현재 순위:** {book_info['순위번호']}위{movement}")
     
-    # 도서 이미지 출력
-    st.image(book_info["도서이미지URL"], use_column_width=True)
+    # 도서 이미지 출력 (로컬 캐시에 있으면 사용, 없으면 원격 URL을 보여주고 백그라운드에서 받아 둠)
+    # 화면을 그리는 중에는 내려받지 않으므로 표지 서버가 느리거나 내려가도 rerun이 기다리지 않음
+    with perf.timer("main", "image"):
+        # 미리 준비되어 있었는지 기록 (디버그 패널 캐시 적중률의 prefetch 항목)
+        perf.cache_call("prefetch")
+        if not get_prefetcher().record_use(("cover", book_info["도서이미지URL"], DETAIL_SIZE)):
+            perf.cache_miss("prefetch")
+        covers = get_cover_cache()
+        cover = covers.cached_thumbnail(book_info["도서이미지URL"], DETAIL_SIZE)
+        if cover is None:
+            covers.prefetch([book_info["도서이미지URL"]], DETAIL_SIZE, visible=True)
+        st.image(cover or book_info["도서이미지URL"], use_column_width=True)
+    
+    # 비슷한 도서 추천 (선택한 달의 조회 기록 이웃 목록을 합침)
+    with perf.timer("main", "recommend"):
+        # 기록의 순위번호/행 번호로 현재 데이터의 행 위치를 찾음 (데이터 갱신 후에도 정확)
+        history_positions = [resolve_row(df, rank_to_pos, rank, row_id)
+                             for (month, rank), row_id in st.session_state.book_stack.get_history()
+                             if month == selected_month]
+        history_positions = [pos for pos in history_positions if pos is not None]
+        neighbors, neighbor_scores = load_neighbors(*cached_args(selected_month, NEIGHBOR_COLUMNS))
+        recommended = recommend(neighbors, neighbor_scores, history_positions)
+    if recommended:
+        st.markdown("**💡 비슷한 도서 추천**")
+        for pos in recommended:
+            book = df.iloc[pos]
+            rank = int(book["순위번호"])
+            # 이웃은 행 위치이므로 행 위치까지 넘겨야 같은 순위의 다른 도서가 열리지 않음
+            st.button(f"{rank}위 · {book['도서명정보']} ({book['저자명정보']})", key=f"recommend_{pos}",
+                      on_click=select_book, args=(selected_month, rank, pos))
 
-with col_history:
+# 조회 기록 패널 (fragment - 기록 관련 버튼은 이 패널만 다시 실행)
+@st.fragment
+def history_panel():
+    """최근 조회 기록과 기록 관리 버튼"""
+    history_start = time.perf_counter()
+    book_stack = st.session_state.book_stack
+    
     # 조회 기록 표시 (스택 활용)
     st.subheader("🕒 최근 조회 기록")
-    st.caption(f"스택 크기: {st.session_state.book_stack.size()}개")
+    st.caption(f"스택 크기: {book_stack.size()}개")
     
-    # 스택에서 조회 기록 가져오기
-    history = st.session_state.book_stack.get_history()
+    # 스택에서 조회 기록 가져오기 (최근 8개만 표시)
+    history = book_stack.get_history(limit=8)
     
     if history:
-        # 최근 조회한 도서들을 카드 형태로 표시
-        for i, book in enumerate(history[:8]):  # 최근 8개만 표시
+        # 최근 조회한 도서들을 카드 형태로 표시 (상세 정보는 공유 데이터프레임에서 조회)
+        for i, ((month, rank), row_id) in enumerate(history):
+            # 순위번호/행 번호로 현재 데이터의 행을 찾음 (데이터 갱신으로 달/순위가 없어졌으면 건너뜀)
+            if month is not None and month not in months:
+                continue
+            month_df = load_book_data(month)
+            pos = resolve_row(month_df, load_rank_index(*cached_args(month, RANK_COLUMNS))[0], rank, row_id)
+            if pos is None:
+                continue
+            book = month_df.iloc[pos]
             with st.expander(
                 f"{i+1}. {book['도서명정보'][:15]}{'...' if len(book['도서명정보']) > 15 else ''}", 
                 expanded=(i == 0)  # 첫 번째만 펼쳐서 표시
             ):
-                st.write(f"**순위:** {book['순위번호']}위")
+                st.write(f"**순위:** {f'{month} ' if month else ''}{rank}위")
                 st.write(f"**저자:** {book['저자명정보']}")
                 year = int(book['출판년도']) if not pd.isna(book['출판년도']) else '정보 없음'
                 st.write(f"**출판년도:** {year}")
                 
-                # 이 도서로 바로가기 버튼
-                if st.button(f"📖 다시 보기", key=f"view_{book['순위번호']}_{i}"):
-                    # 세션에서 선택된 순위 변경하고 페이지 새로고침
-                    st.query_params.from_dict({"rank": str(book['순위번호'])})
+                # 이 도서로 바로가기 버튼 (메인 화면이 바뀌므로 전체 다시 실행)
+                if st.button(f"📖 다시 보기", key=f"view_{month}_{rank}_{i}",
+                             on_click=select_book, args=(month, rank, pos)):
                     st.rerun()
     else:
         st.info("아직 조회한 도서가 없습니다.")
@@ -147,26 +709,73 @@ with col_history:
     st.subheader("🔧 기록 관리")
     
     # Pop 버튼 (가장 최근 조회 기록 제거)
-    if st.button("🗑️ 최근 기록 삭제", help="스택에서 Pop 연산 수행"):
-        removed_book = st.session_state.book_stack.pop()
-        if removed_book:
-            st.success(f"'{removed_book['도서명정보']}' 기록이 삭제되었습니다!")
-            st.rerun()
-        else:
-            st.warning("삭제할 기록이 없습니다!")
+    st.button("🗑️ 최근 기록 삭제", help="스택에서 Pop 연산 수행", on_click=pop_history)
     
     # 전체 기록 삭제
-    if st.button("🧹 전체 기록 삭제", help="스택 전체 초기화"):
-        st.session_state.book_stack = BookViewStack()
-        st.success("모든 조회 기록이 삭제되었습니다!")
-        st.rerun()
+    st.button("🧹 전체 기록 삭제", help="스택 전체 초기화", on_click=clear_history)
+    
+    # 콜백에서 남긴 결과 메시지 표시
+    message = st.session_state.pop("history_message", None)
+    if message:
+        level, text = message
+        getattr(st, level)(text)
+    perf.record_since("main", "history", history_start)
+
+with col_history:
+    history_panel()
 
 # 하단 정보 섹션
 st.markdown("---")
 
+# 저자/출판사 순위표 (미리 계산된 집계에서 상위 k개만 조회)
+with st.expander("🏅 저자 · 출판사 순위"):
+    board_col1, board_col2, board_col3 = st.columns(3)
+    with board_col1:
+        board_kind = st.radio("기준", ["author", "publisher"],
+                              format_func=lambda kind: "저자" if kind == "author" else "출판사", horizontal=True)
+    with board_col2:
+        board_scope = st.radio("기간", ["선택한 달", "전체 기간"], horizontal=True, disabled=not months)
+    with board_col3:
+        top_k = st.slider("상위 몇 개", 5, 50, 10)
+    
+    with perf.timer("main", "aggregation"):
+        if board_scope == "전체 기간" and months:
+            aggregate = load_cumulative_aggregate(tuple((month, snapshot.key(month, STATS_COLUMNS)) for month in months))
+        else:
+            aggregate = load_month_aggregate(selected_month, snapshot.key(selected_month, STATS_COLUMNS))
+        board = leaderboard(aggregate, board_kind, top_k)
+    st.dataframe(board, use_container_width=True)
+    
+    # 선택한 저자/출판사의 도서 목록 (선택한 달 기준)
+    if len(board):
+        entity = st.selectbox("상세 보기", board.index.tolist())
+        positions = load_entity_rows(*cached_args(selected_month, STATS_COLUMNS))[board_kind].get(entity)
+        if positions is None:
+            st.info("선택한 달에는 해당 도서가 없습니다.")
+        else:
+            st.dataframe(df.iloc[positions][["순위번호", "도서명정보", "저자명정보", "출판사명", "출판년도"]],
+                         use_container_width=True, hide_index=True)
+
+# 전월 대비 순위 변동 요약 (신규 진입/이탈 도서)
+if month_diff:
+    with st.expander(f"📊 전월({previous_month}) 대비 순위 변동"):
+        counts = month_diff["counts"]
+        diff_cols = st.columns(5)
+        for diff_col, (label, value) in zip(diff_cols, [("상승", counts["up"]), ("하락", counts["down"]),
+                                                        ("유지", counts["same"]), ("신규 진입", counts["new"]),
+                                                        ("순위권 이탈", counts["dropped"])]):
+            diff_col.metric(label, f"{value}권")
+        
+        dropped = month_diff["dropped"]
+        if len(dropped):
+            st.markdown("**순위권 이탈 도서 (전월 순위)**")
+            previous_df = load_book_data(previous_month)
+            st.dataframe(previous_df.iloc[dropped["pos"].to_numpy()][["순위번호", "도서명정보", "저자명정보", "출판사명"]],
+                         use_container_width=True, hide_index=True)
+
 # 스택 자료구조 설명
 with st.expander("🧠 스택(Stack) 자료구조란?"):
-    st.markdown("""
+    st.markdown(f"""
     **스택의 특징:**
     - **LIFO 구조**: Last In First Out (후입선출) - 마지막에 들어간 것이 먼저 나옴
     - **Push 연산**: 스택 맨 위에 새로운 데이터 추가
@@ -177,12 +786,12 @@ with st.expander("🧠 스택(Stack) 자료구조란?"):
     - 사용자가 조회한 도서를 순서대로 스택에 저장
     - 가장 최근에 본 도서가 맨 위에 표시됨
     - 같은 도서를 다시 보면 기존 기록을 제거하고 맨 위로 이동
-    - 최대 10개까지만 저장하여 메모리 효율성 확보
+    - 최대 {MAX_HISTORY}개까지만 저장하고, 도서 정보 대신 순위번호와 행 번호만 보관하여 메모리 효율성 확보
     """)
 
 # 디버깅 정보
 with st.expander("🔧 디버깅 과정 및 문제 해결"):
-    st.markdown("""
+    st.markdown(f"""
     **발생한 문제들과 해결 과정:**
     
     **1. 세션 상태 관리 문제**
@@ -194,32 +803,65 @@ with st.expander("🔧 디버깅 과정 및 문제 해결"):
     - **문제**: 같은 도서를 여러 번 선택하면 스택에 중복 저장됨
     - **해결**: Push 메서드에서 같은 순위번호 도서를 먼저 제거 후 추가
     - **논리**: 리스트 컴프리헨션으로 `[book for book in self.stack if book['순위번호'] != book_info['순위번호']]`
+    - **개선**: OrderedDict의 `move_to_end`로 중복 제거와 맨 위 이동을 O(1)에 처리
     
     **3. 메모리 관리**
     - **문제**: 계속 사용하면 스택 크기가 무한정 증가할 수 있음
-    - **해결**: `max_size=10`으로 최대 크기 제한, 초과시 가장 오래된 항목 자동 제거
+    - **해결**: `max_size`(기본 `MAX_HISTORY`={MAX_HISTORY})로 최대 크기 제한, 초과시 가장 오래된 항목 자동 제거
     - **효과**: 메모리 사용량 제한으로 안정적인 앱 운영
+    - **개선**: `popitem(last=False)`로 가장 오래된 항목을 O(1)에 제거 (`list.pop(0)`은 O(n))
     
     **4. 사용자 경험 개선**
     - **문제**: 기록에서 도서 선택시 어떻게 해당 도서로 이동할지 고민
     - **해결**: 버튼 클릭시 `st.rerun()`으로 페이지 새로고침하여 최신 상태 반영
+    - **개선**: 기록 패널과 스택 상태를 `st.fragment`로 분리하여 기록 삭제는 해당 패널만 다시 실행
+    - **개선**: "다시 보기"는 `?rank=` 파라미터(같은 순위의 도서가 여러 권이면 `?row=`도)를 남기고, 이 값으로 선택된 도서가 바뀜
     """)
 
-# 현재 스택 상태 정보
-st.subheader("📊 현재 스택 상태")
-stack_col1, stack_col2, stack_col3 = st.columns(3)
-
-with stack_col1:
-    st.metric("저장된 도서 수", st.session_state.book_stack.size())
-
-with stack_col2:
-    st.metric("최대 저장 가능", "10개")
+# 현재 스택 상태 정보 (fragment - 새로고침 버튼은 이 영역만 다시 실행)
+@st.fragment
+def stack_status():
+    """스택 크기, 최대 크기, 상태, 세션 메모리 지표"""
+    book_stack = st.session_state.book_stack
+    stack_col1, stack_col2, stack_col3, stack_col4 = st.columns(4)
+    
+    with stack_col1:
+        st.metric("저장된 도서 수", book_stack.size())
+    
+    with stack_col2:
+        st.metric("최대 저장 가능", f"{book_stack.max_size}개")
+    
+    with stack_col3:
+        is_empty = book_stack.is_empty()
+        st.metric("스택 상태", "비어있음" if is_empty else "데이터 있음")
+    
+    with stack_col4:
+        st.metric("세션 메모리", f"{book_stack.nbytes():,} B")
+    
+    # 저장소 상태 (변경 횟수보다 기록 횟수가 적으면 여러 변경이 한 번의 쓰기로 합쳐진 것)
+    history_store = get_history_store()
+    if history_store is not None:
+        stats = history_store.stats()
+        st.caption(f"🗄️ 기록 저장소: 메모리 사용자 {stats['hot_users']}명 · 기록 대기 {stats['pending']}명 · "
+                   f"변경 {stats['changes']}회 → 기록 {stats['writes']}회")
+    
+    # 미리 준비 상태 (적중률이 높을수록 순위를 넘길 때 표지를 기다리지 않음)
+    stats = get_prefetcher().stats()
+    st.caption(f"⚡ 미리 준비: 적중률 {stats['hit_rate']}% ({stats['hits']}/{stats['hits'] + stats['misses']}) · "
+               f"완료 {stats['completed']}건 · 취소 {stats['cancelled']}건 · 진행 중 {stats['inflight']}건")
+    
+    st.button("🔄 상태 새로고침", key="refresh_stack_status")
 
-with stack_col3:
-    is_empty = st.session_state.book_stack.is_empty()
-    st.metric("스택 상태", "비어있음" if is_empty else "데이터 있음")
+st.subheader("📊 현재 스택 상태")
+stack_status()
 
 # 맨 아래 정보
 st.markdown("---")
 st.caption("💡 **스택의 LIFO 특성을 활용한 도서 조회 기록 관리 시스템**")
-st.caption("📚 CP949 인코딩으로 한글 도서 데이터 처리 | 🔄 자동 중복 제거 | 📝 최대 10개 기록 저장")
+st.caption(f"📚 CP949 인코딩으로 한글 도서 데이터 처리 | 🔄 자동 중복 제거 | 📝 최대 {MAX_HISTORY}개 기록 저장")
+
+# 성능 디버그 패널 (?debug=1) 및 Prometheus 파일 내보내기 (PERF_METRICS_FILE)
+perf.record_since("main", "rerun", run_start)
+if perf.debug_enabled(st):
+    perf.render_panel(st)
+perf.export_prometheus()
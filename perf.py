@@ -0,0 +1,229 @@
+"""
+성능 계측 모듈 (main.py, wodus.py 공용)
+- 구간 타이머: 데이터 로드, 조회, 집계, 차트, 이미지 등 rerun 구간별 소요 시간
+- 캐시 호출/미스 카운터: 캐시 함수 호출 수와 실제 실행(미스) 수
+- 관측값: 세션별 BookViewStack 메모리 등
+- 모든 측정값은 크기가 정해진 링 버퍼(deque)에 보관하여 메모리가 늘지 않음
+  (분위수는 링 버퍼 기준, 전체 개수/합계는 따로 누적하여 Prometheus에서 단조 증가하도록 함)
+- 디버그 패널로 표시하고 Prometheus 텍스트 형식 파일로 내보냄
+"""
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+RING_SIZE = 512
+EXPORT_INTERVAL = 10.0  # Prometheus 파일 최소 갱신 간격(초)
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=RING_SIZE))  # (지표, 라벨) → 최근 값
+_counters = defaultdict(int)  # (지표, 라벨) → 누적 횟수
+_totals = defaultdict(lambda: [0, 0.0])  # (지표, 라벨) → [전체 관측 수, 전체 합계] (링 버퍼와 달리 줄지 않음)
+_last_export = 0.0
+
+
+def _labels(**labels):
+    """라벨 딕셔너리를 정렬된 튜플로 변환 (딕셔너리 키로 사용)"""
+    return tuple(sorted(labels.items()))
+
+
+def observe(metric, value, **labels):
+    """관측값 하나 기록"""
+    key = (metric, _labels(**labels))
+    with _lock:
+        _samples[key].append(value)
+        total = _totals[key]
+        total[0] += 1
+        total[1] += value
+
+
+def count(metric, amount=1, **labels):
+    """카운터 증가"""
+    with _lock:
+        _counters[(metric, _labels(**labels))] += amount
+
+
+@contextmanager
+def timer(app, section):
+    """with 블록의 소요 시간을 app_section_seconds로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("app_section_seconds", time.perf_counter() - start, app=app, section=section)
+
+
+def record_since(app, section, start):
+    """time.perf_counter() 기준 start부터 지금까지의 시간을 구간 시간으로 기록 (큰 화면 블록용)"""
+    observe("app_section_seconds", time.perf_counter() - start, app=app, section=section)
+
+
+def cache_call(function):
+    """캐시 함수 호출 1회 기록 (캐시 함수를 부르기 직전에 호출)"""
+    count("app_cache_calls_total", function=function)
+
+
+def cache_miss(function):
+    """캐시 미스 1회 기록 (캐시 함수 본문 안에서 호출 - 캐시 적중 시에는 실행되지 않음)"""
+    count("app_cache_misses_total", function=function)
+
+
+def reset():
+    """모든 측정값과 카운터 초기화 (부하 테스트 단계 사이 등)"""
+    with _lock:
+        _samples.clear()
+        _counters.clear()
+        _totals.clear()
+
+
+def snapshot():
+    """
+    현재 측정값 요약
+    반환: (관측값 목록, 카운터 목록)
+    - 관측값: 지표, 라벨, 개수(링 버퍼), 전체 개수, 전체 합계, p50, p95, 최대, 최근 값
+    - 카운터: 지표, 라벨, 값
+    """
+    with _lock:
+        samples = {key: np.array(values) for key, values in _samples.items() if values}
+        totals = {key: tuple(_totals[key]) for key in samples}
+        counters = dict(_counters)
+
+    summaries = []
+    for (metric, labels), values in sorted(samples.items()):
+        summaries.append({
+            "metric": metric,
+            "labels": dict(labels),
+            "count": len(values),
+            "total_count": totals[(metric, labels)][0],
+            "total_sum": totals[(metric, labels)][1],
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+            "last": float(values[-1]),
+        })
+    counter_rows = [
+        {"metric": metric, "labels": dict(labels), "value": value}
+        for (metric, labels), value in sorted(counters.items())
+    ]
+    return summaries, counter_rows
+
+
+def _format_labels(labels, **extra):
+    """Prometheus 라벨 문자열"""
+    merged = {**labels, **extra}
+    if not merged:
+        return ""
+    body = ",".join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in sorted(merged.items()))
+    return "{" + body + "}"
+
+
+def to_prometheus():
+    """
+    Prometheus 텍스트 형식
+    - 관측값: summary (최근 값 기준 분위수 + 전체 누적 _sum/_count), 최근 값 중 최대는 <지표>_max gauge
+    - 카운터: counter
+    """
+    summaries, counter_rows = snapshot()
+    lines = []
+    typed = set()
+    for row in summaries:
+        metric = row["metric"]
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} summary")
+            typed.add(metric)
+        for quantile, key in [("0.5", "p50"), ("0.95", "p95")]:
+            lines.append(f"{metric}{_format_labels(row['labels'], quantile=quantile)} {row[key]:.6g}")
+        lines.append(f"{metric}_sum{_format_labels(row['labels'])} {row['total_sum']:.6g}")
+        lines.append(f"{metric}_count{_format_labels(row['labels'])} {row['total_count']}")
+    for row in summaries:
+        metric = f"{row['metric']}_max"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} gauge")
+            typed.add(metric)
+        lines.append(f"{metric}{_format_labels(row['labels'])} {row['max']:.6g}")
+    for row in counter_rows:
+        metric = row["metric"]
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_format_labels(row['labels'])} {row['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def export_prometheus(path=None, force=False):
+    """
+    Prometheus 텍스트 파일 저장 (PERF_METRICS_FILE 환경 변수로 경로 지정)
+    rerun마다 디스크에 쓰지 않도록 EXPORT_INTERVAL초에 한 번만 기록
+    """
+    global _last_export
+    path = path or os.environ.get("PERF_METRICS_FILE")
+    if not path:
+        return False
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _last_export < EXPORT_INTERVAL:
+            return False
+        _last_export = now
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+    return True
+
+
+def debug_enabled(st):
+    """?debug=1 파라미터나 PERF_DEBUG=1 환경 변수가 있으면 디버그 패널 표시"""
+    return st.query_params.get("debug") == "1" or os.environ.get("PERF_DEBUG") == "1"
+
+
+def render_panel(st):
+    """성능 디버그 패널 (구간별 소요 시간, 캐시 적중률, 관측값)"""
+    summaries, counter_rows = snapshot()
+    with st.expander("⏱️ 성능 디버그 패널", expanded=True):
+        sections = [row for row in summaries if row["metric"] == "app_section_seconds"]
+        if sections:
+            st.markdown("**구간별 소요 시간 (ms)**")
+            st.dataframe([
+                {
+                    "앱": row["labels"].get("app"),
+                    "구간": row["labels"].get("section"),
+                    "횟수": row["total_count"],
+                    "p50": round(row["p50"] * 1000, 2),
+                    "p95": round(row["p95"] * 1000, 2),
+                    "최대": round(row["max"] * 1000, 2),
+                }
+                for row in sections
+            ], use_container_width=True)
+
+        calls = {row["labels"].get("function"): row["value"]
+                 for row in counter_rows if row["metric"] == "app_cache_calls_total"}
+        misses = {row["labels"].get("function"): row["value"]
+                  for row in counter_rows if row["metric"] == "app_cache_misses_total"}
+        if calls:
+            st.markdown("**캐시 적중률**")
+            st.dataframe([
+                {
+                    "함수": name,
+                    "호출": total,
+                    "미스": misses.get(name, 0),
+                    "적중률(%)": round((total - misses.get(name, 0)) / total * 100, 1) if total else 0.0,
+                }
+                for name, total in sorted(calls.items())
+            ], use_container_width=True)
+
+        others = [row for row in summaries if row["metric"] != "app_section_seconds"]
+        if others:
+            st.markdown("**관측값**")
+            st.dataframe([
+                {
+                    "지표": row["metric"],
+                    "라벨": _format_labels(row["labels"]),
+                    "p50": row["p50"],
+                    "p95": row["p95"],
+                    "최대": row["max"],
+                }
+                for row in others
+            ], use_container_width=True)
@@ -0,0 +1,177 @@
+"""
+파생 데이터 일괄 생성 CLI (데이터 배포본마다 한 번 실행)
+- 도서 순위 CSV(people_book.csv 또는 월별 CSV 폴더)를 월별 컬럼 파티션으로 변환
+- 월마다 순위 색인, 검색 색인, 저자/출판사 집계, 추천 이웃 표를 만들어 저장
+- 문해력 응답자 원자료가 있으면 집계 큐브 생성
+- 표지 썸네일을 미리 만들어 표지 캐시에 저장 (--covers)
+  작업 프로세스는 임시 폴더에만 쓰고, 표지 캐시에는 부모 프로세스가 한 번에 옮겨 저장 (용량 한도 하나로 관리)
+- 모든 작업은 프로세스 풀에서 병렬로 실행하고 (기본: CPU 코어 수)
+  결과는 임시 폴더에 모두 쓴 뒤 artifacts/<버전>으로 옮기고 CURRENT를 교체 (artifacts.py)
+- 버전은 입력 파일 내용 해시로 정하므로 같은 데이터로 다시 실행하면 기존 결과를 그대로 사용
+
+사용법:
+    python precompute.py people_book.csv
+    python precompute.py monthly_csv/ --survey survey_2014.csv survey_2017.csv --covers --workers 8
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from artifacts import (ARTIFACT_DIR, CURRENT_FILE, FORMAT_VERSION, current_dir, latest_build, publish,
+                       save_object, set_current)
+from book_data import BOOK_CSV, file_hash, rank_index, rank_order
+from book_ingest import CHUNK_ROWS, expand_sources, ingest, read_month
+from book_recommend import build_neighbors
+from book_search import BookSearchIndex
+from book_stats import aggregate_month, entity_rows
+from cover_cache import COVER_DIR, MAX_BYTES, CoverCache, DETAIL_SIZE, THUMB_SIZE
+from literacy_ingest import CUBE_PATH, build_cube, save_cube
+
+COVER_BATCH = 200  # 표지 작업 하나가 처리할 URL 수
+KEEP_VERSIONS = 3  # 남겨 둘 이전 버전 수
+
+
+def input_version(paths):
+    """입력 파일 내용 해시로 만든 버전 이름"""
+    digest = hashlib.sha256(f"format={FORMAT_VERSION}".encode("utf-8"))
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        digest.update(file_hash(path).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def build_month(version_dir, month):
+    """한 달치 파생 데이터 생성 (작업 프로세스에서 실행)"""
+    df = read_month(month, os.path.join(version_dir, "months"))
+    save_object(version_dir, month, "rank_index", rank_index(df))
+    save_object(version_dir, month, "rank_order", rank_order(df))
+    save_object(version_dir, month, "search_index", BookSearchIndex(df))
+    save_object(version_dir, month, "aggregate", aggregate_month(df))
+    save_object(version_dir, month, "entity_rows", entity_rows(df))
+    save_object(version_dir, month, "neighbors", build_neighbors(df))
+    return f"{month}: {len(df):,}행"
+
+
+def build_literacy(version_dir, survey_paths, chunk_rows):
+    """문해력 집계 큐브 생성 (작업 프로세스에서 실행)"""
+    cube = build_cube(survey_paths, chunk_rows)
+    save_cube(cube, os.path.join(version_dir, CUBE_PATH))
+    return f"문해력 큐브: {len(cube):,}칸"
+
+
+def build_covers(batch_dir, urls):
+    """
+    표지 썸네일(목록/상세 크기) 생성 (작업 프로세스에서 실행)
+    작업마다 자기 임시 폴더에만 쓰고, 표지 캐시로 옮기는 것은 부모 프로세스가 함
+    """
+    cache = CoverCache(batch_dir, max_bytes=float("inf"))
+    done = 0
+    for url in urls:
+        if cache.get_thumbnail(url, THUMB_SIZE) is not None:
+            cache.get_thumbnail(url, DETAIL_SIZE)
+            done += 1
+    return f"표지 {done}/{len(urls)}장"
+
+
+def cover_urls(version_dir, months):
+    """모든 달의 표지 URL (중복 제거)"""
+    urls = {}
+    for month in months:
+        for url in read_month(month, os.path.join(version_dir, "months"))["도서이미지URL"].tolist():
+            if isinstance(url, str) and url:
+                urls[url] = None
+    return list(urls)
+
+
+def prune(root, keep):
+    """CURRENT를 제외하고 오래된 버전 폴더 삭제 (최근 keep개 유지)"""
+    current = current_dir(root)
+    versions = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith(".") or name == CURRENT_FILE or not os.path.isdir(path):
+            continue
+        if current and os.path.samefile(path, current):
+            continue
+        versions.append((os.path.getmtime(path), path))
+    for _, path in sorted(versions, reverse=True)[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def precompute(book_paths, survey_paths=(), root=ARTIFACT_DIR, workers=None, covers=False,
+               cover_dir=COVER_DIR, chunk_rows=CHUNK_ROWS, force=False, cover_bytes=MAX_BYTES):
+    """파생 데이터 전체 생성 후 새 버전 폴더 경로 반환"""
+    sources = expand_sources(book_paths)
+    surveys = expand_sources(survey_paths)
+    version = input_version(sources + surveys)
+    os.makedirs(root, exist_ok=True)
+    existing = None if force else latest_build(root, version)
+    if existing:
+        print(f"같은 입력의 버전이 이미 있습니다: {existing}")
+        set_current(root, existing)
+        return os.path.join(root, existing)
+
+    staging_dir = os.path.join(root, f".staging-{version}-{os.getpid()}")
+    try:
+        months = ingest(sources, os.path.join(staging_dir, "months"), chunk_rows)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_month, staging_dir, month) for month in months]
+            if surveys:
+                futures.append(pool.submit(build_literacy, staging_dir, surveys, chunk_rows))
+            if covers:
+                # 이미 두 크기 모두 캐시에 있는 표지는 다시 만들지 않음
+                cover_cache = CoverCache(cover_dir, max_bytes=cover_bytes)
+                urls = [url for url in cover_urls(staging_dir, months)
+                        if not (cover_cache.has_thumbnail(url, THUMB_SIZE) and cover_cache.has_thumbnail(url, DETAIL_SIZE))]
+                batch_dirs = [os.path.join(staging_dir, "covers", str(i)) for i in range(0, len(urls), COVER_BATCH)]
+                futures += [pool.submit(build_covers, batch_dir, urls[i:i + COVER_BATCH])
+                            for batch_dir, i in zip(batch_dirs, range(0, len(urls), COVER_BATCH))]
+            for future in futures:
+                print(f"  {future.result()}")
+
+        if covers:
+            imported = sum(cover_cache.import_thumbnails(batch_dir) for batch_dir in batch_dirs
+                           if os.path.isdir(batch_dir))
+            shutil.rmtree(os.path.join(staging_dir, "covers"), ignore_errors=True)  # 버전 폴더에는 넣지 않음
+            print(f"  표지 캐시에 {imported}개 저장")
+
+        manifest = {
+            "inputs": {os.path.basename(path): file_hash(path) for path in sources + surveys},
+            "months": months,
+            "literacy_cube": bool(surveys),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return publish(root, version, staging_dir, manifest)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=[BOOK_CSV], help="도서 순위 CSV 파일 또는 폴더")
+    parser.add_argument("--survey", nargs="*", default=[], help="문해력 응답자 원자료 CSV 파일 또는 폴더")
+    parser.add_argument("--out", default=ARTIFACT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--covers", action="store_true", help="표지 썸네일도 미리 생성")
+    parser.add_argument("--cover-dir", default=os.environ.get("COVER_CACHE_DIR", COVER_DIR))
+    parser.add_argument("--cover-mb", type=int, default=int(os.environ.get("COVER_CACHE_MB", "200")),
+                        help="표지 캐시 용량 한도 (앱의 COVER_CACHE_MB와 같게)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--keep", type=int, default=KEEP_VERSIONS, help="남겨 둘 이전 버전 수")
+    parser.add_argument("--force", action="store_true", help="같은 버전이 있어도 다시 생성")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    target = precompute(args.paths, args.survey, args.out, args.workers, args.covers,
+                        args.cover_dir, args.chunk_rows, args.force, args.cover_mb * 1024 * 1024)
+    prune(args.out, args.keep)
+    print(f"완료: {target} ({time.perf_counter() - start:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+다음에 볼 도서 미리 준비 (백그라운드 prefetch)
+- 도서를 보여줄 때 앞뒤 순위와 조회 기록에 있는 도서의 월 데이터/표지를 작은 스레드 풀에서 미리 준비
+- 세션(owner)마다 예약 목록을 두고, 선택이 바뀌면 아직 시작하지 않은 예약은 취소
+- 이미 준비된 항목이나 다른 세션이 준비 중인 항목은 다시 예약하지 않음
+- 대기 작업 수에 상한이 있어 요청이 몰려도 작업이 무한정 쌓이지 않음
+- 실제로 사용할 때 record_use로 미리 준비되어 있었는지 기록하여 적중률 계산
+- 준비한 결과가 다른 곳(표지 캐시 등)에서 지워질 수 있으므로 is_ready로 아직 남아 있는지 확인한 뒤에만 준비된 것으로 봄
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+PREFETCH_WORKERS = 2
+MAX_PENDING = 32  # 전체 대기/진행 중 작업 최대 개수
+REMEMBER = 2048  # 준비 완료로 기억할 최근 항목 수
+
+
+class Prefetcher:
+    """
+    미리 준비 작업 관리자 (프로세스당 하나, 모든 세션이 공유)
+    - 작업: (키, 함수) - 키가 같으면 같은 작업으로 보고 한 번만 실행, 함수는 준비한 값(실패 시 None)을 반환
+    - warmed: 준비가 끝난 최근 키 (LRU)
+    - is_ready(키): 준비한 결과가 아직 남아 있는지 (False면 warmed에서 빼고 다시 예약, None이면 확인하지 않음)
+    """
+    def __init__(self, max_workers=PREFETCH_WORKERS, max_pending=MAX_PENDING, remember=REMEMBER, is_ready=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.max_pending = max_pending
+        self.remember = remember
+        self.is_ready = is_ready
+        self.lock = threading.RLock()  # 취소 시 완료 콜백이 같은 스레드에서 바로 호출되므로 재진입 가능해야 함
+        self.owners = {}  # 세션 → 예약한 future 목록
+        self.inflight = {}  # 키 → future
+        self.warmed = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def schedule(self, owner, jobs):
+        """
+        owner의 이전 예약 중 시작하지 않은 것은 취소하고 새 작업 예약
+        jobs: [(키, 함수)] - 앞쪽일수록 먼저 실행 (우선순위 순서로 전달)
+        반환: 새로 예약한 작업 수
+        """
+        with self.lock:
+            for future in self.owners.pop(owner, []):
+                if future.cancel():
+                    self.cancelled += 1
+            # 모두 끝난 세션의 예약 목록 정리 (유휴 세션이 목록을 계속 붙잡지 않도록)
+            self.owners = {key: futures for key, futures in self.owners.items()
+                           if any(not future.done() for future in futures)}
+
+            futures = []
+            for key, function in jobs:
+                if self._is_warmed(key) or key in self.inflight:
+                    continue
+                if len(self.inflight) >= self.max_pending:
+                    break
+                future = self.executor.submit(self._run, key, function)
+                self.inflight[key] = future
+                future.add_done_callback(lambda _, key=key: self._finish(key))
+                futures.append(future)
+            self.owners[owner] = futures
+            return len(futures)
+
+    def _run(self, key, function):
+        """
+        작업 실행 (실패해도 화면에는 영향 없음 - 사용할 때 다시 시도)
+        function()이 None을 돌려주면 준비하지 못한 것(예: 표지 다운로드 실패)으로 보고 준비 완료로 기록하지 않음
+        """
+        try:
+            result = function()
+        except Exception:
+            return
+        if result is None:
+            return
+        self.mark_warmed(key)
+        with self.lock:
+            self.completed += 1
+
+    def mark_warmed(self, key):
+        """준비 완료로 기록 (작업 안에서 키가 다른 항목까지 준비했을 때도 호출)"""
+        with self.lock:
+            self.warmed[key] = None
+            self.warmed.move_to_end(key)
+            while len(self.warmed) > self.remember:
+                self.warmed.popitem(last=False)
+
+    def _is_warmed(self, key):
+        """준비 완료로 기록되어 있고 결과도 아직 남아 있는지 - lock 안에서 호출 (지워졌으면 기록에서 제거)"""
+        if key not in self.warmed:
+            return False
+        if self.is_ready is not None and not self.is_ready(key):
+            del self.warmed[key]
+            return False
+        return True
+
+    def _finish(self, key):
+        """작업 완료/취소 시 진행 중 목록에서 제거"""
+        with self.lock:
+            self.inflight.pop(key, None)
+
+    def record_use(self, key):
+        """실제 사용 시 호출 - 미리 준비되어 있었으면 True (적중)"""
+        with self.lock:
+            hit = self._is_warmed(key)
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return hit
+
+    def stats(self):
+        """적중/미스 수, 적중률(%), 완료/취소 수, 진행 중 작업 수"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "inflight": len(self.inflight),
+            }
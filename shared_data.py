@@ -0,0 +1,28 @@
+"""
+여러 세션이 함께 쓰는 읽기 전용 데이터셋 유틸리티
+- st.cache_data는 호출할 때마다 pickle 복사본을 돌려주므로 rerun마다 전체 프레임을 역직렬화함
+- st.cache_resource로 프로세스당 하나의 프레임만 두고 모든 세션이 같은 객체를 참조
+- 실수로 공유 프레임을 수정하지 않도록 각 컬럼 배열을 쓰기 금지로 고정
+"""
+import pandas as pd
+
+
+def freeze_frame(df):
+    """
+    데이터프레임의 각 컬럼을 쓰기 금지 배열로 바꾼 새 프레임 반환
+    - 컬럼별 배열을 그대로 사용하므로(copy=False) 값 대입 시 ValueError 발생
+    - 필터링/정렬 등 새 프레임을 만드는 연산은 그대로 사용 가능
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[name] = values
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.columns = df.columns  # 컬럼 이름(피벗의 columns.name 등) 유지
+    return frozen
+
+
+def is_frozen(df):
+    """모든 컬럼이 쓰기 금지 상태인지 확인"""
+    return all(not df[name].to_numpy().flags.writeable for name in df.columns)
@@ -0,0 +1,56 @@
+"""
+테스트 공통 설정
+- 모듈이 저장소 최상위에 있으므로 최상위 폴더를 import 경로에 추가
+- cover_server: 요청 수를 세는 로컬 표지 서버 (원격 CDN 대신 사용)
+"""
+import http.server
+import io
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CoverServer:
+    """/missing/... 경로는 404, 나머지는 같은 작은 JPEG를 돌려주는 서버"""
+    def __init__(self):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (200, 290), (120, 140, 200)).save(buffer, format="JPEG")
+        body = buffer.getvalue()
+        self.requests = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                if self.path.startswith("/missing/"):
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.origin = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def cover_server():
+    server = CoverServer()
+    yield server
+    server.close()
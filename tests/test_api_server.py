@@ -0,0 +1,102 @@
+import json
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from api_server import ApiServer, book_route
+from book_watch import BookDataWatcher
+
+
+def make_frame(month, titles):
+    # 2위가 두 권 (같은 순위의 도서)
+    ranks = [1, 2, 2, 4][:len(titles)]
+    return pd.DataFrame({
+        "기준년월": [month] * len(titles),
+        "순위번호": ranks,
+        "도서명정보": titles,
+        "저자명정보": ["갑"] * len(titles),
+        "출판사명": ["을"] * len(titles),
+        "출판년도": [2020.0, None, 2021.0, 2022.0][:len(titles)],
+        "권수(권)": [40, 30, 20, 10][:len(titles)],
+        "도서이미지URL": [""] * len(titles),
+    })
+
+
+@pytest.fixture
+def api():
+    frames = {"2023-05": make_frame("2023-05", ["가", "나", "다", "라"]), "2023-06": make_frame("2023-06", ["마"])}
+    signatures = {month: 1 for month in frames}
+    watcher = BookDataWatcher(lambda month: frames[month].copy(), lambda: dict(signatures), interval=0)
+    server = ApiServer("127.0.0.1", 0)
+    server.route("books", book_route(watcher))
+    host, port = server.address
+
+    def get(path, etag=None):
+        request = urllib.request.Request(f"http://{host}:{port}{path}")
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                body = response.read()
+                return response.status, response.headers.get("ETag"), json.loads(body) if body else None
+        except urllib.error.HTTPError as error:
+            body = error.read()
+            return error.code, error.headers.get("ETag"), json.loads(body) if body else None
+
+    get.frames, get.signatures = frames, signatures
+    yield get
+    server.close()
+
+
+def test_months_and_default_page(api):
+    assert api("/api/books/months")[2] == {"months": ["2023-05", "2023-06"]}
+    status, _, body = api("/api/books?month=2023-05&size=3")
+    assert status == 200
+    assert body["total"] == 4 and body["pages"] == 2
+    assert [item["title"] for item in body["items"]] == ["가", "나", "다"]
+    assert body["items"][1]["year"] is None  # 결측은 null
+    assert api("/api/books")[2]["month"] == "2023-06"  # month가 없으면 마지막 달
+
+
+def test_etag_and_not_modified(api):
+    status, etag, body = api("/api/books?month=2023-05")
+    assert status == 200 and etag
+    assert api("/api/books?month=2023-05", etag) == (304, etag, None)
+    assert api("/api/books?month=2023-05", "*")[0] == 304
+    assert api("/api/books?month=2023-05", '"other"')[:2] == (200, etag)
+    assert api("/api/books?month=2023-05&size=2")[1] != etag
+
+
+def test_etag_changes_when_data_changes(api):
+    _, etag, _ = api("/api/books?month=2023-05")
+    api.frames["2023-05"] = make_frame("2023-05", ["가", "나", "다", "라2"])
+    api.signatures["2023-05"] = 2
+    status, new_etag, body = api("/api/books?month=2023-05", etag)
+    assert status == 200 and new_etag != etag
+    assert body["items"][-1]["title"] == "라2"
+
+
+def test_tied_rank_returns_every_book(api):
+    status, _, body = api("/api/books/2?month=2023-05")
+    assert status == 200
+    assert [item["title"] for item in body["items"]] == ["나", "다"]
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/api/unknown", 404),
+    ("/other", 404),
+    ("/api/books?month=1999-01", 404),
+    ("/api/books/3?month=2023-05", 404),
+    ("/api/books/1/extra", 404),
+    ("/api/books/abc", 400),
+    ("/api/books?month=2023-05&page=5", 400),
+    ("/api/books?month=2023-05&size=0", 400),
+    ("/api/books?month=2023-05&page=x", 400),
+])
+def test_errors(api, path, status):
+    code, etag, body = api(path)
+    assert code == status
+    assert etag is None
+    assert "error" in body
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from book_ingest import ingest, read_month, read_month_hashes
+from book_watch import BookDataWatcher, column_hashes, diff_rows, patch_frame
+
+
+def make_frame(titles, ranks=None):
+    ranks = ranks or list(range(1, len(titles) + 1))
+    return pd.DataFrame({
+        "순위번호": ranks,
+        "도서명정보": titles,
+        "권수(권)": [10 * rank for rank in ranks],
+    })
+
+
+class FakeSource:
+    """달별 프레임과 서명을 직접 바꿀 수 있는 데이터 원본 (읽은 횟수 기록)"""
+    def __init__(self, frames):
+        self.frames = dict(frames)
+        self.signatures = {month: 1 for month in frames}
+        self.reads = []
+        self.fail = False
+
+    def update(self, month, frame):
+        self.frames[month] = frame
+        self.signatures[month] = self.signatures.get(month, 0) + 1
+
+    def reader(self, month):
+        if self.fail:
+            raise OSError("쓰는 중")
+        self.reads.append(month)
+        return self.frames[month].copy()
+
+    def sources(self):
+        return dict(self.signatures)
+
+
+def test_diff_rows_same_layout_reports_changed_positions():
+    old = make_frame(["가", "나", "다"])
+    new = make_frame(["가", "나2", "다"])
+    diff = diff_rows(old, new)
+    assert diff["same_layout"]
+    assert diff["positions"].tolist() == [1]
+    assert diff["changed"] == [2]
+
+
+def test_diff_rows_different_layout_reports_added_and_removed():
+    old = make_frame(["가", "나", "다"])
+    new = make_frame(["가", "다2", "라"], ranks=[1, 3, 4])
+    diff = diff_rows(old, new)
+    assert not diff["same_layout"]
+    assert diff["changed"] == [3]
+    assert diff["added"] == [4]
+    assert diff["removed"] == [2]
+
+
+def test_patch_frame_shares_unchanged_columns():
+    old = make_frame(["가", "나", "다"])
+    new = make_frame(["가", "나2", "다"])
+    patched = patch_frame(old, new, diff_rows(old, new)["positions"], {"도서명정보"})
+    pd.testing.assert_frame_equal(patched, new)
+    assert np.shares_memory(patched["권수(권)"].to_numpy(), old["권수(권)"].to_numpy())
+    assert not patched["도서명정보"].to_numpy().flags.writeable
+
+
+def test_refresh_patches_loaded_month_and_bumps_unloaded_revision():
+    source = FakeSource({"2023-05": make_frame(["가", "나"]), "2023-06": make_frame(["다", "라"])})
+    watcher = BookDataWatcher(source.reader, source.sources, interval=0)
+    first = watcher.current()
+    first.frame("2023-05")
+    key = first.key("2023-05", ["도서명정보"])
+
+    source.update("2023-05", make_frame(["가", "나2"]))
+    source.update("2023-06", make_frame(["다", "라2"]))
+    assert watcher.refresh()
+    second = watcher.snapshot
+    assert second.version == first.version + 1
+    assert second.revision("2023-05") == 1 and second.revision("2023-06") == 1
+    assert second.changes["2023-05"]["changed"] == [2]
+    assert second.key("2023-05", ["도서명정보"]) != key
+    assert second.key("2023-05", ["권수(권)"]) == first.key("2023-05", ["권수(권)"])
+    assert first.frame("2023-05")["도서명정보"].tolist() == ["가", "나"]  # 이전 스냅샷은 그대로
+
+
+def test_touch_without_content_change_keeps_version():
+    source = FakeSource({"2023-05": make_frame(["가", "나"])})
+    watcher = BookDataWatcher(source.reader, source.sources, interval=0)
+    watcher.snapshot.frame("2023-05")
+    source.update("2023-05", make_frame(["가", "나"]))
+    assert watcher.refresh()
+    assert watcher.snapshot.version == 0
+    assert watcher.snapshot.revision("2023-05") == 0
+
+
+def test_reader_error_keeps_previous_snapshot_and_retries(capsys):
+    source = FakeSource({"2023-05": make_frame(["가", "나"])})
+    watcher = BookDataWatcher(source.reader, source.sources, interval=0)
+    first = watcher.snapshot
+    first.frame("2023-05")
+
+    source.update("2023-05", make_frame(["가", "나2"]))
+    source.fail = True
+    assert watcher.current() is first
+    assert "갱신 실패" in capsys.readouterr().err
+
+    source.fail = False
+    second = watcher.current()
+    assert second is not first
+    assert second.frame("2023-05")["도서명정보"].tolist() == ["가", "나2"]
+
+
+def test_key_uses_hasher_without_reading_month():
+    frames = {"2023-05": make_frame(["가", "나"])}
+    source = FakeSource(frames)
+    watcher = BookDataWatcher(source.reader, source.sources, hasher=lambda month: column_hashes(frames[month]))
+    snapshot = watcher.snapshot
+    key = snapshot.key("2023-05", ["도서명정보"])
+    assert source.reads == []
+    snapshot.frame("2023-05")
+    assert snapshot.key("2023-05", ["도서명정보"]) == key
+
+
+def test_loaded_months_are_evicted_least_recently_used_first():
+    source = FakeSource({month: make_frame([month]) for month in ["2023-01", "2023-02", "2023-03"]})
+    watcher = BookDataWatcher(source.reader, source.sources, max_months=2)
+    snapshot = watcher.snapshot
+    snapshot.frame("2023-01")
+    snapshot.frame("2023-02")
+    snapshot.frame("2023-01")
+    snapshot.frame("2023-03")
+    assert [month for month, _ in snapshot.loaded()] == ["2023-01", "2023-03"]
+    snapshot.key("2023-02", ["도서명정보"])  # 내려놓은 달도 해시가 남아 있어 다시 읽지 않음
+    assert source.reads == ["2023-01", "2023-02", "2023-03"]
+
+
+def test_ingest_hashes_match_loaded_frame(tmp_path):
+    csv_path = tmp_path / "books.csv"
+    pd.DataFrame({
+        "기준년월": ["2023-05"] * 5,
+        "순위번호": [1, 2, 3, 4, 5],
+        "도서명정보": ["가", "나", "다", "라", "마"],
+        "저자명정보": ["갑"] * 5,
+        "출판사명": ["을"] * 5,
+        "출판년도": [2020] * 5,
+        "권수(권)": [50, 40, 30, 20, 10],
+        "도서이미지URL": [""] * 5,
+    }).to_csv(csv_path, index=False, encoding="cp949")
+    month_dir = str(tmp_path / "months")
+    ingest([str(csv_path)], month_dir=month_dir, chunk_rows=2)
+    assert read_month_hashes("2023-05", month_dir) == column_hashes(read_month("2023-05", month_dir))
+    assert read_month_hashes("2023-06", month_dir) is None
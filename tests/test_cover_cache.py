@@ -0,0 +1,95 @@
+import io
+import os
+import time
+
+from PIL import Image
+
+from cover_cache import DETAIL_SIZE, THUMB_SIZE, CoverCache
+
+URL = "https://image.aladin.co.kr/product/26942/84/cover/k582730818_1.jpg"
+
+
+def make_cache(tmp_path, server, **kwargs):
+    return CoverCache(str(tmp_path / "covers"), origin=server.origin, timeout=2, **kwargs)
+
+
+def test_thumbnail_is_fetched_once_and_served_from_disk(tmp_path, cover_server):
+    covers = make_cache(tmp_path, cover_server)
+    assert covers.cached_thumbnail(URL) is None  # 캐시에 없으면 내려받지 않음
+    assert cover_server.requests == []
+
+    first = covers.get_thumbnail(URL)
+    second = covers.get_thumbnail(URL)
+    assert first == second
+    assert cover_server.requests == ["/product/26942/84/cover/k582730818_1.jpg"]
+    with Image.open(io.BytesIO(first)) as image:
+        assert image.size == THUMB_SIZE
+    assert covers.cached_thumbnail(URL) == first
+    assert covers.has_thumbnail(URL)
+    assert not covers.has_thumbnail(URL, DETAIL_SIZE)
+
+    # 다른 크기는 원본을 다시 받지 않고 디스크의 원본으로 만듦
+    covers.get_thumbnail(URL, DETAIL_SIZE)
+    assert len(cover_server.requests) == 1
+
+
+def test_failed_fetch_is_not_retried_until_ttl(tmp_path, cover_server, monkeypatch):
+    covers = make_cache(tmp_path, cover_server)
+    url = "https://image.aladin.co.kr/missing/cover.jpg"
+    assert covers.get_thumbnail(url) is None
+    assert covers.get_thumbnail(url) is None
+    assert len(cover_server.requests) == 1
+
+    later = time.monotonic() + 3600
+    monkeypatch.setattr("cover_cache.time.monotonic", lambda: later)
+    assert covers.get_thumbnail(url) is None
+    assert len(cover_server.requests) == 2
+
+
+def test_invalid_urls_are_ignored(tmp_path, cover_server):
+    covers = make_cache(tmp_path, cover_server)
+    for url in (None, "", float("nan")):
+        assert covers.get_thumbnail(url) is None
+        assert covers.cached_thumbnail(url) is None
+    assert cover_server.requests == []
+
+
+def test_least_recently_used_files_are_evicted(tmp_path, cover_server):
+    covers = make_cache(tmp_path, cover_server)
+    covers.get_thumbnail(URL)
+    size = covers.stats()["bytes"]
+
+    small = make_cache(tmp_path / "small", cover_server, max_bytes=size)
+    urls = [f"https://example.com/{i}.jpg" for i in range(3)]
+    for url in urls:
+        small.get_original(url)
+    stats = small.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert stats["files"] == len(os.listdir(small.cache_dir))
+
+
+def test_index_survives_restart(tmp_path, cover_server):
+    covers = make_cache(tmp_path, cover_server)
+    data = covers.get_thumbnail(URL)
+    restarted = make_cache(tmp_path, cover_server)
+    assert restarted.stats()["files"] == covers.stats()["files"]
+    assert restarted.cached_thumbnail(URL) == data
+    assert len(cover_server.requests) == 1
+
+
+def test_prefetch_builds_thumbnails_in_background(tmp_path, cover_server):
+    covers = make_cache(tmp_path, cover_server)
+    urls = [f"https://example.com/{i}.jpg" for i in range(4)]
+    assert covers.prefetch(urls + urls) == len(urls)  # 대기 중인 URL은 다시 넣지 않음
+    covers.prefetch_executor.shutdown(wait=True)
+    assert all(covers.has_thumbnail(url) for url in urls)
+    assert covers.stats()["prefetching"] == 0
+
+
+def test_import_thumbnails_skips_originals(tmp_path, cover_server):
+    batch = make_cache(tmp_path / "batch", cover_server)
+    batch.get_thumbnail(URL)
+    target = make_cache(tmp_path, cover_server)
+    assert target.import_thumbnails(batch.cache_dir) == 1
+    assert target.has_thumbnail(URL)
+    assert target.stats()["files"] == 1
@@ -0,0 +1,139 @@
+import threading
+
+from history_store import HistoryStore, MemoryHistoryBackend, SQLiteHistoryBackend, UserHistory
+
+
+def make_store(backend=None, **kwargs):
+    # 기록 스레드가 끼어들지 않도록 간격을 길게 두고 flush를 직접 호출
+    return HistoryStore(backend or MemoryHistoryBackend(), flush_interval=3600, **kwargs)
+
+
+class SlowBackend(MemoryHistoryBackend):
+    """load가 gate를 열 때까지 기다리는 저장 방식 (불러오는 도중의 커밋 재현용)"""
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.loads = []
+
+    def load(self, user_id):
+        rows = super().load(user_id)
+        self.loads.append(user_id)
+        if len(self.loads) == 1:
+            self.started.set()
+            self.gate.wait(5)
+        return rows
+
+
+def test_flush_and_restore_in_new_store(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = make_store(SQLiteHistoryBackend(path))
+    history = UserHistory(store, "a" * 32)
+    history.push(("2023-05", 1), 0)
+    history.push(("2023-05", 2), 1)
+    history.push(("2023-05", 2), 1)  # 맨 위와 같으면 기록하지 않음
+    assert store.flush() == 1
+    assert store.flush() == 0
+
+    restored = UserHistory(make_store(SQLiteHistoryBackend(path)), "a" * 32)
+    assert restored.size() == 2
+    assert restored.peek() == (("2023-05", 2), 1)
+
+
+def test_consecutive_changes_are_written_once():
+    backend = MemoryHistoryBackend()
+    store = make_store(backend)
+    for rank in range(5):
+        store.push("u", ("2023-05", rank), rank)
+    store.pop("u")
+    assert store.flush() == 1
+    assert store.stats()["changes"] == 6 and store.stats()["writes"] == 1
+    assert [key for key, _ in backend.load("u")] == [("2023-05", rank) for rank in range(4)]
+
+
+def test_evicted_user_is_reloaded_from_pending_state():
+    backend = MemoryHistoryBackend()
+    store = make_store(backend, hot_users=1)
+    store.push("u1", ("2023-05", 1), 0)
+    store.push("u2", ("2023-05", 2), 1)  # u1은 메모리에서 내려가지만 기록 전 상태는 dirty에 남음
+    assert list(store.hot) == ["u2"]
+    assert backend.load("u1") == []
+    assert store.read("peek", "u1") == (("2023-05", 1), 0)
+
+    store.flush()
+    store.push("u2", ("2023-05", 3), 2)
+    assert store.read("size", "u1") == 1  # 이번에는 저장소에서 불러옴
+
+
+def test_inflight_state_is_visible_during_commit():
+    backend = MemoryHistoryBackend()
+    store = make_store(backend, hot_users=1)
+    store.push("u1", ("2023-05", 1), 0)
+    store.push("u2", ("2023-05", 2), 1)
+    seen = []
+    save_many = backend.save_many
+
+    def save_and_read(states):
+        # 커밋이 끝나기 전 다른 세션이 읽어도 저장소의 이전 상태가 아닌 기록 중인 상태가 보여야 함
+        reader = threading.Thread(target=lambda: seen.append(store.read("size", "u1")))
+        reader.start()
+        reader.join()
+        save_many(states)
+
+    backend.save_many = save_and_read
+    assert store.flush() == 2
+    assert seen == [1]
+
+
+def test_load_discarded_when_same_user_commits_meanwhile():
+    backend = SlowBackend()
+    store = make_store(backend, hot_users=1)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(store.read("size", "u1")))
+    reader.start()
+    assert backend.started.wait(5)
+
+    # 첫 읽기가 저장소를 읽는 동안 같은 사용자의 변경이 커밋되고 메모리에서 내려감
+    store.push("u1", ("2023-05", 1), 0)
+    store.flush()
+    store.push("u2", ("2023-05", 2), 1)
+    store.flush()
+    backend.gate.set()
+    reader.join()
+    assert result == [1]
+    assert store.loading == {}
+
+
+def test_load_kept_when_other_users_commit_meanwhile():
+    backend = SlowBackend()
+    backend.save_many({"u1": [(("2023-05", 1), 0)]})
+    store = make_store(backend)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(store.read("size", "u1")))
+    reader.start()
+    assert backend.started.wait(5)
+
+    store.push("u2", ("2023-05", 2), 1)
+    store.flush()
+    backend.gate.set()
+    reader.join()
+    assert result == [1]
+    assert backend.loads.count("u1") == 1  # 다른 사용자의 커밋으로는 다시 읽지 않음
+
+
+def test_concurrent_pushes_from_many_users():
+    backend = MemoryHistoryBackend()
+    store = make_store(backend, hot_users=4)
+
+    def work(user):
+        for rank in range(20):
+            store.push(user, ("2023-05", rank), rank)
+
+    threads = [threading.Thread(target=work, args=(f"u{n}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    for n in range(8):
+        assert [row_id for _, row_id in backend.load(f"u{n}")] == list(range(20))
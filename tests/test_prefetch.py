@@ -0,0 +1,26 @@
+from prefetch import Prefetcher
+
+
+def test_warmed_key_is_rescheduled_when_result_is_gone():
+    ready = set()
+    prefetcher = Prefetcher(max_workers=1, is_ready=lambda key: key in ready)
+
+    def job():
+        ready.add("a")
+        return b"cover"
+
+    assert prefetcher.schedule("s", [("a", job)]) == 1
+    prefetcher.executor.shutdown(wait=True)
+    assert prefetcher.record_use("a")
+
+    ready.discard("a")  # 표지 캐시가 용량 한도로 파일을 지움
+    assert not prefetcher.record_use("a")
+    assert "a" not in prefetcher.warmed
+    assert prefetcher.stats()["hits"] == 1 and prefetcher.stats()["misses"] == 1
+
+
+def test_failed_job_is_not_marked_warmed():
+    prefetcher = Prefetcher(max_workers=1)
+    prefetcher.schedule("s", [("a", lambda: None)])
+    prefetcher.executor.shutdown(wait=True)
+    assert not prefetcher.record_use("a")
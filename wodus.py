@@ -1,6 +1,18 @@
+import os
+
+import time
+
 import streamlit as st
 import pandas as pd
-import numpy as np
+
+import perf
+
+from api_server import API_HOST, LITERACY_API_PORT, literacy_route, start_server
+from artifacts import ARTIFACT_DIR, current_dir
+from literacy import LiteracyFilter, compute_analytics, data_version, fit_trends, forecast
+from literacy_ingest import CUBE_PATH, cube_options, load_cube, query_cube
+from export import csv_bytes, parquet_bytes
+from shared_data import freeze_frame
 
 # 페이지 설정 - 와이드 레이아웃으로 설정하여 더 많은 공간 활용
 st.set_page_config(
@@ -52,42 +64,174 @@ st.sidebar.title("🔧 분석 도구")
 st.sidebar.markdown("---")
 
 # 데이터 로드 함수
-@st.cache_data
+@st.cache_resource
 def load_data():
     """
     CSV 데이터를 로드하고 전처리하는 함수
-    캐시를 사용하여 성능 최적화
+    캐시를 사용하여 성능 최적화 (모든 세션이 같은 읽기 전용 프레임 공유)
+    LITERACY_CSV 환경 변수가 있으면 해당 파일(Year, Gender, Value 컬럼)을 읽음
     """
+    perf.cache_miss("load_data")
+    csv_path = os.environ.get("LITERACY_CSV")
+    if csv_path:
+        return freeze_frame(pd.read_csv(csv_path))
     data = {
         'Year': [2014, 2014, 2014, 2017, 2017, 2017, 2020, 2020, 2020],
         'Gender': ['전체', '남성', '여성', '전체', '남성', '여성', '전체', '남성', '여성'],
         'Value': [71.5, 77.0, 66.0, 77.6, 81.9, 73.4, 79.8, 83.7, 76.0]
     }
     df = pd.DataFrame(data)
-    return df
+    return freeze_frame(df)
+
+# 응답자 원자료 집계 큐브 (literacy_ingest.py로 생성, 없으면 None)
+@st.cache_resource
+def load_literacy_cube():
+    """
+    연도 × 성별 × 연령대 × 지역 집계 큐브 로드 (LITERACY_CUBE 환경 변수로 경로 변경)
+    지정하지 않으면 precompute.py가 만든 현재 버전 큐브, 그것도 없으면 기본 경로 사용
+    """
+    path = os.environ.get("LITERACY_CUBE")
+    if not path:
+        version_dir = current_dir(os.environ.get("ARTIFACT_DIR", ARTIFACT_DIR))
+        artifact_cube = os.path.join(version_dir, CUBE_PATH) if version_dir else None
+        path = artifact_cube if artifact_cube and os.path.exists(artifact_cube) else CUBE_PATH
+    return load_cube(path)
+
+# (연령대, 지역) 선택별 / 데이터 해시별 캐시 최대 항목 수 - 선택 조합마다 새 해시가 생기므로
+# 한도를 넘으면 가장 오래 쓰지 않은 조합의 결과부터 제거
+VIEW_CACHE_ENTRIES = int(os.environ.get("VIEW_CACHE_ENTRIES", "64"))
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def load_cube_view(ages, regions):
+    """
+    선택한 연령대/지역의 Year × Gender 평균 프레임과 데이터 해시
+    원자료가 아닌 큐브만 조회하므로 원자료 크기와 관계없이 빠름
+    """
+    view = freeze_frame(query_cube(load_literacy_cube(), ages, regions))
+    return view, data_version(view)
 
 # 데이터 분석 함수들
-def calculate_gender_gap(df, year):
-    """특정 연도의 성별 격차를 계산하는 함수"""
-    year_data = df[df['Year'] == year]
-    male_score = year_data[year_data['Gender'] == '남성']['Value'].iloc[0]
-    female_score = year_data[year_data['Gender'] == '여성']['Value'].iloc[0]
-    return male_score - female_score
+@st.cache_resource
+def load_data_version():
+    """데이터 해시 (분석 결과 캐시 키) - 데이터당 한 번만 계산"""
+    return data_version(load_data())
 
-def predict_future_literacy(df, target_year):
-    """선형 회귀를 사용한 미래 문해력 예측"""
-    overall_data = df[df['Gender'] == '전체'].copy()
-    x = overall_data['Year'].values
-    y = overall_data['Value'].values
-    
-    # 최소제곱법으로 기울기와 절편 계산
-    slope = np.sum((x - np.mean(x)) * (y - np.mean(y))) / np.sum((x - np.mean(x))**2)
-    intercept = np.mean(y) - slope * np.mean(x)
-    
-    return slope * target_year + intercept
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def load_analytics(version, _df):
+    """
+    Year × Gender 행렬 기반 분석 결과 (격차, 변화량, 개선율, 주요 지표)
+    데이터 해시(version)가 같으면 모든 세션이 같은 결과를 공유 (_df는 캐시 키에서 제외)
+    """
+    perf.cache_miss("load_analytics")
+    return compute_analytics(_df)
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def load_filter_engine(version, _df):
+    """연도/성별 비트맵 필터 엔진 (선택 조합별 결과를 LRU로 보관, 데이터 해시별 캐시)"""
+    return LiteracyFilter(_df)
+
+@st.cache_resource(max_entries=32)
+def load_export(version, years, genders, export_format, _df):
+    """필터 선택별 다운로드 파일 (조각 단위 직렬화, 같은 선택은 캐시 재사용)"""
+    perf.cache_miss("load_export")
+    if export_format == "Parquet":
+        return parquet_bytes(_df)
+    return csv_bytes(_df)
+
+def gap_text(value, unit="%p"):
+    """값 표시 문자열 (응답자 필터로 한 성별이 빠져 계산할 수 없으면 '-')"""
+    return "-" if pd.isna(value) else f"{value:.1f}{unit}"
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def load_report(version, _df):
+    """분석 보고서 텍스트 (데이터 해시별로 한 번만 생성)"""
+    analytics = load_analytics(version, _df)
+    matrix = analytics["matrix"]
+    first_year, last_year = analytics["first_year"], analytics["last_year"]
+    return f"""
+문해력 분석 보고서
+==================
+
+분석 기간: {first_year}-{last_year}년
+데이터 포인트: {len(_df)}개
 
-# 데이터 로드
-df = load_data()
+주요 발견사항:
+- 전체 문해력: {matrix.loc[first_year, '전체']}% → {matrix.loc[last_year, '전체']}%
+- 총 개선폭: {analytics['total_improvement']:.1f}%p
+- 연평균 개선율: {analytics['average_annual_improvement']:.2f}%p/년
+
+성별별 현황 ({last_year}년):
+- 남성: {gap_text(matrix.loc[last_year, '남성'], '%')}
+- 여성: {gap_text(matrix.loc[last_year, '여성'], '%')}
+- 성별 격차: {gap_text(analytics['gaps'].loc[last_year])}
+
+권장사항:
+1. 성별 격차 해소를 위한 맞춤형 프로그램 개발
+2. 지속적인 문해력 향상을 위한 체계적 접근
+3. 정기적인 모니터링 및 평가 시스템 구축
+    """
+
+# 예측 대상 연도 (예측 표, 목표 설정, 인사이트 탭에서 공통 사용)
+FORECAST_YEARS = [2025, 2026, 2027, 2028, 2030]
+
+@st.cache_resource(max_entries=VIEW_CACHE_ENTRIES)
+def load_forecast(version, _df):
+    """
+    모든 성별 그룹의 선형 추세를 한 번에 적합하여 예측 대상 연도 전체의 예측값과 95% 신뢰구간 계산
+    데이터 해시(version)별로 캐시 (_df는 캐시 키에서 제외)
+    """
+    fit = fit_trends(load_analytics(version, _df)["matrix"])
+    return forecast(fit, FORECAST_YEARS).set_index(["Year", "Group"])
+
+# 읽기 전용 JSON API (격차/예측/개선 수치를 화면 대신 JSON으로 제공)
+@st.cache_resource
+def get_api_server():
+    """
+    API 서버 시작 함수 (프로세스당 한 번)
+    - LITERACY_API_PORT: 포트 (기본 8602, 0이면 사용 안 함)
+    - API_HOST: 주소 (기본 127.0.0.1 - 로컬에서만 접근)
+    응답은 필터를 적용하지 않은 전체 데이터 기준 (큐브가 있으면 전체 응답자 큐브 조회 결과)
+    """
+    port = int(os.environ.get("LITERACY_API_PORT", LITERACY_API_PORT))
+    if not port:
+        return None
+    server = start_server(os.environ.get("API_HOST", API_HOST), port)
+    if server is not None:
+        if load_literacy_cube() is not None:
+            df, version = load_cube_view((), ())
+        else:
+            df, version = load_data(), load_data_version()
+        server.route("literacy", literacy_route(lambda: (version, df), FORECAST_YEARS))
+    return server
+
+get_api_server()
+
+# rerun 전체 소요 시간 측정 시작
+run_start = time.perf_counter()
+
+# 데이터 로드 (집계 큐브가 있으면 응답자 필터를 적용한 큐브 조회 결과 사용)
+load_start = time.perf_counter()
+cube = load_literacy_cube()
+if cube is not None:
+    st.sidebar.subheader("👥 응답자 필터")
+    options = cube_options(cube)
+    selected_ages = st.sidebar.multiselect("연령대 선택:", options=options["Age"], default=options["Age"])
+    selected_regions = st.sidebar.multiselect("지역 선택:", options=options["Region"], default=options["Region"])
+    # 선택 순서와 관계없이 같은 캐시를 쓰도록 정렬 (비어 있으면 전체)
+    df, version = load_cube_view(tuple(sorted(selected_ages)), tuple(sorted(selected_regions)))
+else:
+    perf.cache_call("load_data")
+    df, version = load_data(), load_data_version()
+perf.record_since("wodus", "data_load", load_start)
+
+with perf.timer("wodus", "aggregation"):
+    perf.cache_call("load_analytics")
+    analytics = load_analytics(version, df)
+    forecasts = load_forecast(version, df)
+matrix = analytics["matrix"]
+first_year, last_year = analytics["first_year"], analytics["last_year"]
+# 응답자 필터로 한 성별만 남으면 격차는 계산하지 않음 (성별 패널 대신 안내 표시)
+has_gap = bool(analytics["gaps"].notna().any())
 
 # 사이드바 필터 옵션
 st.sidebar.subheader("📊 데이터 필터")
@@ -103,33 +247,34 @@ selected_gender = st.sidebar.multiselect(
     default=df['Gender'].unique()
 )
 
-# 필터링된 데이터
-filtered_df = df[(df['Year'].isin(selected_years)) & (df['Gender'].isin(selected_gender))]
+# 필터링된 데이터 (비트맵 AND, 같은 선택 조합은 캐시된 결과 재사용)
+with perf.timer("wodus", "filter"):
+    filter_result = load_filter_engine(version, df).select(selected_years, selected_gender)
+filtered_df = filter_result["filtered"]
 
 # 메인 대시보드 레이아웃
+chart_start = time.perf_counter()
 col1, col2 = st.columns([2, 1])
 
 with col1:
     st.subheader("📈 문해력 변화 추이")
     
     # 전체 데이터에 대한 선형 차트 (Streamlit 내장)
-    overall_trend = df[df['Gender'] == '전체'].copy()
-    overall_trend = overall_trend.set_index('Year')
-    st.line_chart(overall_trend['Value'], height=300)
+    st.line_chart(matrix['전체'].rename('Value'), height=300)
     
     # 성별별 데이터 비교를 위한 피벗 테이블 생성
     st.subheader("🔍 성별 비교 분석")
-    pivot_df = filtered_df.pivot(index='Year', columns='Gender', values='Value')
+    pivot_df = filter_result["pivot"]
     
     # 막대 차트로 성별 비교 표시
     st.bar_chart(pivot_df, height=300)
     
     # 데이터 인사이트 표시
-    st.markdown("""
+    st.markdown(f"""
     <div class="insight-box">
         <h4>📊 주요 인사이트</h4>
         <ul>
-            <li>2014년부터 2020년까지 전체 문해력이 꾸준히 향상되었습니다</li>
+            <li>{first_year}년부터 {last_year}년까지 전체 문해력이 꾸준히 향상되었습니다</li>
             <li>남성과 여성 간의 문해력 격차가 지속적으로 존재합니다</li>
             <li>모든 그룹에서 문해력 향상 추세를 보이고 있습니다</li>
         </ul>
@@ -139,14 +284,17 @@ with col1:
 with col2:
     st.subheader("📊 주요 통계")
     
-    # 최신 데이터 (2020년) 메트릭 표시
-    latest_data = df[df['Year'] == 2020]
+    # 최신 데이터 메트릭 표시 (직전 조사 대비 변화는 미리 계산된 값 사용)
+    latest_values = matrix.loc[last_year]
+    latest_deltas = analytics["deltas"].loc[last_year]
     
-    for _, row in latest_data.iterrows():
+    for gender in matrix.columns:
+        if pd.isna(latest_values[gender]):
+            continue
         st.metric(
-            label=f"{row['Gender']} (2020년)",
-            value=f"{row['Value']}%",
-            delta=f"{row['Value'] - df[(df['Year'] == 2017) & (df['Gender'] == row['Gender'])]['Value'].iloc[0]:.1f}%p"
+            label=f"{gender} ({last_year}년)",
+            value=f"{latest_values[gender]}%",
+            delta=f"{latest_deltas[gender]:.1f}%p"
         )
     
     st.markdown("---")
@@ -154,24 +302,23 @@ with col2:
     # 성별 격차 분석
     st.subheader("⚖️ 성별 격차 분석")
     
-    # 각 연도별 성별 격차 계산 및 표시
-    gap_data = []
-    for year in sorted(df['Year'].unique()):
-        gap = calculate_gender_gap(df, year)
-        gap_data.append({'연도': year, '격차(남-여)': f"{gap:.1f}%p"})
-    
-    gap_df = pd.DataFrame(gap_data)
-    st.dataframe(gap_df, use_container_width=True)
-    
-    # 격차 트렌드를 위한 라인 차트
-    gap_values = [calculate_gender_gap(df, year) for year in sorted(df['Year'].unique())]
-    gap_trend_df = pd.DataFrame({
-        'Year': sorted(df['Year'].unique()),
-        'Gap': gap_values
-    }).set_index('Year')
-    
-    st.write("**격차 변화 추이:**")
-    st.line_chart(gap_trend_df, height=200)
+    # 각 연도별 성별 격차 표시 (미리 계산된 격차 벡터 사용)
+    gaps = analytics["gaps"]
+    if has_gap:
+        gap_df = pd.DataFrame({
+            '연도': gaps.index,
+            '격차(남-여)': [gap_text(gap) for gap in gaps.to_numpy()]
+        })
+        st.dataframe(gap_df, use_container_width=True)
+        
+        # 격차 트렌드를 위한 라인 차트
+        gap_trend_df = pd.DataFrame({'Gap': gaps.to_numpy()}, index=gaps.index.rename('Year'))
+        
+        st.write("**격차 변화 추이:**")
+        st.line_chart(gap_trend_df, height=200)
+    else:
+        st.info("선택한 응답자 범위에는 한 성별의 응답만 있어 성별 격차를 계산할 수 없습니다.")
+perf.record_since("wodus", "charting", chart_start)
 
 # 전체 너비 섹션
 st.markdown("---")
@@ -182,20 +329,17 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.subheader("📈 개선율 분석")
     
-    # 2014년 대비 2020년 개선율 계산
+    # 첫 조사 대비 마지막 조사 개선율 (미리 계산된 값 사용)
     improvement_data = []
-    for gender in ['전체', '남성', '여성']:
-        score_2014 = df[(df['Year'] == 2014) & (df['Gender'] == gender)]['Value'].iloc[0]
-        score_2020 = df[(df['Year'] == 2020) & (df['Gender'] == gender)]['Value'].iloc[0]
-        improvement = score_2020 - score_2014
-        improvement_rate = (improvement / score_2014) * 100
-        
+    for gender, row in analytics["improvement"].iterrows():
+        if pd.isna(row['first']) and pd.isna(row['last']):
+            continue
         improvement_data.append({
             '성별': gender,
-            '2014년': f"{score_2014}%",
-            '2020년': f"{score_2020}%",
-            '개선폭': f"{improvement:.1f}%p",
-            '개선율': f"{improvement_rate:.1f}%"
+            f'{first_year}년': f"{row['first']}%",
+            f'{last_year}년': f"{row['last']}%",
+            '개선폭': f"{row['change']:.1f}%p",
+            '개선율': f"{row['rate']:.1f}%"
         })
     
     improvement_df = pd.DataFrame(improvement_data)
@@ -204,28 +348,34 @@ with col1:
 with col2:
     st.subheader("🎯 예측 분석")
     
-    # 미래 예측
+    # 미래 예측 (미리 계산된 예측값과 95% 신뢰구간 조회)
     future_years = [2025, 2030]
     predictions = []
     
     for year in future_years:
-        predicted_value = predict_future_literacy(df, year)
+        row = forecasts.loc[(year, '전체')]
         predictions.append({
             '연도': year,
-            '예상 문해력': f"{predicted_value:.1f}%"
+            '예상 문해력': f"{row['Prediction']:.1f}%",
+            '95% 신뢰구간': f"{row['Lower']:.1f} ~ {row['Upper']:.1f}%"
         })
     
     pred_df = pd.DataFrame(predictions)
     st.dataframe(pred_df, use_container_width=True)
     
+    # 성별 그룹별 예측
+    with st.expander("성별 그룹별 예측"):
+        group_pred = forecasts['Prediction'].unstack('Group').round(1)
+        st.dataframe(group_pred, use_container_width=True)
+    
     # 목표 설정 도구
     st.write("**목표 설정:**")
-    target_year = st.selectbox("목표 연도", [2025, 2026, 2027, 2028, 2030])
+    target_year = st.selectbox("목표 연도", FORECAST_YEARS)
     target_value = st.slider("목표 문해력 (%)", 80, 95, 85)
     
-    current_value = df[df['Gender'] == '전체']['Value'].iloc[-1]
+    current_value = matrix.loc[last_year, '전체']
     required_improvement = target_value - current_value
-    years_remaining = target_year - 2020
+    years_remaining = target_year - last_year
     annual_improvement = required_improvement / years_remaining if years_remaining > 0 else 0
     
     st.metric(
@@ -237,15 +387,15 @@ with col3:
     st.subheader("🏆 성과 지표")
     
     # 주요 성과 지표 계산
-    total_improvement = df[df['Gender'] == '전체']['Value'].iloc[-1] - df[df['Gender'] == '전체']['Value'].iloc[0]
-    average_annual_improvement = total_improvement / 6  # 2014~2020 = 6년
+    total_improvement = analytics["total_improvement"]
+    average_annual_improvement = analytics["average_annual_improvement"]  # 첫 조사~마지막 조사 연수로 나눔
     
     # 성과 지표 표시
     performance_metrics = [
         {"지표": "전체 개선폭", "값": f"{total_improvement:.1f}%p"},
         {"지표": "연평균 개선율", "값": f"{average_annual_improvement:.2f}%p"},
-        {"지표": "최고 성별 격차", "값": f"{max([calculate_gender_gap(df, year) for year in df['Year'].unique()]):.1f}%p"},
-        {"지표": "최저 성별 격차", "값": f"{min([calculate_gender_gap(df, year) for year in df['Year'].unique()]):.1f}%p"}
+        {"지표": "최고 성별 격차", "값": gap_text(analytics['max_gap'])},
+        {"지표": "최저 성별 격차", "값": gap_text(analytics['min_gap'])}
     ]
     
     for metric in performance_metrics:
@@ -263,48 +413,47 @@ st.subheader("📋 상세 데이터 및 다운로드")
 col1, col2 = st.columns([3, 1])
 
 with col1:
-    st.dataframe(filtered_df.sort_values(['Year', 'Gender']), use_container_width=True)
+    st.dataframe(filter_result["sorted"], use_container_width=True)
 
 with col2:
-    # 데이터 다운로드 버튼
-    csv = filtered_df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="📥 CSV 다운로드",
-        data=csv,
-        file_name='literacy_data.csv',
-        mime='text/csv'
-    )
-    
-    # 보고서 생성 버튼
-    report_text = f"""
-문해력 분석 보고서
-==================
-
-분석 기간: 2014-2020년
-데이터 포인트: {len(df)}개
-
-주요 발견사항:
-- 전체 문해력: {df[df['Gender'] == '전체']['Value'].iloc[0]}% → {df[df['Gender'] == '전체']['Value'].iloc[-1]}%
-- 총 개선폭: {total_improvement:.1f}%p
-- 연평균 개선율: {average_annual_improvement:.2f}%p/년
-
-성별별 현황 (2020년):
-- 남성: {df[(df['Year'] == 2020) & (df['Gender'] == '남성')]['Value'].iloc[0]}%
-- 여성: {df[(df['Year'] == 2020) & (df['Gender'] == '여성')]['Value'].iloc[0]}%
-- 성별 격차: {calculate_gender_gap(df, 2020):.1f}%p
-
-권장사항:
-1. 성별 격차 해소를 위한 맞춤형 프로그램 개발
-2. 지속적인 문해력 향상을 위한 체계적 접근
-3. 정기적인 모니터링 및 평가 시스템 구축
-    """
-    
-    st.download_button(
-        label="📄 보고서 다운로드",
-        data=report_text,
-        file_name='literacy_report.txt',
-        mime='text/plain'
-    )
+    # 다운로드 파일은 요청할 때만 생성 (평소 rerun에서는 직렬화하지 않음)
+    export_format = st.radio("파일 형식", ["CSV", "Parquet"], horizontal=True)
+    export_key = (version, tuple(sorted(selected_years)), tuple(sorted(selected_gender)), export_format)
+    
+    if st.button("📦 다운로드 파일 준비"):
+        st.session_state.export_key = export_key
+    
+    # 준비한 뒤 필터/형식이 바뀌면 다시 준비해야 함
+    if st.session_state.get("export_key") == export_key:
+        with perf.timer("wodus", "export"):
+            perf.cache_call("load_export")
+            export_data = load_export(*export_key, _df=filtered_df)
+        
+        # 데이터 다운로드 버튼
+        if export_format == "CSV":
+            st.download_button(
+                label="📥 CSV 다운로드",
+                data=export_data,
+                file_name='literacy_data.csv',
+                mime='text/csv'
+            )
+        else:
+            st.download_button(
+                label="📥 Parquet 다운로드",
+                data=export_data,
+                file_name='literacy_data.parquet',
+                mime='application/vnd.apache.parquet'
+            )
+        
+        # 보고서 다운로드 버튼
+        st.download_button(
+            label="📄 보고서 다운로드",
+            data=load_report(version, df),
+            file_name='literacy_report.txt',
+            mime='text/plain'
+        )
+    else:
+        st.caption("버튼을 누르면 현재 필터 기준으로 파일을 만듭니다.")
 
 # 교육 권장사항 섹션
 st.markdown("---")
@@ -318,9 +467,9 @@ with tab1:
     ### 🔍 데이터 분석 결과 기반 권장사항
     
     **📊 주요 발견사항:**
-    - **전반적 향상**: 문해력이 지속적으로 향상되고 있음 (2014년 {df[df['Gender'] == '전체']['Value'].iloc[0]}% → 2020년 {df[df['Gender'] == '전체']['Value'].iloc[-1]}%)
+    - **전반적 향상**: 문해력이 지속적으로 향상되고 있음 ({first_year}년 {matrix.loc[first_year, '전체']}% → {last_year}년 {matrix.loc[last_year, '전체']}%)
     - **성별 격차 지속**: 남성이 여성보다 일관되게 높은 수준 유지
-    - **2020년 격차**: 남녀 문해력 격차 {calculate_gender_gap(df, 2020):.1f}%p
+    - **{last_year}년 격차**: 남녀 문해력 격차 {gap_text(gaps.loc[last_year])}
     - **연평균 개선율**: 약 {average_annual_improvement:.2f}%p씩 꾸준한 향상
     
     **⚠️ 주의 필요 영역:**
@@ -328,7 +477,7 @@ with tab1:
     2. **개선 속도**: 현재 속도로는 격차 해소에 시간 소요 예상
     3. **지속적 모니터링**: 정기적인 평가와 조정 필요
     
-    **🎯 2025년 예상 문해력**: {predict_future_literacy(df, 2025):.1f}%
+    **🎯 2025년 예상 문해력**: {forecasts.loc[(2025, '전체'), 'Prediction']:.1f}%
     """)
 
 with tab2:
@@ -412,3 +561,9 @@ st.markdown("""
     <p>🎯 모든 학습자의 문해력 향상을 위해 함께 노력합시다</p>
 </div>
 """, unsafe_allow_html=True)
+
+# 성능 디버그 패널 (?debug=1) 및 Prometheus 파일 내보내기 (PERF_METRICS_FILE)
+perf.record_since("wodus", "rerun", run_start)
+if perf.debug_enabled(st):
+    perf.render_panel(st)
+perf.export_prometheus()